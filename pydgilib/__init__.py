@@ -3,6 +3,7 @@
 from pydgilib.dgilib_config import *
 # from pydgilib.dgilib_exceptions import *
 from pydgilib.dgilib import DGILib
+from pydgilib.dgilib_simulator import DGILibSimulator
 
 __author__ = "EWouters <ehwo(at)kth.se>"
 __url__ = "https://github.com/EWouters/Atmel-SAML11/tree/master/Python/" \
@@ -1,15 +1,17 @@
 """This module provides Python bindings for DGILib."""
 
-from os import (path, getcwd, getenv)
+from os import (path, fspath, getcwd, getenv, PathLike)
 from ctypes import cdll
 
 from pydgilib.dgilib_exceptions import (
-    DLLError, DeviceIndexError, DeviceConnectionError)
-from pydgilib.dgilib_discovery import DGILibDiscovery
+    DLLError, DeviceIndexError, DeviceConnectionError, DeviceReturnError)
+from pydgilib.dgilib_discovery import DGILibDiscovery, get_discovery_cache
 from pydgilib.dgilib_housekeeping import DGILibHousekeeping
 from pydgilib.dgilib_interface_communication import (
     DGILibInterfaceCommunication)
 from pydgilib.dgilib_auxiliary import DGILibAuxiliary
+from pydgilib.dgilib_instrumentation import DGILibInstrumentation
+from pydgilib.dgilib_trace import DGILibTracer
 
 
 class DGILib(object):
@@ -41,6 +43,15 @@ class DGILib(object):
     get_device_serial = DGILibDiscovery.get_device_serial
     is_msd_mode = DGILibDiscovery.is_msd_mode
     set_mode = DGILibDiscovery.set_mode
+    initialize_status_change_notification = \
+        DGILibDiscovery.initialize_status_change_notification
+    uninitialize_status_change_notification = \
+        DGILibDiscovery.uninitialize_status_change_notification
+    register_for_device_status_change_notifications = \
+        DGILibDiscovery.register_for_device_status_change_notifications
+    unregister_for_device_status_change_notifications = \
+        DGILibDiscovery.unregister_for_device_status_change_notifications
+    get_device_serials = DGILibDiscovery.get_device_serials
 
     # Housekeeping
     # housekeeping = DGILibHousekeeping
@@ -81,6 +92,8 @@ class DGILib(object):
     auxiliary_power_stop = DGILibAuxiliary.auxiliary_power_stop
     auxiliary_power_lock_data_for_reading = DGILibAuxiliary.auxiliary_power_lock_data_for_reading
     auxiliary_power_copy_data = DGILibAuxiliary.auxiliary_power_copy_data
+    auxiliary_power_copy_data_into = DGILibAuxiliary.auxiliary_power_copy_data_into
+    _auxiliary_power_copy_data = DGILibAuxiliary._auxiliary_power_copy_data
     auxiliary_power_free_data = DGILibAuxiliary.auxiliary_power_free_data
 
     def __init__(self, *args, **kwargs):
@@ -88,9 +101,11 @@ class DGILib(object):
 
         Parameters
         ----------
-        dgilib_path : str
+        dgilib_path : str, os.PathLike, list(str), tuple(str) or object
             Path to dgilib.dll (More info at:
-            https://www.microchip.com/developmenttools/ProductDetailsATPOWERDEBUGGER)
+            https://www.microchip.com/developmenttools/ProductDetailsATPOWERDEBUGGER),
+            or the parts of the path, or an object that implements the
+            functions of the dll, like :class:`DGILibSimulator`
 
         device_index : int or None
             Index of the device to use, only useful if multiple devices are
@@ -105,6 +120,20 @@ class DGILib(object):
             Set to a positive number to print more status messages
             (default is `0`)
 
+        tracer : DGILibTracer or None
+            Where the status messages go to when `verbose` is set (default
+            is `None`, print them with sampling and rate limiting, see
+            :class:`DGILibTracer`)
+
+        instrument : bool
+            Measure the calls to the functions of DGILib (default is
+            `False`, see :meth:`enable_instrumentation`)
+
+        use_discovery_cache : bool
+            Reuse the serial numbers of the devices discovered by a previous
+            session, until a device is connected or disconnected (default is
+            `True`)
+
         Raises
         -------
             DLLError
@@ -114,34 +143,51 @@ class DGILib(object):
         # Load the dgilib.dll
         dgilib_path = kwargs.get(
             "dgilib_path", args[0] if args else "dgilib.dll")
-        for location in (dgilib_path, [dgilib_path], [getcwd(), "dgilib.dll"],
-                         [getcwd(), dgilib_path], [getenv(
-                             "programfiles(x86)"), "Atmel", "Studio", "7.0",
-                             "Extensions", "Application", "dgilib.dll"]):
-            try:
-                self.dgilib = cdll.LoadLibrary(path.join(*location))
-            except OSError:
-                continue
-            break
+        if isinstance(dgilib_path, PathLike):
+            dgilib_path = fspath(dgilib_path)
+        elif isinstance(dgilib_path, (list, tuple)):
+            dgilib_path = path.join(*dgilib_path)
+        if not isinstance(dgilib_path, str):
+            # Already loaded library or a stand-in like DGILibSimulator
+            self.dgilib = dgilib_path
         else:
-            raise DLLError(
-                f"Could not find dgilib.dll. If you install Atmel Studio in " +
-                f"the default location (" + path.join(
-                    getenv("programfiles(x86)"), "Atmel", "Studio", "7.0") +
-                f") it should get loaded automatically. Alternatively you " +
-                f"can download it from https://www.microchip.com/mplab/avr-" +
-                f"support/data-visualizer (download DGIlib dll, unzip the " +
-                f"files and put the dll in {getcwd()}) or specify the path " +
-                f"as the first argument or as a keyword argument " +
-                f"(dgilib_path). Got dgilib_path={dgilib_path}.")
+            for location in (
+                    dgilib_path, [dgilib_path], [getcwd(), "dgilib.dll"],
+                    [getcwd(), dgilib_path], [getenv(
+                        "programfiles(x86)"), "Atmel", "Studio", "7.0",
+                        "Extensions", "Application", "dgilib.dll"]):
+                try:
+                    self.dgilib = cdll.LoadLibrary(path.join(*location))
+                except OSError:
+                    continue
+                break
+            else:
+                raise DLLError(
+                    f"Could not find dgilib.dll. If you install Atmel Studio "
+                    f"in the default location (" + path.join(
+                        getenv("programfiles(x86)"), "Atmel", "Studio",
+                        "7.0") +
+                    f") it should get loaded automatically. Alternatively "
+                    f"you can download it from https://www.microchip.com/"
+                    f"mplab/avr-support/data-visualizer (download DGIlib dll, "
+                    f"unzip the files and put the dll in {getcwd()}) or "
+                    f"specify the path as the first argument or as a keyword "
+                    f"argument (dgilib_path). Got dgilib_path={dgilib_path}.")
 
         # Argument parsing
         self.device_index = kwargs.get("device_index", None)
         self.device_sn = kwargs.get("device_sn", None)
         self.verbose = kwargs.get("verbose", 0)
+        self.tracer = kwargs.get("tracer", None) or DGILibTracer()
+        self.use_discovery_cache = kwargs.get("use_discovery_cache", True)
 
         self.dgi_hndl = None
         self.power_hndl = None
+        self.power_buffer_pointers = None
+        self.overflows = {}
+
+        if kwargs.get("instrument", False):
+            self.enable_instrumentation()
 
         # Instantiate modules
         # self.discovery(self)
@@ -156,18 +202,7 @@ class DGILib(object):
 
         """
         # Discovery
-        self.discover()
-        device_count = self.get_device_count()
-
-        if self.device_sn is None:
-            if self.device_index is None:
-                self.device_index = 0
-            elif self.device_index > device_count - 1:
-                raise DeviceIndexError(
-                    f"Discovered {device_count} devices so could not select "
-                    f"device with index {self.device_index}."
-                )
-            self.device_sn = self.get_device_serial(self.device_index)
+        self.select_device()
 
         # UNTESTED:
         # if self.is_msd_mode(self.device_sn):
@@ -175,9 +210,15 @@ class DGILib(object):
         #     print(f"\t{res} set_mode 1")
 
         # Housekeeping
-        self.dgi_hndl = self.connect(self.device_sn)
+        try:
+            self.dgi_hndl = self.connect(self.device_sn)
+        except DeviceReturnError:
+            # The cached devices might be out of date
+            get_discovery_cache(self.dgilib).invalidate()
+            raise
         c_status = self.connection_status()
         if c_status:
+            get_discovery_cache(self.dgilib).invalidate()
             raise DeviceConnectionError(
                 f"Could not connect to device. Connection status: {c_status}.")
 
@@ -187,6 +228,81 @@ class DGILib(object):
 
         return self
 
+    def select_device(self):
+        """select_device
+
+        Set `self.device_sn` to the serial number of the device at
+        `self.device_index` if no serial number was given.
+
+        Returns
+        -------
+        bytes
+            Serial number of the selected device
+
+        Raises
+        -------
+            DeviceIndexError
+                If `device_index` is larger than the number of devices.
+        """
+        device_sns = self.get_device_serials(self.use_discovery_cache)
+        device_count = len(device_sns)
+
+        if self.device_sn is None:
+            if self.device_index is None:
+                self.device_index = 0
+            elif self.device_index > device_count - 1:
+                raise DeviceIndexError(
+                    f"Discovered {device_count} devices so could not select "
+                    f"device with index {self.device_index}."
+                )
+            self.device_sn = device_sns[self.device_index]
+
+        return self.device_sn
+
+    def enable_instrumentation(self):
+        """enable_instrumentation
+
+        Measure the number of calls, latency and transferred samples of every
+        function of DGILib that is called (see
+        :class:`DGILibInstrumentation`).
+        """
+        if not isinstance(self.dgilib, DGILibInstrumentation):
+            self.dgilib = DGILibInstrumentation(self.dgilib)
+
+    def disable_instrumentation(self):
+        """disable_instrumentation
+
+        Stop measuring the calls to DGILib, the statistics are discarded.
+        """
+        if isinstance(self.dgilib, DGILibInstrumentation):
+            self.dgilib = self.dgilib.dgilib
+
+    def get_stats(self, reset=False):
+        """get_stats
+
+        Get a snapshot of the statistics of the calls to DGILib.
+
+        Parameters
+        ----------
+        reset : bool
+            Clear the statistics after taking the snapshot (default is
+            `False`)
+
+        Returns
+        -------
+        dict
+            Dictionary of function names and dictionaries with the `calls`,
+            `total_time`, `mean_time`, `p50_time`, `p90_time`, `p99_time`,
+            `max_time` (in seconds) and `transferred` samples. Empty if the
+            instrumentation is disabled.
+        """
+        if not isinstance(self.dgilib, DGILibInstrumentation):
+            return {}
+        stats = self.dgilib.snapshot()
+        if reset:
+            self.dgilib.reset()
+        return stats
+
     def __exit__(self, exc_type, exc_value, traceback):
         """__exit__
 
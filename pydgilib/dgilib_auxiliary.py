@@ -1,10 +1,11 @@
 """This module provides Python bindings for the Auxiliary API of DGILib."""
 
 # from ctypes import *
-from ctypes import (byref, c_uint, c_float, c_double, c_int, c_size_t, c_ubyte)
+from ctypes import (
+    byref, c_uint, c_float, c_double, c_int, c_size_t, c_ubyte, sizeof)
 
 from pydgilib.dgilib_config import (
-    BUFFER_SIZE, XAM, NUM_CALIBRATION, MAX_PRINT)
+    BUFFER_SIZE, XAM, NUM_CALIBRATION)
 from pydgilib.dgilib_exceptions import DeviceReturnError
 
 
@@ -31,8 +32,10 @@ class DGILibAuxiliary(object):
 
     dgilib = None
     verbose = None
+    tracer = None
     dgi_hndl = None
     power_hndl = None
+    power_buffer_pointers = None
 
     def auxiliary_power_initialize(self):
         """`auxiliary_power_initialize`.
@@ -59,7 +62,7 @@ class DGILibAuxiliary(object):
         res = self.dgilib.auxiliary_power_initialize(
             byref(power_hndl), self.dgi_hndl)
         if self.verbose:
-            print(f"\t{res} auxiliary_power_initialize")
+            self.tracer.trace(f"\t{res} auxiliary_power_initialize")
         if res:
             raise DeviceReturnError(
                 f"auxiliary_power_initialize returned: {res}")
@@ -84,7 +87,7 @@ class DGILibAuxiliary(object):
         res = self.dgilib.auxiliary_power_uninitialize(
             self.power_hndl)
         if self.verbose:
-            print(f"\t{res} auxiliary_power_uninitialize")
+            self.tracer.trace(f"\t{res} auxiliary_power_uninitialize")
         if res:
             raise DeviceReturnError(
                 f"auxiliary_power_uninitialize returned: {res}")
@@ -133,9 +136,14 @@ class DGILibAuxiliary(object):
         :type max_count: int
         :raises: :exc:`DeviceReturnError`
         """
-        self.powerBuffer = (c_float * max_count)()
-        self.powerTimestamp = (c_double * max_count)()
-        self.powerCount = c_size_t()
+        # Every channel and power type gets its own buffers, they are kept in
+        # self.power_buffer_pointers so they can be reused by
+        # auxiliary_power_copy_data.
+        if self.power_buffer_pointers is None:
+            self.power_buffer_pointers = {}
+        power_buffer = (
+            (c_float * max_count)(), (c_double * max_count)(), c_size_t())
+        self.power_buffer_pointers[(channel, power_type)] = power_buffer
 
         max_count = c_size_t(max_count)
         channel = c_int(channel)
@@ -143,15 +151,16 @@ class DGILibAuxiliary(object):
 
         res = self.dgilib.auxiliary_power_register_buffer_pointers(
             self.power_hndl,
-            byref(self.powerBuffer),
-            byref(self.powerTimestamp),
-            byref(self.powerCount),
+            byref(power_buffer[0]),
+            byref(power_buffer[1]),
+            byref(power_buffer[2]),
             max_count,
             channel,
             power_type,
         )
         if self.verbose:
-            print(f"\t{res} auxiliary_power_register_buffer_pointers")
+            self.tracer.trace(
+                f"\t{res} auxiliary_power_register_buffer_pointers")
         if res:
             raise DeviceReturnError(
                 f"auxiliary_power_register_buffer_pointers returned: {res}"
@@ -183,13 +192,16 @@ class DGILibAuxiliary(object):
         :type power_type: int
         :raises: :exc:`DeviceReturnError`
         """
+        if self.power_buffer_pointers is not None:
+            self.power_buffer_pointers.pop((channel, power_type), None)
+
         channel = c_int(channel)
         power_type = c_int(power_type)
 
         res = self.dgilib.auxiliary_power_unregister_buffer_pointers(
             self.power_hndl, channel, power_type)
         if self.verbose:
-            print(
+            self.tracer.trace(
                 f"\t{res} auxiliary_power_unregister_buffer_pointers, channel:"
                 f" {channel.value}, power_type: {power_type.value}")
         if res:
@@ -220,7 +232,7 @@ class DGILibAuxiliary(object):
         calibration_is_valid = \
             self.dgilib.auxiliary_power_calibration_is_valid(self.power_hndl)
         if self.verbose:
-            print(
+            self.tracer.trace(
                 f"auxiliary_power_calibration_is_valid: {calibration_is_valid}"
             )
 
@@ -251,7 +263,7 @@ class DGILibAuxiliary(object):
         res = self.dgilib.auxiliary_power_trigger_calibration(
             self.power_hndl, circuit_type)
         if self.verbose:
-            print(f"\t{res} auxiliary_power_trigger_calibration")
+            self.tracer.trace(f"\t{res} auxiliary_power_trigger_calibration")
         if res:
             raise DeviceReturnError(
                 f"auxiliary_power_trigger_calibration returned: {res}")
@@ -287,10 +299,9 @@ class DGILibAuxiliary(object):
         length = self.dgilib.auxiliary_power_get_calibration(
             self.power_hndl, byref(data))
         if self.verbose:
-            print(f"auxiliary_power_get_calibration: {length}")
+            self.tracer.trace(f"auxiliary_power_get_calibration: {length}")
         if self.verbose >= 2:
-            for i in range(length):
-                print(f"\t{i}:\t{data[i]}")
+            self.tracer.trace_samples(length, ("data", data))
 
         return data[:length]
 
@@ -319,7 +330,8 @@ class DGILibAuxiliary(object):
         res = self.dgilib.auxiliary_power_get_circuit_type(
             self.power_hndl, byref(circuit))
         if self.verbose:
-            print(f"\t{res} auxiliary_power_get_circuit_type: {circuit.value}")
+            self.tracer.trace(
+                f"\t{res} auxiliary_power_get_circuit_type: {circuit.value}")
         if res:
             raise DeviceReturnError(
                 f"auxiliary_power_get_circuit_type: {circuit.value} returned: "
@@ -364,7 +376,7 @@ class DGILibAuxiliary(object):
         status = self.dgilib.auxiliary_power_get_status(
             self.power_hndl)
         if self.verbose:
-            print(f"power_status: {status}")
+            self.tracer.trace(f"power_status: {status}")
 
         return status
 
@@ -408,7 +420,7 @@ class DGILibAuxiliary(object):
         res = self.dgilib.auxiliary_power_start(
             self.power_hndl, mode, parameter)
         if self.verbose:
-            print(
+            self.tracer.trace(
                 f"\t{res} auxiliary_power_start, mode: {mode.value}, "
                 f"parameter: {parameter.value}")
         if res:
@@ -434,7 +446,7 @@ class DGILibAuxiliary(object):
         res = self.dgilib.auxiliary_power_stop(
             self.power_hndl)
         if self.verbose:
-            print(f"\t{res} auxiliary_power_stop")
+            self.tracer.trace(f"\t{res} auxiliary_power_stop")
         if res:
             raise DeviceReturnError(f"auxiliary_power_stop returned: {res}")
 
@@ -460,7 +472,7 @@ class DGILibAuxiliary(object):
         res = self.dgilib.auxiliary_power_lock_data_for_reading(
             self.power_hndl)
         if self.verbose:
-            print(f"\t{res} auxiliary_power_lock_data_for_reading")
+            self.tracer.trace(f"\t{res} auxiliary_power_lock_data_for_reading")
         if res:
             raise DeviceReturnError(
                 f"auxiliary_power_lock_data_for_reading returned: {res}")
@@ -506,8 +518,63 @@ class DGILibAuxiliary(object):
         :rtype: tuple(list(int), list(int))
         :raises: :exc:`DeviceReturnError`
         """
-        # buffer = (c_float * max_count)()
-        # timestamp = (c_double * max_count)()
+        # Use the buffers of the channel and power type, allocate them if they
+        # have not been registered
+        if self.power_buffer_pointers is None:
+            self.power_buffer_pointers = {}
+        if (channel, power_type) not in self.power_buffer_pointers:
+            self.power_buffer_pointers[(channel, power_type)] = (
+                (c_float * max_count)(), (c_double * max_count)(), c_size_t())
+        buffer, timestamp, _ = self.power_buffer_pointers[
+            (channel, power_type)]
+
+        count = self._auxiliary_power_copy_data(
+            buffer, timestamp, min(max_count, len(buffer)), channel,
+            power_type)
+
+        return timestamp[:count], buffer[:count]
+
+    def auxiliary_power_copy_data_into(
+            self, buffer, timestamp, offset=0, channel=0, power_type=0,
+            max_count=BUFFER_SIZE):
+        """`auxiliary_power_copy_data` into preallocated buffers.
+
+        Like :meth:`auxiliary_power_copy_data`, but DGILib copies the samples
+        straight into `buffer` and `timestamp` from index `offset` on, so
+        they do not pass through the registered buffers and Python lists.
+
+        :param buffer: Writable buffer of floats (like ``array("f")``) that
+            will hold the samples.
+        :param timestamp: Writable buffer of doubles (like ``array("d")``)
+            that will hold the timestamps.
+        :param offset: Index in the buffers to copy the first sample to
+            (defaults to 0)
+        :type offset: int
+        :param channel: Power channel for this buffer: A = 0, B = 1 (defaults
+            to 0)
+        :type channel: int
+        :param power_type: Type of power data: Current = 0, Voltage = 1,
+            Range = 2 (defaults to 0)
+        :type power_type: int
+        :param max_count: Maximum number of elements to copy, limited to the
+            space in the buffers after `offset` (defaults to BUFFER_SIZE)
+        :type max_count: int
+        :return: Number of samples copied
+        :rtype: int
+        :raises: :exc:`DeviceReturnError`
+        """
+        max_count = min(max_count, len(buffer) - offset,
+                        len(timestamp) - offset)
+        return self._auxiliary_power_copy_data(
+            (c_float * max_count).from_buffer(
+                buffer, offset * sizeof(c_float)),
+            (c_double * max_count).from_buffer(
+                timestamp, offset * sizeof(c_double)),
+            max_count, channel, power_type)
+
+    def _auxiliary_power_copy_data(
+            self, buffer, timestamp, max_count, channel, power_type):
+        """Call `auxiliary_power_copy_data` and return the count."""
         count = c_size_t()
         max_count = c_size_t(max_count)
         channel = c_int(channel)
@@ -515,39 +582,25 @@ class DGILibAuxiliary(object):
 
         res = self.dgilib.auxiliary_power_copy_data(
             self.power_hndl,
-            self.powerBuffer,
-            self.powerTimestamp,
-            # byref(self.powerCount),
-            # buffer,
-            # timestamp,
+            buffer,
+            timestamp,
             byref(count),
             max_count,
             channel,
             power_type,
         )
         if self.verbose:
-            print(
+            self.tracer.trace(
                 f"\t{res} auxiliary_power_copy_data: {count.value} samples, "
-                f"power_type: {power_type.value}")
-            # f"\t{res} auxiliary_power_copy_data: {self.powerCount.value} "
-            # f"samples, power_type: {power_type.value}"
+                f"channel: {channel.value}, power_type: {power_type.value}")
             if self.verbose >= 3:
-                for i in range(min(count.value, MAX_PRINT)):
-                    # for i in range(min(self.powerCount.value, MAX_PRINT)):
-                    #     print(f"\t{i}: buffer: {buffer[i]}, timestamp: "
-                    #         f"{timestamp[i]}")
-                    print(
-                        f"\t{i}: buffer: {self.powerBuffer[i]}, timestamp: "
-                        f"{self.powerTimestamp[i]}")
+                self.tracer.trace_samples(
+                    count.value, ("buffer", buffer), ("timestamp", timestamp))
         if res:
             raise DeviceReturnError(
                 f"auxiliary_power_copy_data returned: {res}")
 
-        return (self.powerTimestamp[: count.value],
-                self.powerBuffer[:count.value])
-        # return (self.powerTimestamp[: self.powerCount.value],
-        #         self.powerBuffer[:self.powerCount.value])
-        # return timestamp[:], buffer[:]
+        return count.value
 
     def auxiliary_power_free_data(self):
         """`auxiliary_power_free_data`.
@@ -567,7 +620,7 @@ class DGILibAuxiliary(object):
         res = self.dgilib.auxiliary_power_free_data(
             self.power_hndl)
         if self.verbose:
-            print(f"\t{res} auxiliary_power_free_data")
+            self.tracer.trace(f"\t{res} auxiliary_power_free_data")
         if res:
             raise DeviceReturnError(
                 f"auxiliary_power_free_data returned: {res}")
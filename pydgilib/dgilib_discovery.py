@@ -1,9 +1,105 @@
 """This module provides Python bindings for the Discovery API of DGILib."""
 
-from ctypes import byref, create_string_buffer
+import atexit
+from ctypes import (byref, create_string_buffer, c_bool, c_char_p, c_uint,
+                    CDLL, CFUNCTYPE)
+from threading import Lock
 
 from pydgilib.dgilib_config import GET_STRING_SIZE
 from pydgilib.dgilib_exceptions import DeviceReturnError
+from pydgilib.dgilib_instrumentation import DGILibInstrumentation
+
+# typedef void (*DeviceStatusChangedCallBack)(char* device_name, char*
+# device_serial, BOOL connected)
+DeviceStatusChangedCallBack = CFUNCTYPE(None, c_char_p, c_char_p, c_bool)
+
+
+class DGILibDiscoveryCache(object):
+    """Process-wide cache of the discovered devices.
+
+    Scanning for devices (`discover`) enumerates the USB devices, which takes
+    a lot of time compared to short sessions. The serial numbers of the
+    devices are cached and the cache is invalidated by the device status
+    change notifications of DGILib (a device was connected or disconnected).
+
+    Every notification increments `generation`, a scan is only cached if no
+    notification arrived while it ran.
+
+    Functions in `listeners` are called with the `device_name`,
+    `device_serial` and `connected` arguments of the notification.
+    """
+
+    def __init__(self):
+        """Instantiate DGILibDiscoveryCache object."""
+        self.device_sns = None
+        self.generation = 0
+        self.listeners = []
+        self.dgilib = None
+        self.notification_hndl = None
+        self.callback = None
+        self.lock = Lock()
+
+    def invalidate(self):
+        """Invalidate the cache, the next session will discover again."""
+        self.device_sns = None
+
+    def status_changed(self, device_name, device_serial, connected):
+        """Handle a device status change notification.
+
+        Note that it is not allowed to connect to a device in the context of
+        the callback function.
+        """
+        self.generation += 1
+        self.invalidate()
+        for listener in self.listeners:
+            listener(device_name, device_serial, connected)
+
+    def close(self):
+        """Unregister the notifications and uninitialize their handle.
+
+        Registered with :mod:`atexit` when the notifications are registered.
+        """
+        with self.lock:
+            if self.notification_hndl is None:
+                return
+            self.dgilib.unregister_for_device_status_change_notifications(
+                self.notification_hndl, self.callback)
+            self.dgilib.uninitialize_status_change_notification(
+                self.notification_hndl)
+            self.dgilib = None
+            self.notification_hndl = None
+            self.callback = None
+            self.invalidate()
+
+
+discovery_caches = {}
+
+
+def discovery_cache_key(dgilib):
+    """Get the key of the discovery cache of a loaded dgilib.
+
+    Every call to `cdll.LoadLibrary` returns a new :class:`CDLL` object, so
+    a loaded DLL is identified by its module handle, which is the same for
+    every time it is loaded in the process. Stand-ins (like
+    :class:`DGILibSimulator`) are identified by the object itself.
+    """
+    if isinstance(dgilib, DGILibInstrumentation):
+        dgilib = dgilib.dgilib
+    if isinstance(dgilib, CDLL):
+        return (CDLL, dgilib._handle)
+    return dgilib
+
+
+def get_discovery_cache(dgilib):
+    """Get the :class:`DGILibDiscoveryCache` of a loaded dgilib.
+
+    Every library (or stand-in, like :class:`DGILibSimulator`) has its own
+    cache, see :func:`discovery_cache_key`.
+    """
+    key = discovery_cache_key(dgilib)
+    if key not in discovery_caches:
+        discovery_caches[key] = DGILibDiscoveryCache()
+    return discovery_caches[key]
 
 
 class DGILibDiscovery(object):
@@ -14,52 +110,11 @@ class DGILibDiscovery(object):
     Gateway Interface user guide for further details. DGILib handles
     the low-level USB communication and adds a level of buffering for
     minimizing the chance of overflows.
-
-    TODO?
-    2.1.1. initialize_status_change_notification
-    Initializes the system necessary for using the status change notification
-    callback mechanisms. A handle will be created to keep track of the
-    registered callbacks. This function must always be called before
-    registering and unregistering notification callbacks.
-    Function definition
-    void initialize_status_change_notification(uint32_t* handlep)
-    Parameters
-    handlep Pointer to a variable that will hold the handle
-    2.1.2. uninitialize_status_change_notification
-    Uninitializes the status change notification callback mechanisms. This
-    function must be called when shutting down to clean up memory allocations.
-    Function definition
-    void uninitialize_status_change_notification(uint32_t handle)
-    Parameters
-    handle Handle to uninitialize
-    2.1.3. register_for_device_status_change_notifications
-    Registers provided function pointer with the device status change
-    mechanism. Whenever there is a change (device connected or disconnected)
-    the callback will be executed. Note that it is not allowed to connect to a
-    device in the context of the callback function. The callback function has
-    the following definition: typedef void (*DeviceStatusChangedCallBack)(char*
-    device_name, char* device_serial, BOOL connected)
-    Function definition
-    void register_for_device_status_change_notifications(uint32_t handle,
-    DeviceStatusChangedCallBack deviceStatusChangedCallBack)
-    Parameters
-    handle Handle to change notification mechanisms
-    deviceStatusChangedCallBack Function pointer that will be called when the
-    devices change
-    2.1.4. unregister_for_device_status_change_notifications
-    Unregisters previously registered function pointer from the device status
-    change mechanism.
-    Function definition
-    void unregister_for_device_status_change_notifications(uint32_t handle,
-    DeviceStatusChangedCallBack deviceStatusChangedCallBack)
-    Parameters
-    handle Handle to change notification mechanisms
-    deviceStatusChangedCallBack Function pointer that will be removed
-
     """
 
     dgilib = None
     verbose = None
+    tracer = None
 
     def discover(self):
         """`discover`.
@@ -84,7 +139,7 @@ class DGILibDiscovery(object):
         """
         device_count = self.dgilib.get_device_count()
         if self.verbose:
-            print(f"device_count: {device_count}")
+            self.tracer.trace(f"device_count: {device_count}")
         return device_count
 
     def get_device_name(self, index=0):
@@ -111,7 +166,7 @@ class DGILibDiscovery(object):
         name = create_string_buffer(GET_STRING_SIZE)
         res = self.dgilib.get_device_name(index, byref(name))
         if self.verbose:
-            print(f"\t{res} get_device_name: {name.value}")
+            self.tracer.trace(f"\t{res} get_device_name: {name.value}")
         if res:
             raise DeviceReturnError(f"get_device_name returned: {res}")
         return name.value
@@ -141,7 +196,7 @@ class DGILibDiscovery(object):
         device_sn = create_string_buffer(GET_STRING_SIZE)
         res = self.dgilib.get_device_serial(index, byref(device_sn))
         if self.verbose:
-            print(f"\t{res} get_device_serial: {device_sn.value}")
+            self.tracer.trace(f"\t{res} get_device_serial: {device_sn.value}")
         if res:
             raise DeviceReturnError(f"get_device_serial returned: {res}")
         return device_sn.value
@@ -174,7 +229,7 @@ class DGILibDiscovery(object):
         """
         msd_mode = self.dgilib.is_msd_mode(device_sn)
         if self.verbose:
-            print(f"msd_mode: {msd_mode}")
+            self.tracer.trace(f"msd_mode: {msd_mode}")
         return msd_mode
 
     def set_mode(self, device_sn, nmbed=1):
@@ -200,6 +255,167 @@ class DGILibDiscovery(object):
         """
         res = self.dgilib.set_mode(device_sn, nmbed)
         if self.verbose:
-            print(f"\t{res} set_mode {nmbed}")
+            self.tracer.trace(f"\t{res} set_mode {nmbed}")
         if res:
             raise DeviceReturnError(f"set_mode returned: {res}")
+
+    def initialize_status_change_notification(self):
+        """`initialize_status_change_notification`.
+
+        Initializes the system necessary for using the status change
+        notification callback mechanisms. A handle will be created to keep
+        track of the registered callbacks. This function must always be
+        called before registering and unregistering notification callbacks.
+
+        `void initialize_status_change_notification(uint32_t* handlep)`
+
+        +------------+------------+
+        | Parameter  | Description |
+        +============+============+
+        | *handlep* | Pointer to a variable that will hold the handle |
+        +------------+------------+
+
+        :return: Handle to change notification mechanisms
+        :rtype: c_uint()
+        """
+        handle = c_uint()
+        self.dgilib.initialize_status_change_notification(byref(handle))
+        if self.verbose:
+            self.tracer.trace(
+                f"initialize_status_change_notification: {handle.value}")
+        return handle
+
+    def uninitialize_status_change_notification(self, handle):
+        """`uninitialize_status_change_notification`.
+
+        Uninitializes the status change notification callback mechanisms.
+        This function must be called when shutting down to clean up memory
+        allocations.
+
+        `void uninitialize_status_change_notification(uint32_t handle)`
+
+        +------------+------------+
+        | Parameter  | Description |
+        +============+============+
+        | *handle* | Handle to uninitialize |
+        +------------+------------+
+
+        :param handle: Handle to uninitialize
+        :type handle: c_uint()
+        """
+        self.dgilib.uninitialize_status_change_notification(handle)
+        if self.verbose:
+            self.tracer.trace(
+                f"uninitialize_status_change_notification: {handle.value}")
+
+    def register_for_device_status_change_notifications(
+            self, handle, callback):
+        """`register_for_device_status_change_notifications`.
+
+        Registers provided function pointer with the device status change
+        mechanism. Whenever there is a change (device connected or
+        disconnected) the callback will be executed. Note that it is not
+        allowed to connect to a device in the context of the callback
+        function.
+
+        `void register_for_device_status_change_notifications(uint32_t handle,
+        DeviceStatusChangedCallBack deviceStatusChangedCallBack)`
+
+        +------------+------------+
+        | Parameter  | Description |
+        +============+============+
+        | *handle* | Handle to change notification mechanisms |
+        | *deviceStatusChangedCallBack* | Function pointer that will be called
+        when the devices change |
+        +------------+------------+
+
+        :param handle: Handle to change notification mechanisms
+        :type handle: c_uint()
+        :param callback: Function that will be called with `device_name`,
+            `device_serial` and `connected` when the devices change
+        :type callback: callable or DeviceStatusChangedCallBack
+        :return: The function pointer that was registered, it has to be
+            kept alive (and passed to unregister) by the caller
+        :rtype: DeviceStatusChangedCallBack
+        """
+        if not isinstance(callback, DeviceStatusChangedCallBack):
+            callback = DeviceStatusChangedCallBack(callback)
+        self.dgilib.register_for_device_status_change_notifications(
+            handle, callback)
+        if self.verbose:
+            self.tracer.trace(
+                f"register_for_device_status_change_notifications: "
+                f"{handle.value}")
+        return callback
+
+    def unregister_for_device_status_change_notifications(
+            self, handle, callback):
+        """`unregister_for_device_status_change_notifications`.
+
+        Unregisters previously registered function pointer from the device
+        status change mechanism.
+
+        `void unregister_for_device_status_change_notifications(uint32_t
+        handle, DeviceStatusChangedCallBack deviceStatusChangedCallBack)`
+
+        +------------+------------+
+        | Parameter  | Description |
+        +============+============+
+        | *handle* | Handle to change notification mechanisms |
+        | *deviceStatusChangedCallBack* | Function pointer that will be
+        removed |
+        +------------+------------+
+
+        :param handle: Handle to change notification mechanisms
+        :type handle: c_uint()
+        :param callback: Function pointer returned by
+            `register_for_device_status_change_notifications`
+        :type callback: DeviceStatusChangedCallBack
+        """
+        self.dgilib.unregister_for_device_status_change_notifications(
+            handle, callback)
+        if self.verbose:
+            self.tracer.trace(
+                f"unregister_for_device_status_change_notifications: "
+                f"{handle.value}")
+
+    def get_device_serials(self, use_cache=True):
+        """Get the serial numbers of all detected devices.
+
+        The result is cached for the whole process per loaded library (see
+        :func:`get_discovery_cache` and :class:`DGILibDiscoveryCache`). The
+        first call registers for the device status change notifications,
+        which invalidate the cache when a device is connected or
+        disconnected. They are unregistered when the process exits.
+
+        :param use_cache: Use the cached serial numbers if they are valid
+            (defaults to True)
+        :type use_cache: bool
+        :return: The serial numbers of the detected devices
+        :rtype: list(str)
+        """
+        discovery_cache = get_discovery_cache(self.dgilib)
+        with discovery_cache.lock:
+            if use_cache and discovery_cache.device_sns is not None:
+                return list(discovery_cache.device_sns)
+
+            # Register before scanning, so a device that is connected or
+            # disconnected during the scan is not missed
+            if discovery_cache.notification_hndl is None:
+                discovery_cache.dgilib = self.dgilib
+                discovery_cache.notification_hndl = \
+                    self.initialize_status_change_notification()
+                discovery_cache.callback = \
+                    self.register_for_device_status_change_notifications(
+                        discovery_cache.notification_hndl,
+                        discovery_cache.status_changed)
+                atexit.register(discovery_cache.close)
+
+            generation = discovery_cache.generation
+            self.discover()
+            device_sns = [self.get_device_serial(index)
+                          for index in range(self.get_device_count())]
+            if discovery_cache.generation == generation:
+                discovery_cache.device_sns = device_sns
+
+            return list(device_sns)
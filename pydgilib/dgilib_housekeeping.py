@@ -18,6 +18,7 @@ class DGILibHousekeeping(object):
 
     dgilib = None
     verbose = None
+    tracer = None
     dgi_hndl = None
 
     def connect(self, device_sn):
@@ -50,7 +51,7 @@ class DGILibHousekeeping(object):
 
         res = self.dgilib.connect(device_sn, byref(dgi_hndl))
         if self.verbose:
-            print(f"\t{res} connect")
+            self.tracer.trace(f"\t{res} connect")
         if res:
             raise DeviceReturnError(f"connect returned: {res}")
 
@@ -73,7 +74,7 @@ class DGILibHousekeeping(object):
         """
         res = self.dgilib.disconnect(self.dgi_hndl)
         if self.verbose:
-            print(f"\t{res} disconnect")
+            self.tracer.trace(f"\t{res} disconnect")
         if res:
             raise DeviceReturnError(f"disconnect returned: {res}")
 
@@ -98,7 +99,7 @@ class DGILibHousekeeping(object):
         """
         c_status = self.dgilib.connection_status(self.dgi_hndl)
         if self.verbose:
-            print(f"connection_status: {c_status}")
+            self.tracer.trace(f"connection_status: {c_status}")
 
         return c_status
 
@@ -115,7 +116,7 @@ class DGILibHousekeeping(object):
         major_version = self.dgilib.get_major_version()
 
         if self.verbose:
-            print(f"major_version: {major_version}")
+            self.tracer.trace(f"major_version: {major_version}")
 
         return major_version
 
@@ -132,7 +133,7 @@ class DGILibHousekeeping(object):
         minor_version = self.dgilib.get_minor_version()
 
         if self.verbose:
-            print(f"minor_version: {minor_version}")
+            self.tracer.trace(f"minor_version: {minor_version}")
 
         return minor_version
 
@@ -151,7 +152,7 @@ class DGILibHousekeeping(object):
         build_number = self.dgilib.get_build_number()
 
         if self.verbose:
-            print(f"build_number: {build_number}")
+            self.tracer.trace(f"build_number: {build_number}")
 
         return build_number
 
@@ -184,11 +185,12 @@ class DGILibHousekeeping(object):
         res = self.dgilib.get_fw_version(
             self.dgi_hndl, byref(major_fw), byref(minor_fw))
         if self.verbose:
-            print(f"\t{res} get_fw_version")
+            self.tracer.trace(f"\t{res} get_fw_version")
         if res:
             raise DeviceReturnError(f"get_fw_version returned: {res}")
         if self.verbose:
-            print(f"major_fw: {major_fw.value}\nminor_fw: {minor_fw.value}")
+            self.tracer.trace(
+                f"major_fw: {major_fw.value}\nminor_fw: {minor_fw.value}")
 
         return major_fw.value, minor_fw.value
 
@@ -214,7 +216,7 @@ class DGILibHousekeeping(object):
         """
         res = self.dgilib.start_polling(self.dgi_hndl)
         if self.verbose:
-            print(f"\t{res} start_polling")
+            self.tracer.trace(f"\t{res} start_polling")
         if res:
             raise DeviceReturnError(f"start_polling returned: {res}")
 
@@ -238,7 +240,7 @@ class DGILibHousekeeping(object):
         """
         res = self.dgilib.stop_polling(self.dgi_hndl)
         if self.verbose:
-            print(f"\t{res} stop_polling")
+            self.tracer.trace(f"\t{res} stop_polling")
         if res:
             raise DeviceReturnError(f"stop_polling returned: {res}")
 
@@ -264,6 +266,6 @@ class DGILibHousekeeping(object):
         res = self.dgilib.target_reset(
             self.dgi_hndl, hold_reset)
         if self.verbose:
-            print(f"\t{res} target_reset {hold_reset}")
+            self.tracer.trace(f"\t{res} target_reset {hold_reset}")
         if res:
             raise DeviceReturnError(f"target_reset returned: {res}")
@@ -0,0 +1,157 @@
+"""This module measures the calls to the functions of DGILib."""
+
+from collections import deque
+from time import perf_counter
+
+# Number of latencies kept per function to compute the percentiles
+LATENCY_SAMPLES = 10000
+
+
+def _target(argument):
+    """Get the object a ctypes pointer (made with `byref`) points to."""
+    return getattr(argument, "_obj", argument)
+
+
+# Functions that transfer samples, and how to get the number of samples from
+# the arguments and return value of the call
+TRANSFERRED = {
+    "interface_read_data": lambda args, res: _target(args[4]).value,
+    "interface_write_data": lambda args, res: _target(args[3]).value,
+    "auxiliary_power_copy_data": lambda args, res: _target(args[3]).value,
+    "auxiliary_power_get_calibration": lambda args, res: res,
+}
+
+
+class FunctionStats(object):
+    """Statistics of the calls to one function of DGILib.
+
+    Attributes
+    ----------
+    calls : int
+        Number of calls.
+
+    total_time : float
+        Cumulative time spent in the function, in seconds.
+
+    max_time : float
+        Longest call, in seconds.
+
+    transferred : int
+        Number of samples (or bytes) transferred by the function.
+
+    latencies : deque(float)
+        Duration of the last `LATENCY_SAMPLES` calls, in seconds.
+    """
+
+    __slots__ = ("calls", "total_time", "max_time", "transferred",
+                 "latencies")
+
+    def __init__(self):
+        """Instantiate FunctionStats object."""
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.transferred = 0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    def add(self, latency, transferred=0):
+        """Record a call."""
+        self.calls += 1
+        self.total_time += latency
+        if latency > self.max_time:
+            self.max_time = latency
+        self.transferred += transferred
+        self.latencies.append(latency)
+
+    def percentile(self, percent):
+        """Get the percentile of the recent latencies, in seconds."""
+        if not self.latencies:
+            return 0.0
+        latencies = sorted(self.latencies)
+        index = min(len(latencies) - 1,
+                    int(round(percent / 100 * (len(latencies) - 1))))
+        return latencies[index]
+
+    def snapshot(self):
+        """Get the statistics as a dictionary."""
+        return {
+            "calls": self.calls,
+            "total_time": self.total_time,
+            "mean_time": self.total_time / self.calls if self.calls else 0.0,
+            "p50_time": self.percentile(50),
+            "p90_time": self.percentile(90),
+            "p99_time": self.percentile(99),
+            "max_time": self.max_time,
+            "transferred": self.transferred,
+        }
+
+
+class DGILibInstrumentation(object):
+    """Wrapper around the loaded dgilib that measures every call.
+
+    Stands in for `DGILib.dgilib`, so the bindings do not have to change.
+    Every function that is called through the wrapper is timed, and for the
+    functions in `TRANSFERRED` the number of samples that was transferred is
+    counted. When the instrumentation is disabled the wrapper is removed, so
+    it costs nothing.
+
+    :Example:
+
+    >>> dgilib = DGILib(instrument=True)
+    >>> with dgilib:
+    ...     dgilib.interface_read_data(INTERFACE_GPIO)
+    >>> dgilib.get_stats()["interface_read_data"]["calls"]
+    1
+    """
+
+    def __init__(self, dgilib):
+        """Instantiate DGILibInstrumentation object."""
+        self.dgilib = dgilib
+        self.stats = {}
+
+    def __getattr__(self, name):
+        """Get the instrumented function of the dgilib."""
+        function = getattr(self.dgilib, name)
+        stats = self.stats.setdefault(name, FunctionStats())
+        transferred = TRANSFERRED.get(name)
+
+        def instrumented(*args):
+            start = perf_counter()
+            res = function(*args)
+            latency = perf_counter() - start
+            stats.add(latency, transferred(args, res) if transferred else 0)
+            return res
+
+        # Cache the wrapper so the lookup is only done once per function
+        setattr(self, name, instrumented)
+        return instrumented
+
+    def snapshot(self):
+        """Get the statistics of all functions that were called.
+
+        Returns
+        -------
+        dict
+            Dictionary of function names and dictionaries with the `calls`,
+            `total_time`, `mean_time`, `p50_time`, `p90_time`, `p99_time`,
+            `max_time` (in seconds) and `transferred` samples.
+        """
+        return {name: stats.snapshot() for name, stats in self.stats.items()
+                if stats.calls}
+
+    def reset(self):
+        """Clear the statistics."""
+        # Drop the cached wrappers, they refer to the old statistics
+        for name in self.stats:
+            self.__dict__.pop(name, None)
+        self.stats = {}
+
+    def __eq__(self, other):
+        """Compare equal to the wrapped dgilib (for the discovery cache)."""
+        if isinstance(other, DGILibInstrumentation):
+            other = other.dgilib
+        return self.dgilib is other
+
+    def __hash__(self):
+        """Hash like the wrapped dgilib."""
+        return hash(self.dgilib)
@@ -23,6 +23,8 @@ class DGILibInterfaceCommunication(object):
 
     dgilib = None
     verbose = None
+    tracer = None
+    overflows = None
     dgi_hndl = None
 
     def interface_list(self):
@@ -54,7 +56,7 @@ class DGILibInterfaceCommunication(object):
         res = self.dgilib.interface_list(
             self.dgi_hndl, byref(interfaces), byref(interfaceCount))
         if self.verbose:
-            print(
+            self.tracer.trace(
                 f"\t{res} interface_list: {interfaces[:interfaceCount.value]},"
                 f" interfaceCount: {interfaceCount.value}")
         if res:
@@ -91,7 +93,7 @@ class DGILibInterfaceCommunication(object):
         res = self.dgilib.interface_enable(
             self.dgi_hndl, interface_id, timestamp)
         if self.verbose:
-            print(
+            self.tracer.trace(
                 f"\t{res} interface_enable: {interface_id}, timestamp: "
                 f"{timestamp}")
         if res:
@@ -120,7 +122,7 @@ class DGILibInterfaceCommunication(object):
         res = self.dgilib.interface_disable(
             self.dgi_hndl, interface_id)
         if self.verbose:
-            print(f"\t{res} interface_disable: {interface_id}")
+            self.tracer.trace(f"\t{res} interface_disable: {interface_id}")
         if res:
             raise DeviceReturnError(f"interface_disable returned: {res}")
 
@@ -164,15 +166,14 @@ class DGILibInterfaceCommunication(object):
             byref(config_value),
             byref(config_cnt))
         if self.verbose:
-            print(
+            self.tracer.trace(
                 f"\t{res} interface_get_configuration: {interface_id}, "
                 f"config_cnt: {config_cnt.value}"
             )
             if self.verbose >= 2:
-                for i in range(config_cnt.value):
-                    print(
-                        f"\t\tconfig_id: {config_id[i]},\tvalue: "
-                        f"{config_value[i]}")
+                self.tracer.trace_samples(
+                    config_cnt.value, ("config_id", config_id),
+                    ("value", config_value))
         if res:
             raise DeviceReturnError(
                 f"\t{res} interface_get_configuration: {interface_id}, "
@@ -232,14 +233,13 @@ class DGILibInterfaceCommunication(object):
             byref(config_value),
             config_cnt)
         if self.verbose:
-            print(
+            self.tracer.trace(
                 f"\t{res} interface_set_configuration: {interface_id}, "
                 f"config_cnt: {config_cnt.value}")
             if self.verbose >= 2:
-                for i in range(config_cnt.value):
-                    print(
-                        f"\t\tconfig_id: {config_id[i]},\tvalue: "
-                        f"{config_value[i]}")
+                self.tracer.trace_samples(
+                    config_cnt.value, ("config_id", config_id),
+                    ("value", config_value))
         if res:
             raise DeviceReturnError(
                 f"interface_set_configuration: {interface_id} returned: {res}")
@@ -265,7 +265,8 @@ class DGILibInterfaceCommunication(object):
         res = self.dgilib.interface_clear_buffer(
             self.dgi_hndl, interface_id)
         if self.verbose:
-            print(f"\t{res} interface_clear_buffer: {interface_id}")
+            self.tracer.trace(
+                f"\t{res} interface_clear_buffer: {interface_id}")
         if res:
             raise DeviceReturnError(f"interface_clear_buffer returned: {res}")
 
@@ -274,7 +275,7 @@ class DGILibInterfaceCommunication(object):
 
         Reads the data received on the specified interface. This should be
         called regularly to avoid overflows in the system. DGILib can buffer
-        10M samples.
+        10M samples. Overflows are counted per interface in `self.overflows`.
 
         `int interface_read_data(uint32_t dgi_hndl, int interface_id, unsigned
         char* buffer, unsigned long long* timestamp, int* length, unsigned int*
@@ -321,15 +322,19 @@ class DGILibInterfaceCommunication(object):
             byref(ovf_length),
             byref(ovf_entry_count))
         if self.verbose:
-            print(
+            self.tracer.trace(
                 f"\t{res} interface_read_data: {interface_id}, length: "
                 f"{length.value}")
             if self.verbose >= 2:
-                for i in range(length.value):
-                    print(f"\t{i}:\tbuffer: {buffer[i]},\ttick: {ticks[i]}")
+                self.tracer.trace_samples(
+                    length.value, ("buffer", buffer), ("tick", ticks))
         if res:
             raise DeviceReturnError(
                 f"interface_read_data: {interface_id} returned: {res}")
+        if ovf_entry_count.value:
+            # Count the overflows per interface
+            self.overflows[interface_id] = \
+                self.overflows.get(interface_id, 0) + ovf_entry_count.value
 
         return ticks[:length.value], buffer[:length.value]
 
@@ -370,12 +375,11 @@ class DGILibInterfaceCommunication(object):
         res = self.dgilib.interface_write_data(
             self.dgi_hndl, interface_id, byref(buffer), byref(length))
         if self.verbose:
-            print(
+            self.tracer.trace(
                 f"\t{res} interface_write_data: {interface_id}, length: "
                 f"{length.value}")
             if self.verbose >= 2:
-                for i in range(length.value):
-                    print(f"\t{i}:\tbuffer: {buffer[i]}")
+                self.tracer.trace_samples(length.value, ("buffer", buffer))
         if res:
             raise DeviceReturnError(
                 f"TODO: interface_write_data: {interface_id} returned: {res}")
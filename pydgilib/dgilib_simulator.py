@@ -0,0 +1,649 @@
+"""This module provides a simulated DGILib for testing without hardware."""
+
+from itertools import count
+from math import floor
+from threading import RLock
+from time import perf_counter
+
+from pydgilib.dgilib_config import (
+    BUFFER_SIZE, NUM_CALIBRATION, INTERFACE_TIMESTAMP, INTERFACE_GPIO,
+    INTERFACE_POWER_DATA, INTERFACE_POWER_SYNC, XAM, IDLE, RUNNING, DONE,
+    CALIBRATING, OVERFLOWED, CHANNEL_A, POWER_CURRENT, POWER_VOLTAGE)
+
+# Return codes of the simulated functions
+SUCCESS = 0
+FAILURE = 1
+
+
+def _value(argument):
+    """Get the value of a ctypes object, or the argument itself."""
+    return getattr(argument, "value", argument)
+
+
+def _target(argument):
+    """Get the object a ctypes pointer (made with `byref`) points to."""
+    return getattr(argument, "_obj", argument)
+
+
+class SimulatedDevice(object):
+    """State of a simulated DGI device.
+
+    The GPIO and power samples are generated from the time since polling was
+    started, when the data is read. Samples that do not fit in the buffers of
+    the device are dropped and reported as an overflow, like DGILib does.
+
+    Parameters
+    ----------
+    serial : bytes
+        Serial number of the device
+
+    name : bytes
+        Name of the device (default: `b"Simulated Power Debugger"`)
+
+    gpio_rate : float
+        Number of GPIO samples per second (default: `1000`)
+
+    power_rate : float
+        Number of power samples per second (default: `62500`)
+
+    gpio_function : callable
+        Function of the time in seconds that returns the pin values as an int
+        (default: :meth:`default_gpio_function`)
+
+    power_function : callable
+        Function of the time in seconds and power type that returns the power
+        sample (default: :meth:`default_power_function`)
+
+    buffer_size : int
+        Number of samples the device can buffer per interface and power buffer
+        before it overflows (default: `BUFFER_SIZE`)
+
+    calibration_time : float
+        Number of seconds a calibration takes (default: `2`)
+
+    timer_frequency : int
+        Frequency of the timestamp timer (default: `16000000`)
+
+    timer_prescaler : int
+        Prescaler of the timestamp timer (default: `1`)
+    """
+
+    def __init__(self, serial, name=b"Simulated Power Debugger",
+                 gpio_rate=1000, power_rate=62500, gpio_function=None,
+                 power_function=None, buffer_size=BUFFER_SIZE,
+                 calibration_time=2, timer_frequency=16000000,
+                 timer_prescaler=1):
+        """Instantiate SimulatedDevice object."""
+        self.serial = serial
+        self.name = name
+        self.gpio_rate = gpio_rate
+        self.power_rate = power_rate
+        self.gpio_function = gpio_function or self.default_gpio_function
+        self.power_function = power_function or self.default_power_function
+        self.buffer_size = buffer_size
+        self.calibration_time = calibration_time
+
+        self.interfaces = [INTERFACE_TIMESTAMP, INTERFACE_GPIO,
+                           INTERFACE_POWER_DATA, INTERFACE_POWER_SYNC]
+        self.configurations = {
+            INTERFACE_TIMESTAMP: {0: timer_prescaler, 1: timer_frequency},
+            INTERFACE_GPIO: {0: 0, 1: 0}}
+        self.enabled_interfaces = set()
+        self.connected = False
+        self.msd_mode = False
+        self.pin_values = 0
+
+        # Polling state
+        self.polling = False
+        self.poll_start = 0
+        self.gpio_generated = 0
+        self.gpio_data = []
+        self.gpio_overflows = 0
+
+        # Power state
+        self.power_buffers = {}
+        self.power_data = {}
+        self.locked_data = None
+        self.power_status = IDLE
+        self.power_start = 0
+        self.power_stop_time = None
+        self.power_generated = 0
+        self.calibration_end = None
+        self.calibration_valid = False
+
+    @property
+    def timer_factor(self):
+        """Factor to multiply ticks by to get seconds."""
+        timestamp_config = self.configurations[INTERFACE_TIMESTAMP]
+        return timestamp_config[0] / timestamp_config[1]
+
+    def default_gpio_function(self, time):
+        """Count up on the pins, one step per sample."""
+        return floor(time * self.gpio_rate) % 16
+
+    def default_power_function(self, time, power_type=POWER_CURRENT):
+        """Draw 1 mA, and 2 mA more while pin 0 is high, at 3.3 V."""
+        if power_type == POWER_VOLTAGE:
+            return 3.3
+        return 1e-3 + 2e-3 * (self.gpio_function(time) & 1)
+
+    def generate_gpio(self, now):
+        """Generate the GPIO samples up to `now`."""
+        if not self.polling or INTERFACE_GPIO not in self.enabled_interfaces:
+            return
+        elapsed = now - self.poll_start
+        count = floor(elapsed * self.gpio_rate)
+        read_mode = self.configurations[INTERFACE_GPIO][0]
+        timer_factor = self.timer_factor
+        for index in range(self.gpio_generated, count):
+            time = index / self.gpio_rate
+            self.gpio_data.append((round(time / timer_factor),
+                                   self.gpio_function(time) & read_mode))
+        self.gpio_generated = max(count, self.gpio_generated)
+        if len(self.gpio_data) > self.buffer_size:
+            dropped = len(self.gpio_data) - self.buffer_size
+            del self.gpio_data[:dropped]
+            self.gpio_overflows += dropped
+
+    def generate_power(self, now):
+        """Generate the power samples up to `now`."""
+        if self.power_status not in (RUNNING, OVERFLOWED):
+            return
+        if self.power_stop_time is not None and now >= self.power_stop_time:
+            now = self.power_stop_time
+            self.power_status = DONE
+        count = floor((now - self.power_start) * self.power_rate)
+        for (channel, power_type), data in self.power_data.items():
+            for index in range(self.power_generated, count):
+                time = index / self.power_rate
+                data.append((time, self.power_function(time, power_type)))
+            if len(data) > self.buffer_size:
+                del data[:len(data) - self.buffer_size]
+                self.power_status = OVERFLOWED
+        self.power_generated = max(count, self.power_generated)
+
+    def update_calibration(self, now):
+        """Finish the calibration if `calibration_time` has passed."""
+        if self.calibration_end is not None and now >= self.calibration_end:
+            self.calibration_end = None
+            self.calibration_valid = True
+            self.power_status = IDLE
+
+
+class DGILibSimulator(object):
+    """Pure Python stand-in for the DGILib dll.
+
+    Implements the functions of the dll that are used by the bindings, with
+    the same signatures. Arguments are passed as ctypes objects, outputs are
+    written to the objects passed with `byref` and the functions return the
+    same codes as the dll. Pass an instance as `dgilib_path` to use it
+    instead of the dll.
+
+    :Example:
+
+    >>> simulator = DGILibSimulator(calibration_time=0)
+    >>> with DGILibExtra(simulator, loggers=[LOGGER_OBJECT]) as dgilib:
+    ...     data = dgilib.logger.log(1)
+
+    Parameters
+    ----------
+    device_sns : list(bytes)
+        Serial numbers of the simulated devices (default:
+        ``[b"ATML0000000000000001"]``)
+
+    All other keyword arguments are passed on to :class:`SimulatedDevice`.
+    """
+
+    major_version = 5
+    minor_version = 0
+    build_number = 0
+    fw_version = (1, 0)
+
+    def __init__(self, device_sns=None, **kwargs):
+        """Instantiate DGILibSimulator object."""
+        if device_sns is None:
+            device_sns = [b"ATML0000000000000001"]
+        self.devices = [SimulatedDevice(device_sn, **kwargs)
+                        for device_sn in device_sns]
+        self.discovered = []
+        self.handles = {}
+        self.power_handles = {}
+        self.notification_handles = {}
+        self.handle_counter = count(1)
+        self.lock = RLock()
+        self.clock = perf_counter
+
+    def _device(self, dgi_hndl):
+        return self.handles.get(_value(dgi_hndl))
+
+    def _power_device(self, power_hndl):
+        return self.power_handles.get(_value(power_hndl))
+
+    def _new_handle(self):
+        # Handles are never reused, like those of DGILib
+        return next(self.handle_counter)
+
+    # Hotplug
+
+    def plug(self, device):
+        """Connect a :class:`SimulatedDevice` and notify the callbacks."""
+        with self.lock:
+            self.devices.append(device)
+        self._notify(device, True)
+
+    def unplug(self, device_sn):
+        """Disconnect a device and notify the callbacks."""
+        with self.lock:
+            device = next(device for device in self.devices
+                          if device.serial == device_sn)
+            self.devices.remove(device)
+            device.connected = False
+        self._notify(device, False)
+
+    def _notify(self, device, connected):
+        for callbacks in list(self.notification_handles.values()):
+            for callback in list(callbacks):
+                callback(device.name, device.serial, connected)
+
+    # Discovery
+
+    def discover(self):
+        """Simulate `discover`."""
+        with self.lock:
+            self.discovered = list(self.devices)
+
+    def get_device_count(self):
+        """Simulate `get_device_count`."""
+        return len(self.discovered)
+
+    def get_device_name(self, index, name):
+        """Simulate `get_device_name`."""
+        if not 0 <= index < len(self.discovered):
+            return FAILURE
+        _target(name).value = self.discovered[index].name
+        return SUCCESS
+
+    def get_device_serial(self, index, sn):
+        """Simulate `get_device_serial`."""
+        if not 0 <= index < len(self.discovered):
+            return FAILURE
+        _target(sn).value = self.discovered[index].serial
+        return SUCCESS
+
+    def is_msd_mode(self, sn):
+        """Simulate `is_msd_mode`."""
+        device = next((device for device in self.devices
+                       if device.serial == _value(sn)), None)
+        return int(device is not None and device.msd_mode)
+
+    def set_mode(self, sn, nmbed):
+        """Simulate `set_mode`."""
+        device = next((device for device in self.devices
+                       if device.serial == _value(sn)), None)
+        if device is None:
+            return FAILURE
+        device.msd_mode = not _value(nmbed)
+        return SUCCESS
+
+    def initialize_status_change_notification(self, handlep):
+        """Simulate `initialize_status_change_notification`."""
+        with self.lock:
+            handle = self._new_handle()
+            self.notification_handles[handle] = []
+        _target(handlep).value = handle
+
+    def uninitialize_status_change_notification(self, handle):
+        """Simulate `uninitialize_status_change_notification`."""
+        with self.lock:
+            self.notification_handles.pop(_value(handle), None)
+
+    def register_for_device_status_change_notifications(
+            self, handle, callback):
+        """Simulate `register_for_device_status_change_notifications`."""
+        with self.lock:
+            self.notification_handles[_value(handle)].append(callback)
+
+    def unregister_for_device_status_change_notifications(
+            self, handle, callback):
+        """Simulate `unregister_for_device_status_change_notifications`."""
+        with self.lock:
+            callbacks = self.notification_handles.get(_value(handle), [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    # Housekeeping
+
+    def connect(self, sn, dgi_hndl_p):
+        """Simulate `connect`."""
+        with self.lock:
+            device = next((device for device in self.devices
+                           if device.serial == _value(sn)), None)
+            if device is None or device.connected:
+                return FAILURE
+            device.connected = True
+            handle = self._new_handle()
+            self.handles[handle] = device
+        _target(dgi_hndl_p).value = handle
+        return SUCCESS
+
+    def disconnect(self, dgi_hndl):
+        """Simulate `disconnect`."""
+        with self.lock:
+            device = self.handles.pop(_value(dgi_hndl), None)
+            if device is None:
+                return FAILURE
+            device.connected = False
+            device.polling = False
+            device.enabled_interfaces.clear()
+        return SUCCESS
+
+    def connection_status(self, dgi_hndl):
+        """Simulate `connection_status`."""
+        device = self._device(dgi_hndl)
+        return int(device is None or not device.connected)
+
+    def get_major_version(self):
+        """Simulate `get_major_version`."""
+        return self.major_version
+
+    def get_minor_version(self):
+        """Simulate `get_minor_version`."""
+        return self.minor_version
+
+    def get_build_number(self):
+        """Simulate `get_build_number`."""
+        return self.build_number
+
+    def get_fw_version(self, dgi_hndl, major, minor):
+        """Simulate `get_fw_version`."""
+        if self._device(dgi_hndl) is None:
+            return FAILURE
+        _target(major).value, _target(minor).value = self.fw_version
+        return SUCCESS
+
+    def start_polling(self, dgi_hndl):
+        """Simulate `start_polling`."""
+        device = self._device(dgi_hndl)
+        if device is None:
+            return FAILURE
+        with self.lock:
+            device.polling = True
+            device.poll_start = self.clock()
+            device.gpio_generated = 0
+        return SUCCESS
+
+    def stop_polling(self, dgi_hndl):
+        """Simulate `stop_polling`."""
+        device = self._device(dgi_hndl)
+        if device is None:
+            return FAILURE
+        with self.lock:
+            device.generate_gpio(self.clock())
+            device.polling = False
+        return SUCCESS
+
+    def target_reset(self, dgi_hndl, hold_reset):
+        """Simulate `target_reset`."""
+        return SUCCESS if self._device(dgi_hndl) is not None else FAILURE
+
+    # Interface communication
+
+    def interface_list(self, dgi_hndl, interfaces, count):
+        """Simulate `interface_list`."""
+        device = self._device(dgi_hndl)
+        if device is None:
+            return FAILURE
+        interfaces = _target(interfaces)
+        for index, interface_id in enumerate(device.interfaces):
+            interfaces[index] = interface_id
+        _target(count).value = len(device.interfaces)
+        return SUCCESS
+
+    def interface_enable(self, dgi_hndl, interface_id, timestamp):
+        """Simulate `interface_enable`."""
+        device = self._device(dgi_hndl)
+        if device is None or _value(interface_id) not in device.interfaces:
+            return FAILURE
+        device.enabled_interfaces.add(_value(interface_id))
+        return SUCCESS
+
+    def interface_disable(self, dgi_hndl, interface_id):
+        """Simulate `interface_disable`."""
+        device = self._device(dgi_hndl)
+        if device is None or _value(interface_id) not in device.interfaces:
+            return FAILURE
+        device.enabled_interfaces.discard(_value(interface_id))
+        return SUCCESS
+
+    def interface_get_configuration(self, dgi_hndl, interface_id, config_id,
+                                    config_value, config_cnt):
+        """Simulate `interface_get_configuration`."""
+        device = self._device(dgi_hndl)
+        if device is None:
+            return FAILURE
+        configuration = device.configurations.get(_value(interface_id), {})
+        config_id, config_value = _target(config_id), _target(config_value)
+        for index, (key, value) in enumerate(configuration.items()):
+            config_id[index] = key
+            config_value[index] = value
+        _target(config_cnt).value = len(configuration)
+        return SUCCESS
+
+    def interface_set_configuration(self, dgi_hndl, interface_id, config_id,
+                                    config_value, config_cnt):
+        """Simulate `interface_set_configuration`."""
+        device = self._device(dgi_hndl)
+        if device is None:
+            return FAILURE
+        configuration = device.configurations.setdefault(
+            _value(interface_id), {})
+        config_id, config_value = _target(config_id), _target(config_value)
+        for index in range(_value(config_cnt)):
+            configuration[config_id[index]] = config_value[index]
+        return SUCCESS
+
+    def interface_clear_buffer(self, dgi_hndl, interface_id):
+        """Simulate `interface_clear_buffer`."""
+        device = self._device(dgi_hndl)
+        if device is None:
+            return FAILURE
+        with self.lock:
+            device.generate_gpio(self.clock())
+            if _value(interface_id) == INTERFACE_GPIO:
+                device.gpio_data.clear()
+        return SUCCESS
+
+    def interface_read_data(self, dgi_hndl, interface_id, buffer, timestamp,
+                            length, ovf_index, ovf_length, ovf_entry_count):
+        """Simulate `interface_read_data`."""
+        device = self._device(dgi_hndl)
+        if device is None:
+            return FAILURE
+        with self.lock:
+            data = []
+            if _value(interface_id) == INTERFACE_GPIO:
+                device.generate_gpio(self.clock())
+                data, device.gpio_data = device.gpio_data, []
+                _target(ovf_entry_count).value = device.gpio_overflows
+                device.gpio_overflows = 0
+        buffer, timestamp = _target(buffer), _target(timestamp)
+        for index, (tick, value) in enumerate(data):
+            timestamp[index] = tick
+            buffer[index] = value
+        _target(length).value = len(data)
+        return SUCCESS
+
+    def interface_write_data(self, dgi_hndl, interface_id, buffer, length):
+        """Simulate `interface_write_data`."""
+        device = self._device(dgi_hndl)
+        if device is None:
+            return FAILURE
+        buffer = _target(buffer)
+        if _value(interface_id) == INTERFACE_GPIO and _value(length):
+            write_mode = device.configurations[INTERFACE_GPIO][1]
+            device.pin_values = buffer[_value(length) - 1] & write_mode
+        return SUCCESS
+
+    # Auxiliary
+
+    def auxiliary_power_initialize(self, power_hndl_p, dgi_hndl):
+        """Simulate `auxiliary_power_initialize`."""
+        device = self._device(dgi_hndl)
+        if device is None:
+            return FAILURE
+        with self.lock:
+            handle = self._new_handle()
+            self.power_handles[handle] = device
+        _target(power_hndl_p).value = handle
+        return SUCCESS
+
+    def auxiliary_power_uninitialize(self, power_hndl):
+        """Simulate `auxiliary_power_uninitialize`."""
+        with self.lock:
+            device = self.power_handles.pop(_value(power_hndl), None)
+        if device is None:
+            return FAILURE
+        device.power_buffers.clear()
+        device.power_data.clear()
+        device.power_status = IDLE
+        return SUCCESS
+
+    def auxiliary_power_register_buffer_pointers(
+            self, power_hndl, buffer, timestamp, count, max_count,
+            channel=CHANNEL_A, power_type=POWER_CURRENT):
+        """Simulate `auxiliary_power_register_buffer_pointers`."""
+        device = self._power_device(power_hndl)
+        if device is None:
+            return FAILURE
+        key = (_value(channel), _value(power_type))
+        with self.lock:
+            device.power_buffers[key] = _value(max_count)
+            device.power_data.setdefault(key, [])
+        return SUCCESS
+
+    def auxiliary_power_unregister_buffer_pointers(
+            self, power_hndl, channel=CHANNEL_A, power_type=POWER_CURRENT):
+        """Simulate `auxiliary_power_unregister_buffer_pointers`."""
+        device = self._power_device(power_hndl)
+        if device is None:
+            return FAILURE
+        key = (_value(channel), _value(power_type))
+        with self.lock:
+            device.power_buffers.pop(key, None)
+            device.power_data.pop(key, None)
+        return SUCCESS
+
+    def auxiliary_power_calibration_is_valid(self, power_hndl):
+        """Simulate `auxiliary_power_calibration_is_valid`."""
+        device = self._power_device(power_hndl)
+        return int(device is not None and device.calibration_valid)
+
+    def auxiliary_power_trigger_calibration(self, power_hndl, circuit_type):
+        """Simulate `auxiliary_power_trigger_calibration`."""
+        device = self._power_device(power_hndl)
+        if device is None:
+            return FAILURE
+        with self.lock:
+            device.calibration_valid = False
+            device.power_status = CALIBRATING
+            device.calibration_end = self.clock() + device.calibration_time
+        return SUCCESS
+
+    def auxiliary_power_get_calibration(self, power_hndl, data):
+        """Simulate `auxiliary_power_get_calibration`."""
+        device = self._power_device(power_hndl)
+        if device is None or not device.calibration_valid:
+            return 0
+        data = _target(data)
+        length = min(len(data), NUM_CALIBRATION)
+        for index in range(length):
+            data[index] = index % 256
+        return length
+
+    def auxiliary_power_get_circuit_type(self, power_hndl, circuit):
+        """Simulate `auxiliary_power_get_circuit_type`."""
+        if self._power_device(power_hndl) is None:
+            return FAILURE
+        _target(circuit).value = XAM
+        return SUCCESS
+
+    def auxiliary_power_get_status(self, power_hndl):
+        """Simulate `auxiliary_power_get_status`."""
+        device = self._power_device(power_hndl)
+        if device is None:
+            return IDLE
+        with self.lock:
+            now = self.clock()
+            device.update_calibration(now)
+            device.generate_power(now)
+            return device.power_status
+
+    def auxiliary_power_start(self, power_hndl, mode=0, parameter=0):
+        """Simulate `auxiliary_power_start`."""
+        device = self._power_device(power_hndl)
+        if device is None:
+            return FAILURE
+        with self.lock:
+            device.update_calibration(self.clock())
+            if device.power_status == CALIBRATING:
+                return FAILURE
+            device.power_start = self.clock()
+            device.power_generated = 0
+            device.power_status = RUNNING
+            # Mode 1 is oneshot, the parameter is the duration in seconds
+            device.power_stop_time = (
+                device.power_start + _value(parameter)
+                if _value(mode) == 1 else None)
+        return SUCCESS
+
+    def auxiliary_power_stop(self, power_hndl):
+        """Simulate `auxiliary_power_stop`."""
+        device = self._power_device(power_hndl)
+        if device is None:
+            return FAILURE
+        with self.lock:
+            device.generate_power(self.clock())
+            if device.power_status in (RUNNING, OVERFLOWED):
+                device.power_status = IDLE
+        return SUCCESS
+
+    def auxiliary_power_lock_data_for_reading(self, power_hndl):
+        """Simulate `auxiliary_power_lock_data_for_reading`."""
+        device = self._power_device(power_hndl)
+        if device is None:
+            return FAILURE
+        with self.lock:
+            device.generate_power(self.clock())
+            device.locked_data = device.power_data
+            device.power_data = {key: [] for key in device.power_buffers}
+        return SUCCESS
+
+    def auxiliary_power_copy_data(self, power_hndl, buffer, timestamp, count,
+                                  max_count, channel=CHANNEL_A,
+                                  power_type=POWER_CURRENT):
+        """Simulate `auxiliary_power_copy_data`."""
+        device = self._power_device(power_hndl)
+        if device is None or device.locked_data is None:
+            return FAILURE
+        data = device.locked_data.get((_value(channel), _value(power_type)))
+        if data is None:
+            return FAILURE
+        max_count = _value(max_count)
+        copy, data[:max_count] = data[:max_count], []
+        buffer, timestamp = _target(buffer), _target(timestamp)
+        for index, (time, value) in enumerate(copy):
+            timestamp[index] = time
+            buffer[index] = value
+        _target(count).value = len(copy)
+        return SUCCESS
+
+    def auxiliary_power_free_data(self, power_hndl):
+        """Simulate `auxiliary_power_free_data`."""
+        device = self._power_device(power_hndl)
+        if device is None:
+            return FAILURE
+        with self.lock:
+            device.locked_data = None
+            if device.power_status == OVERFLOWED:
+                device.power_status = RUNNING
+        return SUCCESS
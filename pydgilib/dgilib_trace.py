@@ -0,0 +1,111 @@
+"""This module traces the calls to the functions of DGILib."""
+
+import logging
+from time import monotonic
+
+from pydgilib.dgilib_config import MAX_PRINT
+
+# Name of the logger used when tracing to `logging`
+TRACE_LOGGER = "pydgilib"
+# Maximum number of messages per second that are emitted
+TRACE_RATE = 1000
+
+
+class DGILibTracer(object):
+    """Emit the status messages of the DGILib bindings.
+
+    The bindings only call the tracer when `verbose` is set, so tracing costs
+    nothing when it is off. When it is on, the messages are sent to the hook
+    (default: `print`) or to a `logging` logger. The buffers of the calls that
+    transfer samples are sampled, only `samples` evenly spaced samples of
+    each buffer are traced, and the number of messages is rate limited so a
+    long capture does not spend its time formatting and printing messages.
+
+    :Example:
+
+    >>> tracer = DGILibTracer(logger=True, samples=10)
+    >>> dgilib = DGILib(verbose=2, tracer=tracer)
+    """
+
+    def __init__(self, hook=None, logger=None, samples=MAX_PRINT,
+                 rate=TRACE_RATE):
+        """Instantiate DGILibTracer object.
+
+        Parameters
+        ----------
+        hook : callable or None
+            Function that is called with each message (default: `None`, use
+            `print`)
+
+        logger : logging.Logger, bool or None
+            Logger to send the messages to at the `DEBUG` level, `True` for
+            the "pydgilib" logger (default: `None`, use `hook`)
+
+        samples : int
+            Maximum number of samples of a buffer to trace (default:
+            `MAX_PRINT`)
+
+        rate : float or None
+            Maximum number of messages per second, `None` to disable rate
+            limiting (default: `TRACE_RATE`)
+        """
+        if logger is True:
+            logger = logging.getLogger(TRACE_LOGGER)
+        if logger is not None:
+            hook = logger.debug
+        self.hook = hook or print
+        self.samples = samples
+        self.rate = rate
+
+        self.tokens = rate
+        self.last_time = monotonic()
+        self.suppressed = 0
+
+    def allow(self):
+        """Take a message from the token bucket of the rate limiter.
+
+        Returns
+        -------
+        bool
+            Whether the message can be emitted.
+        """
+        if self.rate is None:
+            return True
+        now = monotonic()
+        self.tokens = min(
+            self.rate, self.tokens + (now - self.last_time) * self.rate)
+        self.last_time = now
+        if self.tokens < 1:
+            self.suppressed += 1
+            return False
+        self.tokens -= 1
+        return True
+
+    def trace(self, message):
+        """Emit a message, unless the rate limit is exceeded."""
+        if not self.allow():
+            return
+        if self.suppressed:
+            suppressed, self.suppressed = self.suppressed, 0
+            self.hook(f"\t({suppressed} messages suppressed)")
+        self.hook(message)
+
+    def trace_samples(self, length, *buffers):
+        """Emit (a sample of) the contents of buffers.
+
+        Parameters
+        ----------
+        length : int
+            Number of valid samples in the buffers.
+
+        buffers : tuple(str, sequence)
+            Names and contents of the buffers, one message is emitted for
+            every traced sample with the values of all buffers.
+        """
+        if length <= 0 or self.samples <= 0:
+            return
+        # Only format the samples that are traced
+        step = max(1, -(-length // self.samples))
+        for i in range(0, length, step):
+            self.trace(f"\t{i}:\t" + ",\t".join(
+                f"{name}: {buffer[i]}" for name, buffer in buffers))
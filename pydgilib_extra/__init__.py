@@ -1,5 +1,7 @@
 """This module provides Python bindings for DGILib Extra."""
 
+from importlib import import_module
+
 from pydgilib.dgilib import DGILib
 
 from pydgilib.dgilib_config import *
@@ -9,11 +11,42 @@ from pydgilib_extra.dgilib_extra_config import *
 from pydgilib_extra.dgilib_extra import DGILibExtra
 from pydgilib_extra.dgilib_logger import DGILibLogger
 from pydgilib_extra.dgilib_interface_gpio import DGILibInterfaceGPIO
-from pydgilib_extra.dgilib_interface_power import DGILibInterfacePower
+from pydgilib_extra.dgilib_interface_power import (
+    DGILibInterfacePower, DGILibInterfaceVoltage, CalibrationCache)
 from pydgilib_extra.dgilib_data import (
-    LoggerData, InterfaceData, valid_interface_data)
+    LoggerData, InterfaceData, RollingInterfaceData, TickInterfaceData,
+    valid_interface_data)
 from pydgilib_extra.dgilib_calculations import *
-from pydgilib_extra.dgilib_plot import DGILibPlot
+from pydgilib_extra.dgilib_pool import DGILibPool, connection_pool
+
+# Attributes that are only imported when they are used, with their modules
+_LAZY_ATTRIBUTES = {
+    "DGILibPlot": "pydgilib_extra.dgilib_plot",
+    "InterfaceStatistics": "pydgilib_extra.dgilib_statistics",
+    "QuantileSketch": "pydgilib_extra.dgilib_statistics",
+    "InterfacePyramid": "pydgilib_extra.dgilib_pyramid",
+    "GPIOIntervalIndex": "pydgilib_extra.dgilib_intervals",
+    "SharedLoggerData": "pydgilib_extra.dgilib_shared",
+    "SharedInterfaceData": "pydgilib_extra.dgilib_shared",
+    "DGILibMulti": "pydgilib_extra.dgilib_multi",
+    "analyze_captures": "pydgilib_extra.dgilib_batch",
+    "find_captures": "pydgilib_extra.dgilib_batch",
+}
+
+
+def __getattr__(name):
+    """Import the attributes in `_LAZY_ATTRIBUTES` only when they are used.
+
+    Keeps matplotlib (DGILibPlot), multiprocessing (DGILibMulti,
+    analyze_captures) and the other optional modules out of the startup of
+    the command line logger.
+    """
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __author__ = "EWouters <ehwo(at)kth.se>"
 __url__ = "https://github.com/EWouters/Atmel-SAML11/tree/master/Python/" \
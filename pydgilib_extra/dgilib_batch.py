@@ -0,0 +1,255 @@
+"""This module analyzes many logged captures in parallel."""
+
+import argparse
+import csv
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from glob import glob
+from os import cpu_count, path
+
+from pydgilib_extra.dgilib_extra_config import INTERFACE_POWER
+from pydgilib_extra.dgilib_data import LoggerData
+from pydgilib_extra.dgilib_interface_gpio import DGILibInterfaceGPIO
+from pydgilib_extra.dgilib_interface_power import DGILibInterfacePower
+from pydgilib_extra.dgilib_calculations import power_and_time_per_pulse
+from pydgilib.dgilib_config import INTERFACE_GPIO
+
+# Columns of the summary of pulse_summary
+SUMMARY_HEADER = ["capture", "gpio_samples", "power_samples", "pulses",
+                  "charge_total", "charge_mean", "time_total", "time_mean",
+                  "error"]
+
+
+def find_captures(paths):
+    """Find the captures in directories or glob patterns.
+
+    A capture is a pair of csv files written by the csv logger, like
+    ``log_gpio.csv`` and ``log_power.csv``. It is identified by the path of
+    the files without the ``_gpio.csv`` suffix.
+
+    Parameters
+    ----------
+    paths : str or list(str)
+        Directories (searched recursively), glob patterns or paths of gpio
+        csv files.
+
+    Returns
+    -------
+    list(str)
+        Sorted list of captures that have both a gpio and a power csv file.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    gpio_suffix = f"_{DGILibInterfaceGPIO.name}.csv"
+    power_suffix = f"_{DGILibInterfacePower.name}.csv"
+    captures = set()
+    for pattern in paths:
+        if path.isdir(pattern):
+            pattern = path.join(pattern, "**", "*" + gpio_suffix)
+        for file_path in glob(pattern, recursive=True):
+            if not file_path.endswith(gpio_suffix):
+                continue
+            capture = file_path[:-len(gpio_suffix)]
+            if path.isfile(capture + power_suffix):
+                captures.add(capture)
+    return sorted(captures)
+
+
+def load_capture(capture):
+    """Load the gpio and power csv files of a capture.
+
+    Parameters
+    ----------
+    capture : str
+        Path of the capture (see :func:`find_captures`).
+
+    Returns
+    -------
+    LoggerData
+        Data of the capture.
+    """
+    logger_data = LoggerData()
+    for interface_id, interface in ((INTERFACE_GPIO, DGILibInterfaceGPIO()),
+                                    (INTERFACE_POWER, DGILibInterfacePower())):
+        logger_data[interface_id] = interface.csv_read_file(
+            f"{capture}_{interface.name}.csv")
+    return logger_data
+
+
+def pulse_summary(logger_data, pin=0, **kwargs):
+    """Summarize the pulses of a capture.
+
+    Parameters
+    ----------
+    logger_data : LoggerData
+        Data of the capture.
+
+    pin : int
+        Number of the GPIO pin with the pulses (default: `0`).
+
+    All other arguments are passed on to :func:`power_and_time_per_pulse`.
+
+    Returns
+    -------
+    dict
+        Number of samples, number of pulses and the total and mean charge
+        and time of the pulses.
+    """
+    charges, times = power_and_time_per_pulse(logger_data, pin, **kwargs)
+    pulses = len(charges)
+    return {
+        "gpio_samples": len(logger_data[INTERFACE_GPIO]),
+        "power_samples": len(logger_data[INTERFACE_POWER]),
+        "pulses": pulses,
+        "charge_total": sum(charges),
+        "charge_mean": sum(charges) / pulses if pulses else 0.0,
+        "time_total": sum(times),
+        "time_mean": sum(times) / pulses if pulses else 0.0,
+    }
+
+
+def analyze_capture(capture, calculation=pulse_summary, **kwargs):
+    """Load a capture and run a calculation on it.
+
+    Runs in the worker processes of :func:`analyze_captures`. Errors are
+    returned in the `error` column instead of raised, so one broken capture
+    does not stop the batch.
+
+    Parameters
+    ----------
+    capture : str
+        Path of the capture (see :func:`find_captures`).
+
+    calculation : callable
+        Function that takes the :class:`LoggerData` of the capture (and the
+        keyword arguments) and returns a dict with a row of the summary. Has
+        to be defined at module level so it can be sent to the workers
+        (default: :func:`pulse_summary`).
+
+    Returns
+    -------
+    dict
+        Row of the summary, with the `capture` and `error` columns added.
+    """
+    row = {"capture": capture}
+    try:
+        row.update(calculation(load_capture(capture), **kwargs))
+        row["error"] = ""
+    except Exception as error:
+        row["error"] = f"{type(error).__name__}: {error}"
+    return row
+
+
+def analyze_captures(paths, calculation=pulse_summary, workers=None,
+                     max_pending=None, **kwargs):
+    """Analyze captures in parallel.
+
+    Loading and calculations of the captures are spread over a
+    :class:`concurrent.futures.ProcessPoolExecutor`. The rows are yielded as
+    soon as they are done (not in order). Only `max_pending` captures are
+    submitted at a time, so the memory use does not grow with the number of
+    captures.
+
+    :Example:
+
+    >>> for row in analyze_captures("/data/nightly", workers=32, pin=2):
+    ...     print(row["capture"], row["charge_mean"])
+
+    Parameters
+    ----------
+    paths : str or list(str)
+        Directories, glob patterns or gpio csv files (see
+        :func:`find_captures`).
+
+    calculation : callable
+        Function to run on each capture (default: :func:`pulse_summary`, see
+        :func:`analyze_capture`).
+
+    workers : int or None
+        Number of worker processes (default: `None`, the number of CPUs).
+
+    max_pending : int or None
+        Maximum number of captures that are submitted but not done
+        (default: `None`, twice the number of workers).
+
+    All other arguments are passed on to the calculation.
+
+    Yields
+    ------
+    dict
+        Row of the summary of each capture.
+    """
+    captures = iter(find_captures(paths))
+    workers = workers or cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for capture in captures:
+            pending.add(executor.submit(
+                analyze_capture, capture, calculation, **kwargs))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def write_summary(rows, file_path, header=SUMMARY_HEADER):
+    """Write rows of a summary to a csv file while they are produced.
+
+    Parameters
+    ----------
+    rows : iterable(dict)
+        Rows of the summary, like the output of :func:`analyze_captures`.
+
+    file_path : str or file
+        Path of the csv file or an open file.
+
+    header : list(str)
+        Columns of the summary (default: `SUMMARY_HEADER`).
+
+    Returns
+    -------
+    int
+        Number of rows written.
+    """
+    count = 0
+    csv_file = open(file_path, "w", newline="") \
+        if isinstance(file_path, str) else file_path
+    try:
+        writer = csv.DictWriter(csv_file, header, extrasaction="ignore")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    finally:
+        if csv_file is not file_path:
+            csv_file.close()
+    return count
+
+
+def main(argv=None):
+    """Summarize the pulses of many captures from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Summarize the pulses of logged captures in parallel.")
+    parser.add_argument(
+        "paths", nargs="+",
+        help="directories, glob patterns or gpio csv files of the captures")
+    parser.add_argument(
+        "-o", "--output", default=None,
+        help="csv file to write the summary to (default: stdout)")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="number of worker processes")
+    parser.add_argument("-p", "--pin", type=int, default=0,
+                        help="GPIO pin with the pulses")
+    args = parser.parse_args(argv)
+
+    rows = analyze_captures(args.paths, workers=args.workers, pin=args.pin)
+    write_summary(rows, args.output or sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,14 @@
 """This module holds the functions that do calculations on Interface Data."""
 
 import warnings
+from array import array
+from bisect import bisect_right
+from collections import deque
 
-from pydgilib_extra.dgilib_extra_config import NUM_PINS
+from pydgilib.dgilib_config import INTERFACE_GPIO
+from pydgilib_extra.dgilib_extra_config import (
+    NUM_PINS, INTERFACE_POWER, INTERFACE_VOLTAGE)
+from pydgilib_extra.dgilib_data import InterfaceData, LoggerData
 
 
 class StreamingCalculation(object):
@@ -12,6 +18,100 @@ class StreamingCalculation(object):
         self.index = 0
 
 
+class GPIOEdgeTrigger(StreamingCalculation):
+    """GPIO Edge Trigger (streaming).
+
+    Trigger condition for :meth:`DGILibLogger.log_triggered`. Detects an edge
+    on a GPIO pin. The state of the pin is kept between calls, so an edge
+    that falls between two chunks of data is detected as well.
+
+    :param pin: Number of the GPIO pin to be used.
+    :type pin: int
+    :param rising_edge: If True: trigger on a rising edge, else trigger on a
+        falling edge.
+    :type rising_edge: bool
+    """
+
+    def __init__(self, pin, rising_edge=True):
+        StreamingCalculation.__init__(self)
+        self.pin = pin
+        self.rising_edge = rising_edge
+        self.data = None
+
+    def __call__(self, logger_data):
+        """Get the timestamp of the first edge in the logger_data.
+
+        :param logger_data: LoggerData object with the new GPIO data.
+        :type logger_data: LoggerData
+        :return: Timestamp of the first edge or None if there was no edge.
+        :rtype: float or None
+        """
+        return next(iter(self.trigger_times(logger_data)), None)
+
+    def trigger_times(self, logger_data):
+        """Get the timestamps of all edges in the logger_data.
+
+        :param logger_data: LoggerData object with the new GPIO data.
+        :type logger_data: LoggerData
+        :return: Timestamps of the edges.
+        :rtype: list(float)
+        """
+        trigger_times = []
+        if INTERFACE_GPIO not in logger_data:
+            return trigger_times
+        for timestamp, pin_values in logger_data[INTERFACE_GPIO]:
+            pin_value = pin_values[self.pin]
+            if self.data is not None and pin_value != self.data and \
+                    pin_value == self.rising_edge:
+                trigger_times.append(timestamp)
+            self.data = pin_value
+        return trigger_times
+
+
+class PowerThresholdTrigger(StreamingCalculation):
+    """Power Threshold Trigger (streaming).
+
+    Trigger condition for :meth:`DGILibLogger.log_triggered`. Detects the
+    first power sample over (or under) a threshold.
+
+    :param threshold: Threshold value (in Ampere for current).
+    :type threshold: float
+    :param above: If True: trigger when a sample is larger than the
+        threshold, else trigger when it is smaller.
+    :type above: bool
+    """
+
+    def __init__(self, threshold, above=True):
+        StreamingCalculation.__init__(self)
+        self.threshold = threshold
+        self.above = above
+
+    def __call__(self, logger_data):
+        """Get the timestamp of the first sample past the threshold.
+
+        :param logger_data: LoggerData object with the new power data.
+        :type logger_data: LoggerData
+        :return: Timestamp of the first sample past the threshold or None.
+        :rtype: float or None
+        """
+        return next(self.trigger_times(logger_data), None)
+
+    def trigger_times(self, logger_data):
+        """Get the timestamps of the samples past the threshold.
+
+        :param logger_data: LoggerData object with the new power data.
+        :type logger_data: LoggerData
+        :return: Iterator of the timestamps (evaluated while it is used).
+        :rtype: iterator(float)
+        """
+        if INTERFACE_POWER not in logger_data:
+            return
+        for timestamp, value in logger_data[INTERFACE_POWER]:
+            if (value > self.threshold) if self.above else \
+                    (value < self.threshold):
+                yield timestamp
+
+
 class GPIOAugmentEdges(StreamingCalculation):
     """GPIO Augment Edges."""
 
@@ -43,6 +143,13 @@ class GPIOAugmentEdges(StreamingCalculation):
             self.data = [True] * NUM_PINS
         pin_states = self.data
 
+        # Work on the ticks if the timestamps have not been converted yet
+        timestamps = getattr(gpio_data, "ticks", None)
+        if timestamps is None:
+            timestamps = gpio_data.timestamps
+        else:
+            switch_time = round(switch_time / gpio_data.timer_factor)
+
         # iterate over the list and insert items at the same time:
         i = 0
         while i < len(gpio_data):
@@ -50,8 +157,7 @@ class GPIOAugmentEdges(StreamingCalculation):
             if gpio_data.values[i] != pin_states:
                 # This inserts a time sample at time + switch time (so moves
                 # the time stamp into the future)
-                gpio_data.timestamps.insert(
-                    i, gpio_data.timestamps[i] - switch_time)
+                timestamps.insert(i, timestamps[i] - switch_time)
                 # This inserts the last datapoint again at the time the next
                 # switch actually arrived (without switch time)
                 gpio_data.values.insert(i, pin_states)
@@ -62,12 +168,361 @@ class GPIOAugmentEdges(StreamingCalculation):
         self.data = pin_states
 
         # Delay all time stamps by delay_time
-        gpio_data.timestamps = [
-            t + delay_time for t in gpio_data.timestamps]
+        if hasattr(gpio_data, "shift"):
+            gpio_data.shift(delay_time)
+        else:
+            gpio_data.timestamps = [
+                t + delay_time for t in gpio_data.timestamps]
 
         return gpio_data
 
 
+class ClockAlignment(StreamingCalculation):
+    """Clock Alignment (streaming).
+
+    Estimates the offset and drift of the GPIO timestamps relative to the
+    power timestamps and shifts the GPIO timestamps to the power time base.
+    Replaces the fixed `gpio_delay_time` of :class:`GPIOAugmentEdges`.
+
+    The estimate is made from pairs of events that happen at the same moment
+    in both time bases. They are found by toggling a GPIO pin that also
+    switches a load (a calibration toggle): each edge on the pin is paired
+    with the first power sample that crosses the threshold within `window`
+    of where it is expected. Pairs from other sync events can be added with
+    :meth:`add_pair`. The offset is fitted as a straight line of the GPIO
+    time (least squares, updated with every pair), so a drift between the
+    clocks is followed during long captures.
+
+    Set the `clock_alignment` keyword argument of :class:`DGILibExtra` to use
+    it in the read path of the logger.
+
+    :param pin: Number of the GPIO pin that toggles the load.
+    :type pin: int
+    :param threshold: Power value (in Ampere for current) that is crossed
+        when the load is switched on.
+    :type threshold: float
+    :param rising_edge: If True: the load is switched on by a rising edge,
+        else by a falling edge.
+    :type rising_edge: bool
+    :param offset: Offset to use until the first pair is found (in seconds).
+    :type offset: float
+    :param window: Maximum distance of a power edge to the expected time of
+        the GPIO edge (in seconds).
+    :type window: float
+    :param max_pending: Maximum number of unpaired edges to keep.
+    :type max_pending: int
+    """
+
+    def __init__(self, pin, threshold, rising_edge=True, offset=0,
+                 window=0.01, max_pending=1000):
+        StreamingCalculation.__init__(self)
+        self.pin = pin
+        self.threshold = threshold
+        self.rising_edge = rising_edge
+        self.offset = offset
+        self.window = window
+
+        self.gpio_state = None
+        self.power_state = None
+        self.gpio_edges = deque(maxlen=max_pending)
+        self.power_edges = deque(maxlen=max_pending)
+
+        # Running means and (co)moments of the pairs
+        self.count = 0
+        self.mean_time = 0.0
+        self.mean_offset = 0.0
+        self.time_moment = 0.0
+        self.co_moment = 0.0
+
+    @property
+    def drift(self):
+        """Drift of the GPIO clock (seconds per second)."""
+        if not self.time_moment:
+            return 0.0
+        return self.co_moment / self.time_moment
+
+    def get_offset(self, gpio_time):
+        """Get the offset to add to a GPIO timestamp.
+
+        :param gpio_time: GPIO timestamp (in seconds).
+        :type gpio_time: float
+        :return: Estimated offset of the power time base (in seconds).
+        :rtype: float
+        """
+        if not self.count:
+            return self.offset
+        return self.mean_offset + self.drift * (gpio_time - self.mean_time)
+
+    def add_pair(self, gpio_time, power_time):
+        """Update the estimate with a pair of timestamps of the same event.
+
+        :param gpio_time: Timestamp of the event in the GPIO time base.
+        :type gpio_time: float
+        :param power_time: Timestamp of the event in the power time base.
+        :type power_time: float
+        """
+        offset = power_time - gpio_time
+        self.count += 1
+        delta_time = gpio_time - self.mean_time
+        self.mean_time += delta_time / self.count
+        self.mean_offset += (offset - self.mean_offset) / self.count
+        self.time_moment += delta_time * (gpio_time - self.mean_time)
+        self.co_moment += delta_time * (offset - self.mean_offset)
+
+    def match(self):
+        """Pair the pending GPIO and power edges."""
+        while self.gpio_edges and self.power_edges:
+            gpio_time = self.gpio_edges[0]
+            expected_time = gpio_time + self.get_offset(gpio_time)
+            power_time = self.power_edges[0]
+            if power_time < expected_time - self.window:
+                # Power edge without a GPIO edge
+                self.power_edges.popleft()
+            elif power_time > expected_time + self.window:
+                # GPIO edge without a power edge
+                self.gpio_edges.popleft()
+            else:
+                self.add_pair(self.gpio_edges.popleft(),
+                              self.power_edges.popleft())
+
+    def __call__(self, logger_data):
+        """Update the estimate and align the GPIO timestamps.
+
+        :param logger_data: LoggerData object with the new data, the GPIO
+            timestamps are shifted in place.
+        :type logger_data: LoggerData
+        :return: The aligned logger_data.
+        :rtype: LoggerData
+        """
+        if INTERFACE_GPIO in logger_data:
+            gpio_data = logger_data[INTERFACE_GPIO]
+            for index, pin_values in enumerate(gpio_data.values):
+                pin_value = pin_values[self.pin]
+                if self.gpio_state is not None and \
+                        pin_value != self.gpio_state and \
+                        pin_value == self.rising_edge:
+                    self.gpio_edges.append(gpio_data.timestamp(index))
+                self.gpio_state = pin_value
+        if INTERFACE_POWER in logger_data:
+            for timestamp, value in logger_data[INTERFACE_POWER]:
+                power_value = value > self.threshold
+                if self.power_state is not None and \
+                        power_value and not self.power_state:
+                    self.power_edges.append(timestamp)
+                self.power_state = power_value
+        self.match()
+
+        if INTERFACE_GPIO in logger_data:
+            # t + get_offset(t) is (1 + drift) * t + get_offset(0), so the
+            # timestamps in ticks do not have to be converted
+            gpio_data = logger_data[INTERFACE_GPIO]
+            if self.drift:
+                gpio_data.scale(1 + self.drift)
+            gpio_data.shift(self.get_offset(0))
+
+        return logger_data
+
+
+def hold_voltage(timestamps, voltage_data=None, voltage=None):
+    """Get the voltage at each timestamp (sample and hold).
+
+    The voltage at a timestamp is the last voltage sample at or before it.
+    Both lists are sorted, so they are merged in one pass. When the
+    timestamps of the voltage samples are the same as `timestamps` (the
+    power parser samples current and voltage together) the voltage samples
+    are returned as they are.
+
+    :param timestamps: Timestamps to get the voltage at.
+    :type timestamps: list(float)
+    :param voltage_data: InterfaceData with the voltage samples.
+    :type voltage_data: InterfaceData or None
+    :param voltage: Voltage before the first voltage sample, or the constant
+        voltage if there are no voltage samples. If None the first voltage
+        sample is used.
+    :type voltage: float or None
+    :return: Voltage at each timestamp and the last voltage.
+    :rtype: tuple(list(float), float or None)
+    """
+    if not voltage_data:
+        return [voltage] * len(timestamps), voltage
+    voltage_timestamps = voltage_data.timestamps
+    voltage_values = voltage_data.values
+    if voltage is None:
+        voltage = voltage_values[0]
+    if len(voltage_timestamps) == len(timestamps) and \
+            voltage_timestamps[0] == timestamps[0] and \
+            voltage_timestamps[-1] == timestamps[-1]:
+        return list(voltage_values), voltage_values[-1]
+    voltages = []
+    index = 0
+    length = len(voltage_timestamps)
+    for timestamp in timestamps:
+        while index < length and voltage_timestamps[index] <= timestamp:
+            voltage = voltage_values[index]
+            index += 1
+        voltages.append(voltage)
+    return voltages, voltage_values[-1]
+
+
+def calculate_power(current_data, voltage_data=None, voltage=None):
+    """Calculate the power from current and voltage samples.
+
+    The voltage is held between its samples (see :func:`hold_voltage`), so
+    the power has a sample at every current sample.
+
+    :param current_data: InterfaceData with the current samples (Ampere).
+    :type current_data: InterfaceData
+    :param voltage_data: InterfaceData with the voltage samples (Volt).
+    :type voltage_data: InterfaceData or None
+    :param voltage: Constant voltage to use if there are no voltage samples.
+    :type voltage: float or None
+    :return: InterfaceData with the power samples (Watt).
+    :rtype: InterfaceData
+    """
+    if not voltage_data and voltage is None:
+        raise ValueError(
+            "calculate_power needs voltage_data or a constant voltage.")
+    timestamps = list(current_data.timestamps)
+    voltages, _ = hold_voltage(timestamps, voltage_data, voltage)
+    return InterfaceData((timestamps, [
+        current * held for current, held in
+        zip(current_data.values, voltages)]))
+
+
+class EnergyIntegrator(StreamingCalculation):
+    """Energy Integrator (streaming).
+
+    Integrates the power (current times voltage) of the data of each call
+    to the energy in Joule, with the same left Riemann sum as
+    :func:`power_and_time_per_pulse`. The cumulative energy is kept at
+    every current sample, so the energy between any two timestamps can be
+    looked up without integrating again (see :meth:`energy`).
+
+    The voltage is taken from the `INTERFACE_VOLTAGE` data (see
+    :class:`DGILibInterfaceVoltage`) and held between its samples and
+    calls. If there is no voltage data the constant `voltage` is used.
+
+    :param voltage: Voltage to use until the first voltage sample, or when
+        voltage is not logged.
+    :type voltage: float or None
+    """
+
+    def __init__(self, voltage=None):
+        StreamingCalculation.__init__(self)
+        self.voltage = voltage
+        self.timestamps = array("d")
+        self.data = array("d")
+
+    @property
+    def total(self):
+        """Energy of all samples so far (Joule)."""
+        return self.data[-1] if self.data else 0.0
+
+    def __call__(self, logger_data):
+        """Integrate the energy of the new data.
+
+        :param logger_data: LoggerData object with the new current (and
+            voltage) data.
+        :type logger_data: LoggerData
+        :return: Energy of the new data (Joule).
+        :rtype: float
+        """
+        current_data = logger_data.get(INTERFACE_POWER)
+        voltage_data = logger_data.get(INTERFACE_VOLTAGE)
+        if not current_data:
+            if voltage_data:
+                self.voltage = voltage_data.values[-1]
+            return 0.0
+        timestamps = current_data.timestamps
+        voltages, last_voltage = hold_voltage(
+            timestamps, voltage_data, self.voltage)
+        if voltages[0] is None:
+            raise ValueError(
+                "EnergyIntegrator needs voltage data or a constant voltage.")
+
+        start_energy = energy = self.total
+        previous = self.timestamps[-1] if self.timestamps else timestamps[0]
+        cumulative = []
+        for timestamp, current, voltage in zip(
+                timestamps, current_data.values, voltages):
+            energy += current * voltage * (timestamp - previous)
+            previous = timestamp
+            cumulative.append(energy)
+        self.timestamps.extend(timestamps)
+        self.data.extend(cumulative)
+        self.voltage = last_voltage
+        return energy - start_energy
+
+    def energy_at(self, timestamp):
+        """Get the cumulative energy at a timestamp (Joule)."""
+        index = bisect_right(self.timestamps, timestamp) - 1
+        return self.data[index] if index >= 0 else 0.0
+
+    def energy(self, start_time=None, end_time=None):
+        """Get the energy between two timestamps (Joule).
+
+        :param start_time: Start of the window (default: first sample).
+        :type start_time: float or None
+        :param end_time: End of the window (default: last sample).
+        :type end_time: float or None
+        :return: Energy of the samples with `start_time < timestamp <=
+            end_time`.
+        :rtype: float
+        """
+        end_energy = self.total if end_time is None else \
+            self.energy_at(end_time)
+        start_energy = 0.0 if start_time is None else \
+            self.energy_at(start_time)
+        return end_energy - start_energy
+
+
+def calculate_energy(logger_data, start_time=None, end_time=None,
+                     voltage=None):
+    """Calculate the energy between two timestamps.
+
+    :param logger_data: LoggerData object with current (and voltage) data.
+    :type logger_data: LoggerData
+    :param start_time: Start of the window (default: first sample).
+    :type start_time: float or None
+    :param end_time: End of the window (default: last sample).
+    :type end_time: float or None
+    :param voltage: Constant voltage to use if voltage was not logged.
+    :type voltage: float or None
+    :return: Energy (Joule).
+    :rtype: float
+    """
+    integrator = EnergyIntegrator(voltage)
+    integrator(logger_data)
+    return integrator.energy(start_time, end_time)
+
+
+def energy_and_time_per_pulse(logger_data, pin, voltage=None, **kwargs):
+    """Calculate energy and time per pulse.
+
+    Like :func:`power_and_time_per_pulse`, but sums the power (current times
+    voltage) instead of the current of each pulse.
+
+    :param logger_data: LoggerData object. Needs to have GPIO and current
+        data, and voltage data or a constant `voltage`.
+    :type logger_data: LoggerData
+    :param pin: Number of the GPIO pin to be used.
+    :type pin: int
+    :param voltage: Constant voltage to use if voltage was not logged.
+    :type voltage: float or None
+
+    All other arguments are passed on to :func:`power_and_time_per_pulse`.
+
+    :return: List of energies (Joule) and times of the pulses.
+    :rtype: tuple(list(float), list(float))
+    """
+    power_data = calculate_power(
+        logger_data[INTERFACE_POWER], logger_data.get(INTERFACE_VOLTAGE),
+        voltage)
+    return power_and_time_per_pulse(LoggerData({
+        INTERFACE_GPIO: logger_data[INTERFACE_GPIO],
+        INTERFACE_POWER: power_data}), pin, **kwargs)
+
+
 def power_and_time_per_pulse(
         logger_data, pin, start_time=0.01, end_time=float("Inf"),
         stop_function=None, initialized=False, pulse_direction=True):
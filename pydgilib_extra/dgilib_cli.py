@@ -0,0 +1,225 @@
+"""This module runs headless captures from the command line."""
+
+import argparse
+import sys
+from time import perf_counter, sleep, time
+
+from pydgilib_extra.dgilib_extra_config import (
+    INTERFACES, LOGGER_CSV, FILE_NAME_BASE)
+from pydgilib_extra.dgilib_extra import DGILibExtra
+from pydgilib_extra.dgilib_logger import DGILibLogger
+
+# Taken when the imports are done, to measure the startup latencies
+IMPORT_TIME = perf_counter()
+IMPORT_EPOCH = time()
+
+POLL_STRATEGIES = ("busy", "interval", "oneshot")
+OUTPUT_FORMATS = ("csv", "none")
+
+
+def parse_args(argv=None):
+    """Parse the command line arguments of :func:`main`."""
+    parser = argparse.ArgumentParser(
+        description="Capture data of a DGI device without a plot.")
+    parser.add_argument("-s", "--device-sn", default=None,
+                        help="serial number of the device (default: first "
+                             "device)")
+    parser.add_argument("-i", "--interfaces", default="gpio,power",
+                        help="comma separated interfaces to capture "
+                             f"({', '.join(INTERFACES)}, default: "
+                             "gpio,power)")
+    parser.add_argument("-d", "--duration", type=float, default=10,
+                        help="capture time in seconds (default: 10)")
+    parser.add_argument("-f", "--format", choices=OUTPUT_FORMATS,
+                        default="csv", help="output format (default: csv)")
+    parser.add_argument("-o", "--log-folder", default=None,
+                        help="folder for the output files (default: the "
+                             "current folder)")
+    parser.add_argument("--file-name-base", default=FILE_NAME_BASE,
+                        help=f"base of the file names (default: "
+                             f"{FILE_NAME_BASE})")
+    parser.add_argument("-p", "--poll", choices=POLL_STRATEGIES,
+                        default="busy",
+                        help="read continuously (busy), sleep between "
+                             "reads (interval) or let the power parser "
+                             "capture on its own (oneshot) (default: busy)")
+    parser.add_argument("--poll-interval", type=float, default=0.01,
+                        help="time between reads for the interval strategy "
+                             "(default: 0.01)")
+    parser.add_argument("--stats-interval", type=float, default=1,
+                        help="time between the live statistics, 0 to "
+                             "disable them (default: 1)")
+    parser.add_argument("--launch-time", type=float, default=None,
+                        help="epoch time the capture was launched (like "
+                             "`date +%%s.%%N`), to measure the latency to "
+                             "the first sample")
+    parser.add_argument("--fail-on-overflow", action="store_true",
+                        help="exit with status 2 if a buffer overflowed")
+    parser.add_argument("--dgilib-path", default=None,
+                        help="path of dgilib.dll")
+    parser.add_argument("--calibration-cache", default=None,
+                        metavar="PATH|none",
+                        help="json file to cache the calibrations of the "
+                             "power interface in, none to keep them in "
+                             "memory (default: CALIBRATION_CACHE_FILE)")
+    parser.add_argument("--simulate", action="store_true",
+                        help="capture from a DGILibSimulator")
+    parser.add_argument("-v", "--verbose", action="count", default=0,
+                        help="print more status messages")
+    return parser.parse_args(argv)
+
+
+class CaptureStats(object):
+    """Throughput, overflow and latency statistics of a capture.
+
+    Attributes
+    ----------
+    samples : dict
+        Number of samples per interface name.
+
+    first_sample_time : float or None
+        Value of :func:`time.perf_counter` when the first sample was read.
+    """
+
+    def __init__(self, dgilib_extra, stream=None, interval=1):
+        """Instantiate CaptureStats object."""
+        self.dgilib_extra = dgilib_extra
+        self.stream = sys.stderr if stream is None else stream
+        self.interval = interval
+        self.names = {number: name for name, number in INTERFACES.items()}
+        self.samples = {}
+        self.first_sample_time = None
+        self.start_time = self.last_time = perf_counter()
+        self.last_samples = {}
+
+    def add(self, logger_data):
+        """Count the samples of new data and print the live statistics."""
+        now = perf_counter()
+        for interface_id, interface_data in logger_data.items():
+            count = len(interface_data)
+            if count:
+                if self.first_sample_time is None:
+                    self.first_sample_time = now
+                name = self.names.get(interface_id, interface_id)
+                self.samples[name] = self.samples.get(name, 0) + count
+        if self.interval and now - self.last_time >= self.interval:
+            self.print_live(now)
+
+    def overflows(self):
+        """Get the number of overflows per interface name."""
+        return {self.names.get(interface_id, interface_id): count
+                for interface_id, count in
+                self.dgilib_extra.overflows.items()}
+
+    def print_live(self, now):
+        """Print the samples per second since the last call."""
+        elapsed = now - self.last_time
+        rates = ", ".join(
+            f"{name}: "
+            f"{(samples - self.last_samples.get(name, 0)) / elapsed:.0f} "
+            f"samples/s" for name, samples in self.samples.items())
+        print(f"{now - self.start_time:7.1f} s  {rates or 'no samples'}  "
+              f"overflows: {self.overflows()}", file=self.stream, flush=True)
+        self.last_time = now
+        self.last_samples = dict(self.samples)
+
+
+def capture(args):
+    """Run a capture with the parsed arguments, see :func:`main`.
+
+    Returns
+    -------
+    dict
+        Summary of the capture with the samples and overflows per interface
+        and the latencies in seconds.
+    """
+    kwargs = {
+        "interfaces": [INTERFACES[name.strip()]
+                       for name in args.interfaces.split(",")],
+        "loggers": [LOGGER_CSV] if args.format == "csv" else [],
+        "file_name_base": args.file_name_base,
+        "verbose": args.verbose,
+    }
+    if args.device_sn is not None:
+        kwargs["device_sn"] = args.device_sn.encode()
+    if args.log_folder is not None:
+        kwargs["log_folder"] = args.log_folder
+    if args.calibration_cache is not None:
+        kwargs["calibration_cache_file"] = \
+            None if args.calibration_cache == "none" else \
+            args.calibration_cache
+    if args.simulate:
+        from pydgilib.dgilib_simulator import DGILibSimulator
+        kwargs["dgilib_path"] = DGILibSimulator()
+    elif args.dgilib_path is not None:
+        kwargs["dgilib_path"] = args.dgilib_path
+
+    with DGILibExtra(**kwargs) as dgilib:
+        connected_time = perf_counter()
+        logger = dgilib.logger if kwargs["loggers"] else \
+            DGILibLogger(dgilib, loggers=[])
+        stats = CaptureStats(dgilib, interval=args.stats_interval)
+
+        if args.poll == "oneshot":
+            # Let the power parser capture on its own and read once at the end
+            stats.add(logger.log_oneshot(args.duration, return_data=True))
+        else:
+            logger.start()
+            end_time = perf_counter() + args.duration
+            while perf_counter() < end_time:
+                logger_data = logger.read()
+                logger.commit(logger_data)
+                stats.add(logger_data)
+                if args.poll == "interval":
+                    sleep(args.poll_interval)
+            stats.add(logger.stop(return_data=True))
+
+    first_sample = None if stats.first_sample_time is None else \
+        stats.first_sample_time - IMPORT_TIME
+    summary = {
+        "samples": stats.samples,
+        "overflows": stats.overflows(),
+        "import_to_connected": connected_time - IMPORT_TIME,
+        "import_to_first_sample": first_sample,
+    }
+    if args.launch_time is not None:
+        summary["launch_to_import"] = IMPORT_EPOCH - args.launch_time
+        if first_sample is not None:
+            summary["launch_to_first_sample"] = \
+                summary["launch_to_import"] + first_sample
+    return summary
+
+
+def main(argv=None):
+    """Run a headless capture from the command line.
+
+    Prints the live throughput and overflows while capturing and a summary
+    with the latencies of the startup at the end (on stderr, so the output
+    can be piped).
+
+    :Example:
+
+    .. code-block:: console
+
+        $ pydgilib-log -d 60 -i gpio,power -o captures --launch-time \\
+              $(date +%s.%N)
+
+    Returns
+    -------
+    int
+        Exit status, 2 if a buffer overflowed and `--fail-on-overflow` was
+        given, otherwise 0.
+    """
+    args = parse_args(argv)
+    summary = capture(args)
+    for key, value in summary.items():
+        if isinstance(value, float):
+            value = f"{value:.3f} s"
+        print(f"{key}: {value}", file=sys.stderr)
+    if args.fail_on_overflow and any(summary["overflows"].values()):
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,22 @@
 """This module provides classes to store DGILib Logger Interface Data."""
 
+import copyreg
+import pickle
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import deque
+from itertools import islice
+
 from pydgilib.dgilib_config import (
     INTERFACE_GPIO)
 from pydgilib_extra.dgilib_extra_config import (INTERFACES, INTERFACE_POWER)
+from pydgilib_extra.dgilib_statistics import InterfaceStatistics
+
+# numpy is optional, it is imported when the first ticks are converted
+# (`False` if it is not installed)
+numpy = None
 
 
 class InterfaceData(object):
@@ -93,13 +107,49 @@ class InterfaceData(object):
         """Contains.
 
         Used to provide `([1], [2]) in interface_data` syntax
+
+        The timestamps are normally sorted, so the samples of `item` are
+        first compared with the run of samples that starts at its first
+        timestamp (found with :func:`bisect_left`), which is the case for
+        sub-captures. Otherwise the values of `item` are grouped by timestamp
+        in a dict, and looked up with :func:`bisect_left` if there are few,
+        or in one pass over the samples. That pass does not depend on the
+        order of the timestamps.
         """
-        return all(any(item_timestamp == self_timestamp and
-                       item_value == self_value
-                       for self_timestamp, self_value in self)
-                   for item_timestamp, item_value in (
-                       item if isinstance(item, InterfaceData) else
-                       InterfaceData(item)))
+        if not isinstance(item, InterfaceData):
+            item = InterfaceData(item)
+        item_length = len(item.timestamps)
+        if not item_length:
+            return True
+        timestamps = self.timestamps
+        values = self.values
+        length = len(timestamps)
+        start = bisect_left(timestamps, item.timestamps[0])
+        if start + item_length <= length and \
+                list(islice(timestamps, start, start + item_length)) == \
+                list(item.timestamps) and \
+                list(islice(values, start, start + item_length)) == \
+                list(item.values):
+            return True
+
+        # Values (can be unhashable lists) of item per timestamp
+        missing = {}
+        for timestamp, value in zip(item.timestamps, item.values):
+            missing.setdefault(timestamp, []).append(value)
+        if len(missing) * length.bit_length() < length:
+            for timestamp in list(missing):
+                index = bisect_left(timestamps, timestamp)
+                while timestamp in missing and index < length and \
+                        timestamps[index] == timestamp:
+                    remove_value(missing, timestamp, values[index])
+                    index += 1
+            if not missing:
+                return True
+        for timestamp, value in zip(timestamps, values):
+            if timestamp in missing and \
+                    not remove_value(missing, timestamp, value):
+                return True
+        return False
 
     def __str__(self):
         """Print data.
@@ -108,6 +158,41 @@ class InterfaceData(object):
         """
         return str(tuple(self))
 
+    def __reduce_ex__(self, protocol):
+        """Pickle the timestamps and values.
+
+        Samples stored in arrays are copied in one go instead of element by
+        element, with protocol 5 they are passed as
+        :class:`pickle.PickleBuffer` so they can be sent out-of-band (see
+        :func:`pack_samples` and :func:`to_bytes`).
+        """
+        if type(self) is not InterfaceData:
+            return object.__reduce_ex__(self, protocol)
+        return (unpack_interface_data, (
+            pack_samples(self.timestamps, protocol),
+            pack_samples(self.values, protocol)))
+
+    def to_bytes(self):
+        """Serialize the samples, see :func:`to_bytes`."""
+        return to_bytes(self)
+
+    @staticmethod
+    def from_bytes(data):
+        """Deserialize samples of :meth:`to_bytes`, see :func:`from_bytes`."""
+        return from_bytes(data)
+
+    def timestamp(self, index):
+        """Get the timestamp of the sample at index."""
+        return self.timestamps[index]
+
+    def shift(self, offset):
+        """Add offset (in seconds) to all timestamps."""
+        self.timestamps = [t + offset for t in self.timestamps]
+
+    def scale(self, factor):
+        """Multiply all timestamps by factor."""
+        self.timestamps = [t * factor for t in self.timestamps]
+
     def get_select_in_value(self, begin=0, end=None, start_time=None,
                             end_time=None):
         """
@@ -139,9 +224,27 @@ class InterfaceData(object):
         if end_time is not None:
             end_index = self.get_index(end_time, start_index)
 
-        return [value[begin] for value in self.values[start_index:end_index]] \
-            if end is None else \
-            [value[begin:end] for value in self.values[start_index:end_index]]
+        values = islice(self.values, start_index, end_index)
+        return [value[begin] for value in values] if end is None else \
+            [value[begin:end] for value in values]
+
+    def select_time(self, start_time=None, end_time=None):
+        """Get the samples with `start_time <= timestamp < end_time`.
+
+        Keyword Arguments:
+            start_time {float} -- Start time of selection (default: {None})
+            end_time {float} -- End time of selection (default: {None})
+
+        Returns:
+            InterfaceData -- Copy of the samples inside the time range
+        """
+        interface_data = InterfaceData()
+        for timestamp, value in zip(self.timestamps, self.values):
+            if (start_time is None or timestamp >= start_time) and \
+                    (end_time is None or timestamp < end_time):
+                interface_data.timestamps.append(timestamp)
+                interface_data.values.append(value)
+        return interface_data
 
     def get_index(self, timestamp, start_index=0):
         """Get the index of the first sample after the timestamp."""
@@ -152,15 +255,315 @@ class InterfaceData(object):
         return index
 
 
+class RollingInterfaceData(InterfaceData):
+    """Class to store the most recent DGILib Logger Interface Data.
+
+    The samples are kept in ring buffers (:class:`collections.deque`) that
+    hold at most `max_samples` samples and only the samples of the last
+    `max_duration` seconds (relative to the newest timestamp). Older samples
+    are dropped when new ones are appended, so the memory use stays constant
+    during long captures.
+
+    The number of samples dropped so far is kept in `offset`, so the absolute
+    index of a sample is its index in the buffer plus `offset`.
+    """
+
+    __slots__ = ['max_samples', 'max_duration', 'offset']
+
+    def __init__(self, *args, max_samples=None, max_duration=None):
+        """Take tuple of timestamps and values and the retention policy.
+
+        Parameters
+        ----------
+        max_samples : int or None
+            Maximum number of samples to keep (default: `None`, unlimited)
+
+        max_duration : float or None
+            Maximum time span in seconds to keep (default: `None`, unlimited)
+        """
+        self.max_samples = max_samples
+        self.max_duration = max_duration
+        self.offset = 0
+        self.timestamps = deque(maxlen=max_samples)
+        self.values = deque(maxlen=max_samples)
+        if len(args) == 1 and isinstance(args[0], InterfaceData):
+            self += args[0]
+        elif args:
+            self += InterfaceData(*args)
+
+    def __iadd__(self, interface_data):
+        """Append new interface_data (in-place) and drop old samples.
+
+        Used to provide `interface_data += interface_data1` syntax
+        """
+        if not isinstance(interface_data, InterfaceData):
+            interface_data = InterfaceData() + interface_data
+        length = len(self.timestamps) + len(interface_data)
+        self.timestamps.extend(interface_data.timestamps)
+        self.values.extend(interface_data.values)
+        # Samples dropped by the deque because of max_samples
+        self.offset += length - len(self.timestamps)
+        # Samples older than max_duration
+        if self.max_duration is not None and self.timestamps:
+            oldest = self.timestamps[-1] - self.max_duration
+            while self.timestamps[0] < oldest:
+                self.timestamps.popleft()
+                self.values.popleft()
+                self.offset += 1
+        return self
+
+    def __iter__(self):
+        """Iterate over the samples.
+
+        Used to provide `for timestamp, value in interface_data` syntax
+        """
+        return zip(self.timestamps, self.values)
+
+    def __getitem__(self, index):
+        """Get item.
+
+        Used to provide `timestamp, value = interface_data[5]` and
+        `timestamp, value = interface_data[2:5]` syntax
+        """
+        if isinstance(index, slice):
+            return (list(self.timestamps)[index], list(self.values)[index])
+        return (self.timestamps[index], self.values[index])
+
+    def shift(self, offset):
+        """Add offset (in seconds) to all timestamps."""
+        self.timestamps = deque((t + offset for t in self.timestamps),
+                                maxlen=self.max_samples)
+
+    def scale(self, factor):
+        """Multiply all timestamps by factor."""
+        self.timestamps = deque((t * factor for t in self.timestamps),
+                                maxlen=self.max_samples)
+
+    def get_index(self, timestamp, start_index=0):
+        """Get the index of the first sample after the timestamp."""
+        index = start_index
+        max_index = len(self.timestamps) - 1
+        for sample_timestamp in islice(
+                self.timestamps, start_index, max_index):
+            if sample_timestamp >= timestamp:
+                break
+            index += 1
+        return index
+
+
+class TickInterfaceData(InterfaceData):
+    """Class to store DGILib Logger Interface Data with timestamps in ticks.
+
+    The timestamps are kept as the integer ticks of the timer of the device
+    (`timer_prescaler / timer_frequency` seconds per tick), multiplied by
+    `time_scale`, plus `time_offset` in seconds. They are only converted to
+    seconds the first time the `timestamps` are used, after that the object
+    behaves like :class:`InterfaceData`. Appending data with the same time
+    base, moving and scaling the samples in time (:meth:`shift` and
+    :meth:`scale`) and getting exact integer nanosecond timestamps
+    (:meth:`nanoseconds`) do not need the conversion.
+    """
+
+    __slots__ = ['ticks', 'timer_prescaler', 'timer_frequency',
+                 'time_offset', 'time_scale', '_timestamps']
+
+    def __init__(self, ticks=None, values=None, timer_prescaler=1,
+                 timer_frequency=1, time_offset=0, time_scale=1):
+        """Take list of ticks and values and the time base.
+
+        Parameters
+        ----------
+        ticks : list(int) or None
+            Timestamps in ticks (default: `None`, no samples)
+
+        values : list or None
+            Values of the samples (default: `None`, no samples)
+
+        timer_prescaler : int
+            Prescaler of the timer (default: `1`)
+
+        timer_frequency : int
+            Frequency of the timer in Hz (default: `1`)
+
+        time_offset : float
+            Time in seconds to add to the timestamps (default: `0`)
+
+        time_scale : float
+            Factor to multiply the time of the ticks by, before
+            `time_offset` is added (default: `1`)
+        """
+        self.ticks = [] if ticks is None else ticks
+        self.values = [] if values is None else values
+        self.timer_prescaler = timer_prescaler
+        self.timer_frequency = timer_frequency
+        self.time_offset = time_offset
+        self.time_scale = time_scale
+        self._timestamps = None
+
+    @property
+    def timer_factor(self):
+        """Factor to multiply ticks by to get seconds."""
+        return self.timer_prescaler / self.timer_frequency
+
+    @property
+    def timestamps(self):
+        """Timestamps in seconds, converted from the ticks when first used."""
+        if self.ticks is not None:
+            self._timestamps = ticks_to_seconds(
+                self.ticks, self.timer_factor * self.time_scale,
+                self.time_offset)
+            self.ticks = None
+        return self._timestamps
+
+    @timestamps.setter
+    def timestamps(self, timestamps):
+        self._timestamps = timestamps
+        self.ticks = None
+
+    def same_time_base(self, interface_data):
+        """Check if the ticks of interface_data can be appended as they are.
+
+        Returns
+        -------
+        bool
+            `True` if both still have their timestamps in ticks of the same
+            timer and with the same time offset and scale.
+        """
+        return (self.ticks is not None and
+                isinstance(interface_data, TickInterfaceData) and
+                interface_data.ticks is not None and
+                self.timer_prescaler == interface_data.timer_prescaler and
+                self.timer_frequency == interface_data.timer_frequency and
+                self.time_offset == interface_data.time_offset and
+                self.time_scale == interface_data.time_scale)
+
+    def __iadd__(self, interface_data):
+        """Append new interface_data (in-place).
+
+        Used to provide `interface_data += interface_data1` syntax
+        """
+        if self.same_time_base(interface_data):
+            self.ticks.extend(interface_data.ticks)
+            self.values.extend(interface_data.values)
+            return self
+        return InterfaceData.__iadd__(self, interface_data)
+
+    def __len__(self):
+        """Get the number of samples."""
+        if self.ticks is not None:
+            return len(self.ticks)
+        return len(self._timestamps)
+
+    def __reduce__(self):
+        """Pickle the ticks instead of the timestamps if possible."""
+        if self.ticks is None:
+            return (InterfaceData, (self.timestamps, self.values))
+        return (TickInterfaceData, (
+            self.ticks, self.values, self.timer_prescaler,
+            self.timer_frequency, self.time_offset, self.time_scale))
+
+    def copy(self):
+        """Get a copy that does not share the lists of samples."""
+        if self.ticks is None:
+            return InterfaceData(list(self.timestamps), list(self.values))
+        return TickInterfaceData(
+            list(self.ticks), list(self.values), self.timer_prescaler,
+            self.timer_frequency, self.time_offset, self.time_scale)
+
+    def timestamp(self, index):
+        """Get the timestamp of the sample at index, without converting."""
+        if self.ticks is None:
+            return self._timestamps[index]
+        return self.ticks[index] * self.timer_factor * self.time_scale + \
+            self.time_offset
+
+    def shift(self, offset):
+        """Add offset (in seconds) to all timestamps."""
+        if self.ticks is not None:
+            self.time_offset += offset
+        else:
+            self.timestamps = [t + offset for t in self.timestamps]
+
+    def scale(self, factor):
+        """Multiply all timestamps by factor."""
+        if self.ticks is not None:
+            self.time_scale *= factor
+            self.time_offset *= factor
+        else:
+            self.timestamps = [t * factor for t in self.timestamps]
+
+    def nanoseconds(self):
+        """Get the timestamps in integer nanoseconds.
+
+        The nanoseconds are computed from the ticks with integer arithmetic,
+        so they keep their resolution for any length of capture (unless the
+        time is scaled, see :meth:`scale`).
+
+        Returns
+        -------
+        array.array
+            Array of int64 (type code "q") timestamps in nanoseconds.
+        """
+        if self.ticks is None:
+            return array("q", (round(t * 1e9) for t in self.timestamps))
+        time_offset = round(self.time_offset * 1e9)
+        if self.time_scale != 1:
+            timer_factor = self.timer_factor * self.time_scale * 1e9
+            return array("q", (round(tick * timer_factor) + time_offset
+                               for tick in self.ticks))
+        numerator = self.timer_prescaler * 1000000000
+        denominator = self.timer_frequency
+        return array("q", (tick * numerator // denominator + time_offset
+                           for tick in self.ticks))
+
+
 class LoggerData(dict):
     """Class to store DGILib Logger Data."""
 
     # __slots__ = [INTERFACE_GPIO, INTERFACE_POWER]
 
-    def __init__(self, *args, **kwargs):
-        """Take list of interfaces for the data."""
+    def __init__(self, *args, max_samples=None, max_duration=None,
+                 statistics=None, pyramids=None, **kwargs):
+        """Take list of interfaces for the data.
+
+        Parameters
+        ----------
+        max_samples : int or dict or None
+            Keep only the last `max_samples` samples of each interface. Can
+            be a dict of interface ids and values to set it per interface
+            (default: `None`, keep all samples)
+
+        max_duration : float or dict or None
+            Keep only the samples of the last `max_duration` seconds of each
+            interface. Can be a dict of interface ids and values to set it
+            per interface (default: `None`, keep all samples)
+
+        statistics : list(int) or None
+            Interface ids to keep streaming statistics of. The statistics
+            are updated when data is added and cover every sample that was
+            added, including the samples that were dropped by the retention
+            policy since. They are stored in the `statistics` dict as
+            :class:`InterfaceStatistics` (default: `None`, no statistics)
+
+        pyramids : list(int) or None
+            Interface ids to keep a downsampled pyramid of, stored in the
+            `pyramids` dict as :class:`InterfacePyramid` (default: `None`,
+            no pyramids)
+        """
         # Call init function of dict
         super().__init__(self)
+        # Store the retention policy (bypass __setattr__)
+        object.__setattr__(self, "max_samples", max_samples)
+        object.__setattr__(self, "max_duration", max_duration)
+        object.__setattr__(self, "statistics", {
+            interface: InterfaceStatistics()
+            for interface in statistics or ()})
+        object.__setattr__(self, "pyramids", {})
+        if pyramids:
+            # Imported here, the pyramid module uses InterfaceData
+            from pydgilib_extra.dgilib_pyramid import InterfacePyramid
+            self.pyramids.update(
+                (interface, InterfacePyramid()) for interface in pyramids)
         # No args or kwargs were specified, populate args[0] with standard
         # interfaces
         if not args and not kwargs:
@@ -169,21 +572,59 @@ class LoggerData(dict):
         # and tuples of lists as values
         if args and isinstance(args[0], list):
             for interface in args[0]:
-                self[interface] = InterfaceData()
+                self[interface] = self.new_interface_data(interface)
         # Instantiate dict with arguments
         else:
             self.update(*args, **kwargs)
 
         for interface, interface_data in self.items():
             if not isinstance(interface_data, InterfaceData):
-                self[interface] = InterfaceData(interface_data)
+                self[interface] = self.new_interface_data(
+                    interface, interface_data)
+            elif self.retention(interface) != (None, None) and \
+                    not isinstance(interface_data, RollingInterfaceData):
+                self[interface] = self.new_interface_data(interface)
+                self[interface] += interface_data
+            for summaries in (self.statistics, self.pyramids):
+                if interface in summaries:
+                    summaries[interface].update(self[interface])
+
+    def retention(self, interface):
+        """Get the retention policy of an interface.
+
+        Returns
+        -------
+        tuple(int or None, float or None)
+            Tuple of `max_samples` and `max_duration` of the interface.
+        """
+        return tuple(
+            policy.get(interface) if isinstance(policy, dict) else policy
+            for policy in (self.max_samples, self.max_duration))
+
+    def new_interface_data(self, interface, *args):
+        """Create InterfaceData that follows the retention policy.
+
+        Returns
+        -------
+        InterfaceData
+            :class:`RollingInterfaceData` if a retention policy was set for
+            the interface, :class:`InterfaceData` otherwise.
+        """
+        max_samples, max_duration = self.retention(interface)
+        if max_samples is None and max_duration is None:
+            return InterfaceData(*args)
+        return RollingInterfaceData(
+            *args, max_samples=max_samples, max_duration=max_duration)
 
     def __getattr__(self, attr):
         """Get attribute.
 
         Used to provide `data.spi` syntax.
         """
-        return self[INTERFACES[attr]]
+        try:
+            return self[INTERFACES[attr]]
+        except KeyError:
+            raise AttributeError(attr) from None
 
     def __setattr__(self, attr, value):
         """Set attribute.
@@ -216,10 +657,34 @@ class LoggerData(dict):
         return data
 
     def __getstate__(self):
-        return self
+        """Get the attributes (retention policy, statistics and pyramids).
+
+        The data of the interfaces is pickled as the items of the dict.
+        """
+        return dict(self.__dict__)
 
     def __setstate__(self, state):
-        return LoggerData(state)
+        """Restore the attributes (bypass __setattr__)."""
+        for attr, value in state.items():
+            object.__setattr__(self, attr, value)
+
+    def __reduce_ex__(self, protocol):
+        """Pickle the attributes and the items of the dict.
+
+        The object is created without calling `__init__`, so the interfaces
+        are restored as they were.
+        """
+        return (copyreg.__newobj__, (type(self),), self.__getstate__(),
+                None, iter(self.items()))
+
+    def to_bytes(self):
+        """Serialize the data, see :func:`to_bytes`."""
+        return to_bytes(self)
+
+    @staticmethod
+    def from_bytes(data):
+        """Deserialize data of :meth:`to_bytes`, see :func:`from_bytes`."""
+        return from_bytes(data)
 
     # def __copy__(self):
     #     return self
@@ -230,14 +695,38 @@ class LoggerData(dict):
 
     def extend(self, interface, interface_data):
         """Append a list of samples to one of the interfaces."""
+        for summaries in (self.statistics, self.pyramids):
+            if interface in summaries:
+                if not isinstance(interface_data, InterfaceData):
+                    interface_data = InterfaceData(interface_data)
+                summaries[interface].update(interface_data)
         if interface in self.keys():
-            self[interface].extend(interface_data)
+            if isinstance(interface_data, TickInterfaceData) and \
+                    type(self[interface]) is InterfaceData and \
+                    not self[interface]:
+                # Keep the timestamps in ticks until they are used
+                self[interface] = interface_data.copy()
+            else:
+                self[interface].extend(interface_data)
+        elif self.retention(interface) != (None, None):
+            self[interface] = self.new_interface_data(interface)
+            self[interface] += interface_data
         elif not isinstance(interface_data, InterfaceData):
             self[interface] = InterfaceData(interface_data)
         else:
             self[interface] = interface_data
         return self
 
+    def select_time(self, start_time=None, end_time=None):
+        """Get the samples with `start_time <= timestamp < end_time`.
+
+        Returns a new :class:`LoggerData` with the samples of all interfaces
+        that are inside the time range.
+        """
+        return LoggerData({
+            interface: interface_data.select_time(start_time, end_time)
+            for interface, interface_data in self.items()})
+
     def length(self, attr=None):
         """Compute the number of samples for the interfaces.
 
@@ -283,3 +772,160 @@ def valid_interface_data(samples):
             len(samples) == 2 and
             all(isinstance(sample, (tuple, list, float, int)) for sample in samples) and
             (isinstance(samples[0], float) or len(samples[0]) == len(samples[1])))
+
+
+def ticks_to_seconds(ticks, timer_factor, time_offset=0):
+    """Convert ticks to seconds (``tick * timer_factor + time_offset``).
+
+    The ticks are converted in one batch with numpy if it is installed,
+    otherwise one by one.
+
+    Returns
+    -------
+    list(float)
+        Timestamps in seconds
+    """
+    global numpy
+    if numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+    if numpy:
+        seconds = numpy.array(ticks) * timer_factor
+        if time_offset:
+            seconds += time_offset
+        return seconds.tolist()
+    if time_offset:
+        return [tick * timer_factor + time_offset for tick in ticks]
+    return [tick * timer_factor for tick in ticks]
+
+
+# Header of to_bytes: magic, length of the pickle and number of buffers
+SERIALIZED_MAGIC = b"DGIDATA1"
+_HEADER = struct.Struct("<8sQQ")
+
+
+def remove_value(missing, timestamp, value):
+    """Remove a value from the values per timestamp of `__contains__`.
+
+    Returns
+    -------
+    bool
+        `False` if no values are missing anymore, otherwise `True`.
+    """
+    missing_values = missing[timestamp]
+    if value in missing_values:
+        missing_values = [missing_value for missing_value in missing_values
+                          if missing_value != value]
+        if missing_values:
+            missing[timestamp] = missing_values
+        else:
+            del missing[timestamp]
+    return bool(missing)
+
+
+def pack_samples(samples, protocol=pickle.HIGHEST_PROTOCOL):
+    """Pack timestamps or values for pickling.
+
+    Samples stored in an :class:`array.array` are passed as a raw buffer,
+    with protocol 5 as a :class:`pickle.PickleBuffer` that can be sent
+    out-of-band (see :func:`to_bytes`). Lists are left to pickle, which
+    stores lists of floats faster than they can be converted to an array.
+
+    Parameters
+    ----------
+    samples : list or array.array
+        Timestamps or values of :class:`InterfaceData`.
+
+    protocol : int
+        Pickle protocol (default: `pickle.HIGHEST_PROTOCOL`)
+
+    Returns
+    -------
+    tuple
+        Type code (or `None` for other samples), byte order and the buffer
+        (or the samples), see :func:`unpack_samples`.
+    """
+    if not isinstance(samples, array):
+        return (None, None, samples)
+    return (samples.typecode, sys.byteorder,
+            pickle.PickleBuffer(samples) if protocol >= 5 else samples)
+
+
+def unpack_samples(typecode, byteorder, data):
+    """Unpack samples packed by :func:`pack_samples`.
+
+    Returns
+    -------
+    list or array.array
+        The samples.
+    """
+    if typecode is None or isinstance(data, array):
+        return data
+    samples = array(typecode)
+    samples.frombytes(memoryview(data).cast("B"))
+    if byteorder != sys.byteorder:
+        samples.byteswap()
+    return samples
+
+
+def unpack_interface_data(timestamps, values):
+    """Create :class:`InterfaceData` from samples packed for pickling."""
+    interface_data = InterfaceData()
+    interface_data.timestamps = unpack_samples(*timestamps)
+    interface_data.values = unpack_samples(*values)
+    return interface_data
+
+
+def to_bytes(data):
+    """Serialize InterfaceData or LoggerData.
+
+    The data is pickled with protocol 5 and the arrays of samples are stored
+    out-of-band, after the pickle: a header with the length of the pickle
+    and the number of buffers, the pickle, the length of each buffer and the
+    raw buffers. The arrays are copied into the output without being
+    converted element by element.
+
+    Returns
+    -------
+    bytes
+        Serialized data, see :func:`from_bytes`.
+    """
+    buffers = []
+    stream = pickle.dumps(data, protocol=5, buffer_callback=buffers.append)
+    raw = [buffer.raw() for buffer in buffers]
+    return b"".join([
+        _HEADER.pack(SERIALIZED_MAGIC, len(stream), len(raw)), stream,
+        struct.pack(f"<{len(raw)}Q", *(view.nbytes for view in raw)),
+        *raw])
+
+
+def from_bytes(data):
+    """Deserialize data of :func:`to_bytes`.
+
+    Parameters
+    ----------
+    data : bytes-like
+        Serialized data, like the contents of a file or a memory map.
+
+    Returns
+    -------
+    InterfaceData or LoggerData
+        The deserialized data.
+    """
+    view = memoryview(data)
+    magic, length, count = _HEADER.unpack_from(view)
+    if magic != SERIALIZED_MAGIC:
+        raise ValueError("Data was not serialized with to_bytes.")
+    offset = _HEADER.size
+    stream = view[offset:offset + length]
+    offset += length
+    sizes = struct.unpack_from(f"<{count}Q", view, offset)
+    offset += 8 * count
+    buffers = []
+    for size in sizes:
+        buffers.append(view[offset:offset + size])
+        offset += size
+    return pickle.loads(stream, buffers=buffers)
+
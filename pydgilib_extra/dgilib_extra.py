@@ -6,12 +6,15 @@ from pydgilib.dgilib import DGILib
 
 from pydgilib.dgilib_config import (
     INTERFACE_GPIO, INTERFACE_TIMESTAMP, INTERFACE_POWER_DATA)
-from pydgilib_extra.dgilib_extra_config import (INTERFACE_POWER, LOGGER_CSV)
+from pydgilib_extra.dgilib_extra_config import (
+    INTERFACE_POWER, INTERFACE_VOLTAGE, LOGGER_CSV)
 from pydgilib_extra.dgilib_logger import DGILibLogger
 from pydgilib_extra.dgilib_data import LoggerData
 from pydgilib_extra.dgilib_interface import DGILibInterface
 from pydgilib_extra.dgilib_interface_gpio import DGILibInterfaceGPIO
-from pydgilib_extra.dgilib_interface_power import DGILibInterfacePower
+from pydgilib_extra.dgilib_interface_power import (
+    DGILibInterfacePower, DGILibInterfaceVoltage)
+from pydgilib_extra.dgilib_pool import connection_pool
 
 
 class DGILibExtra(DGILib):
@@ -21,21 +24,55 @@ class DGILibExtra(DGILib):
     default_loggers = [LOGGER_CSV]
 
     def __init__(self, *args, **kwargs):
-        """Instantiate DGILibExtra object."""
+        """Instantiate DGILibExtra object.
+
+        Parameters
+        ----------
+        connection_pool : DGILibPool or bool
+            Keep the connection open after the session in the given pool (or
+            the default pool if `True`) and reuse it in the next session of
+            the same device (default: `None`, disconnect after the session).
+            See :class:`DGILibPool`.
+
+        clock_alignment : ClockAlignment or None
+            Estimate the offset and drift between the GPIO and power
+            timestamps while logging and shift the GPIO timestamps to the power
+            time base (default: `None`, delay the GPIO timestamps by the fixed
+            `gpio_delay_time`). See :class:`ClockAlignment`.
+
+        calibration_cache_file : str or None
+            Json file to cache the calibrations of the Auxiliary Power
+            interface in between sessions (default: `CALIBRATION_CACHE_FILE`,
+            ``calibration.json`` in the ``pydgilib`` folder of the platform
+            cache directory: ``%LOCALAPPDATA%`` on Windows,
+            ``~/Library/Caches`` on macOS and ``$XDG_CACHE_HOME`` or
+            ``~/.cache`` elsewhere). If `None` the calibrations are only
+            cached in memory. See :class:`CalibrationCache`.
+
+        All other arguments are passed on to :class:`DGILib`, the logger and
+        the interfaces.
+        """
         # Add modules as classes (will be replaced by objects when used)
         self.logger = DGILibLogger
         self.interfaces = {INTERFACE_GPIO: DGILibInterfaceGPIO,
-                           INTERFACE_POWER: DGILibInterfacePower}
+                           INTERFACE_POWER: DGILibInterfacePower,
+                           INTERFACE_VOLTAGE: DGILibInterfaceVoltage}
         # Set default values for attributes
         self.available_interfaces = []
         self.enabled_interfaces = []
         self.timer_factor = None
+        self.calibration_valid = False
+        self.configurations = {}
+        self.complete_configurations = set()
         self.data = None
         # Instantiate base class
         DGILib.__init__(self, *args, **kwargs)
         # Store arguments
         self.args = args
         self.kwargs = kwargs
+        self.connection_pool = kwargs.get("connection_pool")
+        if self.connection_pool is True:
+            self.connection_pool = connection_pool
 
         # Instantiate logger
         if self.kwargs.get("loggers", self.default_loggers):
@@ -47,10 +84,13 @@ class DGILibExtra(DGILib):
 
     def __enter__(self):
         """For usage in ``with DGILibExtra() as dgilib:`` syntax."""
-        DGILib.__enter__(self)
-        self.available_interfaces = self.interface_list()
-        if INTERFACE_POWER_DATA in self.available_interfaces:
-            self.available_interfaces.append(INTERFACE_POWER)
+        if self.connection_pool is None or \
+                not self.connection_pool.acquire(self):
+            DGILib.__enter__(self)
+            self.available_interfaces = self.interface_list()
+            if INTERFACE_POWER_DATA in self.available_interfaces:
+                self.available_interfaces.append(INTERFACE_POWER)
+                self.available_interfaces.append(INTERFACE_VOLTAGE)
 
         # Instantiate interface objects and enable the interfaces
         for interface_id in self.kwargs.get(
@@ -66,9 +106,26 @@ class DGILibExtra(DGILib):
 
     def __exit__(self, exc_type, exc_value, traceback):
         """For usage in ``with DGILibExtra() as dgilib:`` syntax."""
-        for interface in self.interfaces.values():
+        # Interfaces that were not enabled are still classes
+        interfaces = [interface for interface in self.interfaces.values()
+                      if isinstance(interface, DGILibInterface)]
+        for interface in interfaces:
             interface.disable()
 
+        if self.connection_pool is None:
+            DGILib.__exit__(self, exc_type, exc_value, traceback)
+            return
+        if exc_type is None:
+            for interface in interfaces:
+                interface.reset()
+            if self.connection_pool.release(self):
+                return
+        else:
+            # The state of the device is unknown, do not reuse the connection
+            self.connection_pool.discard(self)
+        if self.power_hndl is not None:
+            self.auxiliary_power_uninitialize()
+            self.power_hndl = None
         DGILib.__exit__(self, exc_type, exc_value, traceback)
 
     def info(self):
@@ -104,6 +161,96 @@ class DGILibExtra(DGILib):
         sleep(duration)
         self.target_reset(False)
 
+    def get_configuration(self, interface_id):
+        """get_configuration
+
+        Get the configuration of the interface, from the cache if it was
+        read or set before (see :meth:`invalidate_configuration`).
+
+        Parameters
+        ----------
+        interface_id : int
+            The ID of the interface
+
+        Returns
+        -------
+        tuple(list(int), list(int))
+            Tuple of a list of configuration IDs and a list of configuration
+            values
+        """
+        if interface_id not in self.complete_configurations:
+            config_id, config_value = self.interface_get_configuration(
+                interface_id)
+            self.configurations[interface_id] = dict(
+                zip(config_id, config_value))
+            self.complete_configurations.add(interface_id)
+        configuration = self.configurations[interface_id]
+        return list(configuration.keys()), list(configuration.values())
+
+    def set_configuration(self, interface_id, config_id, config_value):
+        """set_configuration
+
+        Set the configuration fields of the interface, unless all of them
+        already have the given values.
+
+        Parameters
+        ----------
+        interface_id : int
+            The ID of the interface
+
+        config_id : list(int)
+            List that holds the ID field for the configuration items to set
+
+        config_value : list(int)
+            List that holds the value field for the configuration items to set
+        """
+        configuration = self.configurations.setdefault(interface_id, {})
+        if all(configuration.get(key) == value
+               for key, value in zip(config_id, config_value)):
+            if self.verbose >= 2:
+                self.tracer.trace(
+                    f"Configuration of interface {interface_id} unchanged")
+            return
+        try:
+            self.interface_set_configuration(
+                interface_id, config_id, config_value)
+        except Exception:
+            self.invalidate_configuration(interface_id)
+            raise
+        configuration.update(zip(config_id, config_value))
+
+    def invalidate_configuration(self, interface_id=None):
+        """invalidate_configuration
+
+        Forget the cached configuration, the next call to
+        :meth:`get_configuration` or :meth:`set_configuration` will access the
+        device.
+
+        Parameters
+        ----------
+        interface_id : int or None
+            The ID of the interface (default: `None`, all interfaces)
+        """
+        if interface_id is None:
+            self.configurations.clear()
+            self.complete_configurations.clear()
+        else:
+            self.configurations.pop(interface_id, None)
+            self.complete_configurations.discard(interface_id)
+
+    def get_time_base(self):
+        """get_time_base
+
+        Get the prescaler and frequency of the timer of the timestamps.
+
+        Returns
+        -------
+        tuple(int, int)
+            Timer prescaler and timer frequency (in Hz)
+        """
+        _, config_value = self.get_configuration(INTERFACE_TIMESTAMP)
+        return config_value[0], config_value[1]
+
     def get_time_factor(self):
         """get_time_factor
         
@@ -114,9 +261,7 @@ class DGILibExtra(DGILib):
         float
             Timer factor
         """
-        _, config_value = self.interface_get_configuration(INTERFACE_TIMESTAMP)
-        timer_prescaler = config_value[0]
-        timer_frequency = config_value[1]
+        timer_prescaler, timer_frequency = self.get_time_base()
 
         if self.verbose:
             print(
@@ -132,6 +277,11 @@ class DGILibExtra(DGILib):
         Populate self.data with an empty data structure (of type 
         :class:`LoggerData`).
 
+        The retention policy of the data is taken from the `max_samples` and
+        `max_duration` keyword arguments, the interfaces to keep statistics
+        and pyramids of from the `statistics` and `pyramids` keyword
+        arguments (see :class:`LoggerData`).
+
         Parameters
         ----------
         interfaces : list(int, int, ...)
@@ -139,4 +289,8 @@ class DGILibExtra(DGILib):
         """
         if interfaces is None:
             interfaces = self.enabled_interfaces
-        self.data = LoggerData(interfaces)
+        self.data = LoggerData(
+            interfaces, max_samples=self.kwargs.get("max_samples"),
+            max_duration=self.kwargs.get("max_duration"),
+            statistics=self.kwargs.get("statistics"),
+            pyramids=self.kwargs.get("pyramids"))
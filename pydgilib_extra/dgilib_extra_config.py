@@ -1,5 +1,8 @@
 """Configuration for PyDGILibExtra."""
 
+import sys
+from os import getenv, path
+
 from pydgilib.dgilib_config import (
     INTERFACE_SPI, INTERFACE_USART, INTERFACE_I2C, INTERFACE_GPIO)
 
@@ -9,17 +12,42 @@ LOGGER_OBJECT = 1
 LOGGER_PLOT = 2
 
 INTERFACE_POWER = 0x100  # 256
+INTERFACE_VOLTAGE = 0x101  # 257
 
 NUM_PINS = 4
 
 FILE_NAME_BASE = "log"
 
+
+
+def cache_folder():
+    """Get the cache folder of the platform for pydgilib.
+
+    ``%LOCALAPPDATA%`` on Windows, ``~/Library/Caches`` on macOS and
+    ``$XDG_CACHE_HOME`` (default: ``~/.cache``) on other platforms.
+    """
+    if sys.platform == "win32":
+        base = getenv("LOCALAPPDATA") or path.expanduser(
+            path.join("~", "AppData", "Local"))
+    elif sys.platform == "darwin":
+        base = path.expanduser(path.join("~", "Library", "Caches"))
+    else:
+        base = getenv("XDG_CACHE_HOME") or path.expanduser(
+            path.join("~", ".cache"))
+    return path.join(base, "pydgilib")
+
+
+# Calibration cache of the Auxiliary Power interface
+CALIBRATION_CACHE_FILE = path.join(cache_folder(), "calibration.json")
+CALIBRATION_VALIDITY = 24 * 60 * 60  # seconds
+
 INTERFACES = {
     "spi": INTERFACE_SPI,
     "usart": INTERFACE_USART,
     "i2c": INTERFACE_I2C,
     "gpio": INTERFACE_GPIO,
-    "power": INTERFACE_POWER}
+    "power": INTERFACE_POWER,
+    "voltage": INTERFACE_VOLTAGE}
 
 POLLING = 0
 POWER = 1
@@ -19,3 +19,9 @@ class PowerReadError(Error):
     """Exception raised when reading power buffer."""
 
     pass
+
+
+class SharedDataFullError(Error):
+    """Exception raised when appending to full shared memory."""
+
+    pass
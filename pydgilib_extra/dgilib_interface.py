@@ -74,6 +74,14 @@ class DGILibInterface(object):
             self.dgilib_extra.interface_disable(self.interface_id)
             self.dgilib_extra.enabled_interfaces.remove(self.interface_id)
 
+    def reset(self):
+        """reset
+
+        Reset the state of the interface, so the connection can be reused by
+        another session (see :class:`DGILibPool`).
+        """
+        pass
+
     def read(self, *args, **kwargs):
         """read
 
@@ -4,7 +4,7 @@ from pydgilib.dgilib_config import INTERFACE_GPIO
 from pydgilib_extra.dgilib_extra_config import NUM_PINS
 from pydgilib_extra.dgilib_interface import DGILibInterface
 from pydgilib_extra.dgilib_calculations import GPIOAugmentEdges
-from pydgilib_extra.dgilib_data import InterfaceData
+from pydgilib_extra.dgilib_data import TickInterfaceData
 
 
 # TODO: make these functions faster/better?
@@ -61,22 +61,29 @@ class DGILibInterfaceGPIO(DGILibInterface):
         DGILibInterface.__init__(self, *args, **kwargs)
 
         # Parse arguments
-        # By default augment gpio with delay of self.default_gpio_delay_time
+        # By default augment gpio with delay of self.default_gpio_delay_time,
+        # unless the delay is estimated by a ClockAlignment
         if kwargs.get("augment_gpio", True) or "gpio_delay_time" in kwargs or \
                 "gpio_switch_time" in kwargs:
             self.augment_gpio = True
             self.gpio_delay_time = kwargs.get(
-                "gpio_delay_time", self.default_gpio_delay_time)
+                "gpio_delay_time",
+                0 if kwargs.get("clock_alignment") is not None
+                else self.default_gpio_delay_time)
             self.gpio_switch_time = kwargs.get("gpio_switch_time", 0)
             self.gpio_augment_edges_streaming = GPIOAugmentEdges()
             self.gpio_augment_edges = \
                 self.gpio_augment_edges_streaming.gpio_augment_edges
+        else:
+            self.augment_gpio = False
 
         # NOTE: Might not be the best place to do this
         if self.dgilib_extra is not None and \
                 self.dgilib_extra.timer_factor is None:
             self.dgilib_extra.timer_factor = \
                 self.dgilib_extra.get_time_factor()
+        self.time_base = (1, 1) if self.dgilib_extra is None else \
+            self.dgilib_extra.get_time_base()
 
         if self.verbose:
             print("read_mode: ", self.read_mode)
@@ -109,8 +116,7 @@ class DGILibInterfaceGPIO(DGILibInterface):
             to output and can be controlled by the send command.
         """
         # Get the configuration
-        _, config_value = self.dgilib_extra.interface_get_configuration(
-            INTERFACE_GPIO)
+        _, config_value = self.dgilib_extra.get_configuration(INTERFACE_GPIO)
 
         # Convert int to lists of bool
         read_mode = int2bool(config_value[0])
@@ -147,11 +153,11 @@ class DGILibInterfaceGPIO(DGILibInterface):
         # Set the configuration
         if "read_mode" in kwargs:
             self.read_mode = kwargs["read_mode"]
-            self.dgilib_extra.interface_set_configuration(
+            self.dgilib_extra.set_configuration(
                 INTERFACE_GPIO, [0], [bool2int(self.read_mode)])
         if "write_mode" in kwargs:
             self.write_mode = kwargs["write_mode"]
-            self.dgilib_extra.interface_set_configuration(
+            self.dgilib_extra.set_configuration(
                 INTERFACE_GPIO, [1], [bool2int(self.write_mode)])
 
     def read(self):
@@ -161,30 +167,29 @@ class DGILibInterfaceGPIO(DGILibInterface):
 
         Clears the buffer and returns the values.
 
+        The timestamps are kept in ticks of the timer and only converted to
+        seconds when they are used (see :class:`TickInterfaceData`).
+
         Returns
         -------
-        tuple(list(float), list(list(bool, bool, bool, bool)))
-            Tuple of list of timestamps in seconds and list of list of
-            pin states (bool).
+        TickInterfaceData
+            Timestamps and list of list of pin states (bool).
         """
         # Read the data from the buffer
         ticks, pin_values = self.dgilib_extra.interface_read_data(
             INTERFACE_GPIO)
 
         pin_values = [int2bool(pin_value) for pin_value in pin_values]
-        timestamps = [tick * self.dgilib_extra.timer_factor for tick in ticks]
+        interface_data = TickInterfaceData(ticks, pin_values, *self.time_base)
 
         if self.verbose >= 2:
             print(f"Collected {len(pin_values)} gpio samples ({NUM_PINS} " +
                   "pins per sample)")
 
         if self.augment_gpio:
-            interface_data = InterfaceData(timestamps, pin_values)
             self.gpio_augment_edges(
                 interface_data, self.gpio_delay_time, self.gpio_switch_time)
-            return interface_data
-        else:
-            return InterfaceData(timestamps, pin_values)
+        return interface_data
 
     def write(self, pin_values):
         """write
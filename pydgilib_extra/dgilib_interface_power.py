@@ -1,11 +1,16 @@
 """This module wraps the calls to the Power Interface."""
 
-from time import sleep
+import json
+from array import array
+from os import makedirs, path
+from time import sleep, time
 
 from pydgilib.dgilib_config import (
     CALIBRATING, DONE, IDLE, OVERFLOWED, RUNNING, XAM, CHANNEL_A,
-    POWER_CURRENT)
-from pydgilib_extra.dgilib_extra_config import (INTERFACE_POWER, POWER)
+    POWER_CURRENT, POWER_VOLTAGE, BUFFER_SIZE)
+from pydgilib_extra.dgilib_extra_config import (
+    INTERFACE_POWER, INTERFACE_VOLTAGE, POWER, CALIBRATION_CACHE_FILE,
+    CALIBRATION_VALIDITY)
 from pydgilib_extra.dgilib_extra_exceptions import (
     PowerReadError, PowerStatusError, InterfaceNotAvailableError)
 
@@ -13,6 +18,100 @@ from pydgilib_extra.dgilib_interface import DGILibInterface
 from pydgilib_extra.dgilib_data import InterfaceData
 
 
+class CalibrationCache(object):
+    """Cache of the calibrations of the Auxiliary Power interface.
+
+    The time and raw calibration data (`auxiliary_power_get_calibration`) of
+    the last calibration are stored per device serial number and circuit
+    type, and persisted in a json file so they survive the session.
+
+    Parameters
+    ----------
+    file_path : str or None
+        Path of the json file to persist the cache in (default:
+        `CALIBRATION_CACHE_FILE`). If `None` the cache is kept in memory.
+
+    validity : float
+        Number of seconds after which a calibration expires (default:
+        `CALIBRATION_VALIDITY`).
+    """
+
+    def __init__(self, file_path=CALIBRATION_CACHE_FILE,
+                 validity=CALIBRATION_VALIDITY):
+        """Instantiate CalibrationCache object."""
+        self.file_path = file_path
+        self.validity = validity
+        self.calibrations = {}
+        self.load()
+
+    @staticmethod
+    def key(device_sn, circuit_type):
+        """Get the key of the calibration of a device and circuit type."""
+        if isinstance(device_sn, bytes):
+            device_sn = device_sn.decode()
+        return f"{device_sn}_{circuit_type}"
+
+    def load(self):
+        """Load the cache from `self.file_path`, if it exists."""
+        if self.file_path is None:
+            return
+        try:
+            with open(self.file_path) as cache_file:
+                self.calibrations = json.load(cache_file)
+        except (OSError, ValueError):
+            # The cache is only an optimization, start over
+            self.calibrations = {}
+
+    def save(self):
+        """Save the cache to `self.file_path`."""
+        if self.file_path is None:
+            return
+        try:
+            makedirs(path.dirname(path.abspath(self.file_path)),
+                     exist_ok=True)
+            with open(self.file_path, 'w') as cache_file:
+                json.dump(self.calibrations, cache_file)
+        except OSError:
+            pass
+
+    def get(self, device_sn, circuit_type):
+        """Get the cached calibration.
+
+        Returns
+        -------
+        dict or None
+            Dictionary with the ``time`` and raw calibration ``data``, or
+            `None` if there is no calibration cached.
+        """
+        return self.calibrations.get(self.key(device_sn, circuit_type))
+
+    def expired(self, device_sn, circuit_type):
+        """Check if the cached calibration is older than `self.validity`.
+
+        Returns
+        -------
+        bool or None
+            Whether the calibration expired, `None` if there is no
+            calibration cached.
+        """
+        calibration = self.get(device_sn, circuit_type)
+        if calibration is None:
+            return None
+        return time() - calibration["time"] > self.validity
+
+    def store(self, device_sn, circuit_type, data):
+        """Store a calibration made now and save the cache.
+
+        Parameters
+        ----------
+        data : list(int)
+            Raw calibration data
+        """
+        self.calibrations[self.key(device_sn, circuit_type)] = {
+            "time": time(), "data": list(data)}
+        self.save()
+
+
 class DGILibInterfacePower(DGILibInterface):
     """Wraps the calls to the Power interface."""
 
@@ -25,6 +124,16 @@ class DGILibInterfacePower(DGILibInterface):
         """Instantiate DGILibInterfacePower object."""
         # Set default values for attributes
         self.power_buffers = []
+        self.buffer_data = {}
+        self.read_keys = set()
+        self.read_stats = {}
+        self.circuit_type = None
+        self.power_buffer_size = kwargs.get("power_buffer_size", BUFFER_SIZE)
+        self.calibration_cache = kwargs.get("calibration_cache")
+        if self.calibration_cache is None:
+            self.calibration_cache = CalibrationCache(
+                kwargs.get("calibration_cache_file", CALIBRATION_CACHE_FILE),
+                kwargs.get("calibration_validity", CALIBRATION_VALIDITY))
         # Instantiate base class
         DGILibInterface.__init__(self, *args, **kwargs)
         # Parse arguments
@@ -59,6 +168,11 @@ class DGILibInterfacePower(DGILibInterface):
         power_buffers: list(dict)
             Power buffers configuration list of dictionaries
             like ``[{"channel": CHANNEL_A, "power_type": POWER_CURRENT}]``.
+
+        power_buffer_size: int
+            Number of samples that fit in each of the buffers (default:
+            `BUFFER_SIZE`). Smaller buffers are drained in multiple copies
+            per read (see :meth:`read_buffers`).
         """
         # Parse arguments
         power_buffers = kwargs.get(
@@ -72,26 +186,29 @@ class DGILibInterfacePower(DGILibInterface):
 
         # Enable the configurations that are in the new config and not in
         # self.power_buffers
-        # BUG: This probably needs multiple power handles
         for power_buffer in power_buffers:
             if power_buffer not in self.power_buffers:
                 self.dgilib_extra.auxiliary_power_register_buffer_pointers(
                     channel=power_buffer["channel"],
-                    power_type=power_buffer["power_type"])
+                    power_type=power_buffer["power_type"],
+                    max_count=self.power_buffer_size)
                 self.power_buffers.append(power_buffer)
 
         # Disable the configurations that are not in the new config and remove
         # them from self.power_buffers
-        for power_buffer in self.power_buffers:
+        for power_buffer in list(self.power_buffers):
             if power_buffer not in power_buffers:
                 self.dgilib_extra.auxiliary_power_unregister_buffer_pointers(
                     channel=power_buffer["channel"],
                     power_type=power_buffer["power_type"],)
                 self.power_buffers.remove(power_buffer)
 
-        # Uninitialize the power handle if there are no power buffers left
+        # Uninitialize the power handle if there are no power buffers left.
+        # Forget the handle, so the next call initializes a new one (above)
+        # and the session does not uninitialize it again when it closes.
         if not self.power_buffers:
             self.dgilib_extra.auxiliary_power_uninitialize()
+            self.dgilib_extra.power_hndl = None
 
     def enable(self):
         """enable
@@ -119,11 +236,35 @@ class DGILibInterfacePower(DGILibInterface):
             self.set_config()  # BUG
             self.dgilib_extra.enabled_interfaces.remove(self.interface_id)
 
+    def reset(self):
+        """reset
+
+        Unregister all power buffers, but keep the power handle so it can be
+        reused by another session (see :class:`DGILibPool`).
+        """
+        for power_buffer in self.power_buffers:
+            self.dgilib_extra.auxiliary_power_unregister_buffer_pointers(
+                channel=power_buffer["channel"],
+                power_type=power_buffer["power_type"],)
+        self.power_buffers = []
+        self.buffer_data = {}
+        self.read_keys = set()
+
     def read(self, buffer_num=0):
         """read
 
         Read data from the interface.
 
+        The data of all power buffers is read in one go (see
+        :meth:`read_buffers`). The data of the buffer at `buffer_num` is
+        returned, the data of the other buffers is kept for the next read
+        of those buffers (see :meth:`read_buffer`).
+
+        Parameters
+        ----------
+        buffer_num : int
+            Index of the buffer in `self.power_buffers` (default: `0`)
+
         Returns
         -------
         InterfaceData
@@ -137,23 +278,96 @@ class DGILibInterfacePower(DGILibInterface):
 
         Read power data of the specified buffer.
 
+        The data of all power buffers is read in one go (see
+        :meth:`read_buffers`). The data of the other buffers is appended to
+        `self.buffer_data` if they are read (see :meth:`buffer_readers`),
+        and returned (together with the new data) by their next read. The
+        data of buffers that are not read is dropped.
+
+        Parameters
+        ----------
+        power_buffer : dict
+            Power buffer configuration like
+            ``{"channel": CHANNEL_A, "power_type": POWER_CURRENT}``.
+
         Returns
         -------
-        tuple(list(float), list(float))
-            Tuple of list of power samples in Ampere and list of
-            timestamps in seconds.
+        InterfaceData
+            Power samples in Ampere (or Volt) and timestamps in seconds.
         """
-        # TODO: Copies parsed power data into the specified buffer. Remember to
-        # lock the buffers first. If the count parameter is the same as
-        # max_count there is probably more data to be read. Do another read to
-        # get the remaining data.
-
         # Check if power_buffer is in self.power_buffers
         if power_buffer not in self.power_buffers:
             raise PowerReadError(
                 f"Power Buffer {power_buffer} does not exist in "
                 f"self.power_buffers: {self.power_buffers}.")
 
+        key = (power_buffer["channel"], power_buffer["power_type"])
+        self.read_keys.add(key)
+        buffers = self.read_buffers()
+        self.keep_buffer_data(buffers)
+
+        # Data of earlier reads comes first
+        return self.buffer_data.pop(key)
+
+    def buffer_readers(self):
+        """Get the buffers of which the data is kept between reads.
+
+        Returns
+        -------
+        set(tuple(int, int))
+            ``(channel, power_type)`` of the first buffer (the one
+            :meth:`read` returns by default), the buffers that were read with
+            :meth:`read_buffer` and the buffer of the voltage interface if it
+            is enabled.
+        """
+        readers = set(self.read_keys)
+        if self.power_buffers:
+            readers.add((self.power_buffers[0]["channel"],
+                         self.power_buffers[0]["power_type"]))
+        if INTERFACE_VOLTAGE in self.dgilib_extra.enabled_interfaces:
+            voltage = self.dgilib_extra.interfaces[INTERFACE_VOLTAGE]
+            readers.add((voltage.channel, POWER_VOLTAGE))
+        return readers
+
+    def keep_buffer_data(self, buffers):
+        """Append the data of the buffers that are read to `buffer_data`.
+
+        Parameters
+        ----------
+        buffers : dict
+            Dictionary of ``(channel, power_type)`` and :class:`InterfaceData`
+            (see :meth:`read_buffers`).
+        """
+        readers = self.buffer_readers()
+        for key, interface_data in buffers.items():
+            if key not in readers:
+                continue
+            if key in self.buffer_data:
+                self.buffer_data[key] += interface_data
+            else:
+                self.buffer_data[key] = interface_data
+
+    def read_buffers(self):
+        """read_buffers
+
+        Read power data of all buffers in `self.power_buffers`.
+
+        The buffers are locked once, the data of every buffer is copied
+        into preallocated arrays (see
+        :meth:`DGILib.auxiliary_power_copy_data_into`) and then the buffers
+        are freed. `auxiliary_power_free_data` clears the data of all
+        channels, so all buffers have to be copied before it is called.
+
+        The number of copies and samples each buffer needed are stored in
+        `self.read_stats` as a dictionary of ``(channel, power_type)`` and
+        ``(iterations, samples)``.
+
+        Returns
+        -------
+        dict
+            Dictionary of ``(channel, power_type)`` and :class:`InterfaceData`
+            with the power samples and timestamps in seconds.
+        """
         # Check if auxiliary_power_get_status() is in
         #   - IDLE = 0x00,
         #   - RUNNING = 0x01,
@@ -162,48 +376,72 @@ class DGILibInterfacePower(DGILibInterface):
         # and raise PowerStatusError if it is.
         power_status = self.dgilib_extra.auxiliary_power_get_status()
         if self.verbose:
-            print(f"power_status: {power_status}")
+            self.dgilib_extra.tracer.trace(f"power_status: {power_status}")
         # if power_status <= DONE or power_status == OVERFLOWED:
         if power_status not in (IDLE, RUNNING, DONE, OVERFLOWED):
             raise PowerStatusError(f"Power Status {power_status}.")
         if power_status == OVERFLOWED:
-            print(
-                f"BUFFER OVERFLOW, call this function more frequently or "
-                f"increase the buffer size.")
-
-        # Create variables to the store data in
-        interface_data = InterfaceData()
-
-        # TODO: Check implementation in case of buffer overflow.
-        # Should auxiliary_power_lock_data_for_reading() be inside the loop
-        # or before?
-
-        # Get the data from the buffer in the library
-        while True:
-            self.dgilib_extra.auxiliary_power_lock_data_for_reading()
-            interface_data += self.dgilib_extra.auxiliary_power_copy_data(
-                power_buffer["channel"], power_buffer["power_type"])
-            # BUG: This probably clears all channels! (channels might not be
-            # working on XAM anyway)
-            self.dgilib_extra.auxiliary_power_free_data()
-            # Repeat the loop until there is no buffer overflow (which should
-            # always be avoided.)
-            if self.dgilib_extra.auxiliary_power_get_status() != OVERFLOWED:
-                break
+            self.dgilib_extra.overflows[INTERFACE_POWER] = \
+                self.dgilib_extra.overflows.get(INTERFACE_POWER, 0) + 1
+            self.dgilib_extra.tracer.trace(
+                "BUFFER OVERFLOW, call this function more frequently or "
+                "increase the buffer size.")
+
+        # Get the data from the buffers in the library. If a copy fills the
+        # space it was given (count equals max_count) there is more data to
+        # be read, so keep copying until the buffer is drained. The samples
+        # are copied straight into arrays that are preallocated for the
+        # number of samples of the last read, and grown when they are full.
+        buffers = {}
+        self.dgilib_extra.auxiliary_power_lock_data_for_reading()
+        for power_buffer in self.power_buffers:
+            key = (power_buffer["channel"], power_buffer["power_type"])
+            capacity = self.read_stats.get(key, (0, 0))[1] + \
+                self.power_buffer_size
+            timestamps = array("d", bytes(8 * capacity))
+            values = array("f", bytes(4 * capacity))
+            count = iterations = 0
+            while True:
+                if capacity - count < self.power_buffer_size:
+                    grow = max(capacity, self.power_buffer_size)
+                    timestamps.frombytes(bytes(8 * grow))
+                    values.frombytes(bytes(4 * grow))
+                    capacity += grow
+                copied = self.dgilib_extra.auxiliary_power_copy_data_into(
+                    values, timestamps, count, *key,
+                    max_count=self.power_buffer_size)
+                count += copied
+                iterations += 1
+                if copied < self.power_buffer_size:
+                    break
+            self.read_stats[key] = (iterations, count)
+            # InterfaceData holds lists, convert them in one go
+            buffers[key] = InterfaceData(
+                timestamps[:count].tolist(), values[:count].tolist())
+        self.dgilib_extra.auxiliary_power_free_data()
 
         if self.verbose >= 2:
-            print(f"Collected {len(interface_data)} power samples")
+            for key, (iterations, samples) in self.read_stats.items():
+                self.dgilib_extra.tracer.trace(
+                    f"Collected {samples} power samples of channel "
+                    f"{key[0]}, power_type {key[1]} in {iterations} copies")
         if self.verbose >= 4:
-            print(interface_data)
+            for interface_data in buffers.values():
+                self.dgilib_extra.tracer.trace(str(interface_data))
 
-        return interface_data
+        return buffers
 
     def calibrate(self, force=False):
         """calibrate
 
         Calibrate the Auxiliary Power interface of the device.
 
-        Check if calibration is valid and trigger calibration if it is not.
+        Check if calibration is valid and trigger calibration if it is not,
+        or if the calibration in `self.calibration_cache` of this device and
+        circuit type expired. The calibration cache can be configured with
+        the `calibration_cache_file` and `calibration_validity` keyword
+        arguments, or replaced with the `calibration_cache` keyword argument
+        (see :class:`CalibrationCache`).
 
         Parameters
         ----------
@@ -220,9 +458,24 @@ class DGILibInterfacePower(DGILibInterface):
         """
         # TODO: Give descriptions to the exceptions under 'Raises' above.
 
+        # The calibration of a connection from DGILibPool is still valid
+        if not force and self.dgilib_extra.calibration_valid:
+            return
+
         self.circuit_type = self.dgilib_extra.auxiliary_power_get_circuit_type()
-        if force or not self.dgilib_extra.auxiliary_power_calibration_is_valid():
+        device_sn = self.dgilib_extra.device_sn
+        expired = self.calibration_cache.expired(device_sn, self.circuit_type)
+        calibrated = False
+        if force or expired or \
+                not self.dgilib_extra.auxiliary_power_calibration_is_valid():
             self.auxiliary_power_calibration()
+            calibrated = True
+        # A valid calibration that is not in the cache yet is stored as well
+        if calibrated or expired is None:
+            self.calibration_cache.store(
+                device_sn, self.circuit_type,
+                self.dgilib_extra.auxiliary_power_get_calibration())
+        self.dgilib_extra.calibration_valid = True
 
     def auxiliary_power_calibration(self, circuit_type=XAM):
         """auxiliary_power_calibration
@@ -238,3 +491,82 @@ class DGILibInterfacePower(DGILibInterface):
         self.dgilib_extra.auxiliary_power_trigger_calibration(circuit_type)
         while self.dgilib_extra.auxiliary_power_get_status() == CALIBRATING:
             sleep(0.1)
+
+
+class DGILibInterfaceVoltage(DGILibInterface):
+    """Voltage samples of the Auxiliary Power interface.
+
+    The voltage is measured by the power parser together with the current.
+    All buffers of the parser are read at once by
+    :class:`DGILibInterfacePower`, which keeps the voltage samples in its
+    `buffer_data`. This interface takes them from there, so the power
+    interface has to be enabled first (list `INTERFACE_VOLTAGE` after
+    `INTERFACE_POWER` in the `interfaces` keyword argument).
+
+    Use :func:`calculate_power` and :class:`EnergyIntegrator` to combine the
+    current and voltage samples.
+    """
+
+    interface_id = INTERFACE_VOLTAGE
+    name = "voltage"
+    csv_header = ["timestamp", "voltage"]
+    polling_type = POWER
+
+    def __init__(self, *args, **kwargs):
+        """Instantiate DGILibInterfaceVoltage object.
+
+        Parameters
+        ----------
+        voltage_channel : int
+            Channel to measure the voltage of (default: `CHANNEL_A`)
+        """
+        self.channel = kwargs.get("voltage_channel", CHANNEL_A)
+        DGILibInterface.__init__(self, *args, **kwargs)
+
+    @property
+    def power_buffer(self):
+        """Power buffer configuration of the voltage samples."""
+        return {"channel": self.channel, "power_type": POWER_VOLTAGE}
+
+    def enable(self):
+        """enable
+
+        Register the voltage buffer of the power interface.
+        """
+        if self.interface_id not in self.dgilib_extra.available_interfaces:
+            raise InterfaceNotAvailableError(
+                f"Interface {self.interface_id} not available. Available " +
+                f"interfaces: {self.dgilib_extra.available_interfaces}")
+        if INTERFACE_POWER not in self.dgilib_extra.enabled_interfaces:
+            raise InterfaceNotAvailableError(
+                f"Interface {self.interface_id} needs interface "
+                f"{INTERFACE_POWER} to be enabled first.")
+        power = self.dgilib_extra.interfaces[INTERFACE_POWER]
+        if self.power_buffer not in power.power_buffers:
+            power.set_config(
+                power_buffers=power.power_buffers + [self.power_buffer])
+        if self.interface_id not in self.dgilib_extra.enabled_interfaces:
+            self.dgilib_extra.enabled_interfaces.append(self.interface_id)
+
+    def disable(self):
+        """disable
+
+        Disable the interface, the buffer is unregistered when the power
+        interface is disabled.
+        """
+        if self.interface_id in self.dgilib_extra.enabled_interfaces:
+            self.dgilib_extra.enabled_interfaces.remove(self.interface_id)
+
+    def read(self):
+        """read
+
+        Get the voltage samples that were read by the power interface.
+
+        Returns
+        -------
+        InterfaceData
+            Voltage samples in Volt and timestamps in seconds.
+        """
+        power = self.dgilib_extra.interfaces[INTERFACE_POWER]
+        return power.buffer_data.pop(
+            (self.channel, POWER_VOLTAGE), InterfaceData())
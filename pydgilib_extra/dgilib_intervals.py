@@ -0,0 +1,257 @@
+"""This module indexes the intervals of the GPIO states."""
+
+from array import array
+from bisect import bisect_left, bisect_right
+
+from pydgilib.dgilib_config import INTERFACE_GPIO
+from pydgilib_extra.dgilib_extra_config import INTERFACE_POWER
+from pydgilib_extra.dgilib_calculations import StreamingCalculation
+
+
+class GPIOIntervalIndex(StreamingCalculation):
+    """GPIO Interval Index (streaming).
+
+    Keeps the intervals in which the GPIO pins hold their state, and the
+    cumulative charge of the power samples, as the data arrives (call it with
+    each chunk of :class:`LoggerData`, like the other streaming
+    calculations). Questions like "what is the average current while pin 2
+    is high" are then answered from the index, without going over the
+    samples again.
+
+    The state of all pins is stored as a bit mask (bit `n` is pin `n`). A
+    condition on the pins is a pin number (with `state`) or a dict of pin
+    numbers and states, like ``{0: True, 3: False}``. The merged intervals of
+    each condition are cached and extended when new data arrives.
+
+    The GPIO and power timestamps should be in the same time base (see
+    :class:`ClockAlignment`).
+
+    Attributes
+    ----------
+    starts : array
+        Start times of the intervals of the pin states.
+
+    masks : array
+        Bit masks of the pin states of the intervals.
+
+    end_time : float or None
+        Timestamp of the last GPIO sample, the end of the last interval.
+    """
+
+    def __init__(self):
+        StreamingCalculation.__init__(self)
+        self.starts = array("d")
+        self.masks = array("Q")
+        self.end_time = None
+        self.power_timestamps = array("d")
+        self.charges = array("d")
+        self.last_pin_values = None
+        self.cache = {}
+
+    def __call__(self, logger_data):
+        """Add new GPIO and power data to the index.
+
+        :param logger_data: LoggerData object with the new data.
+        :type logger_data: LoggerData
+        :return: The index.
+        :rtype: GPIOIntervalIndex
+        """
+        if INTERFACE_GPIO in logger_data:
+            self.update_gpio(logger_data[INTERFACE_GPIO])
+        if INTERFACE_POWER in logger_data:
+            self.update_power(logger_data[INTERFACE_POWER])
+        return self
+
+    def update_gpio(self, gpio_data):
+        """Add new GPIO samples to the index.
+
+        :param gpio_data: InterfaceData with the new GPIO samples.
+        :type gpio_data: InterfaceData
+        """
+        last_pin_values = self.last_pin_values
+        for timestamp, pin_values in zip(gpio_data.timestamps,
+                                         gpio_data.values):
+            if pin_values != last_pin_values:
+                mask = sum(1 << pin for pin, value in enumerate(pin_values)
+                           if value)
+                if not self.masks or mask != self.masks[-1]:
+                    self.starts.append(timestamp)
+                    self.masks.append(mask)
+                last_pin_values = pin_values
+            self.end_time = timestamp
+        self.last_pin_values = last_pin_values
+
+    def update_power(self, power_data):
+        """Add new power samples to the cumulative charge.
+
+        :param power_data: InterfaceData with the new current samples.
+        :type power_data: InterfaceData
+        """
+        timestamps = power_data.timestamps
+        if not len(timestamps):
+            return
+        charge = self.charges[-1] if self.charges else 0.0
+        previous = self.power_timestamps[-1] if self.power_timestamps else \
+            timestamps[0]
+        charges = []
+        for timestamp, value in zip(timestamps, power_data.values):
+            charge += value * (timestamp - previous)
+            previous = timestamp
+            charges.append(charge)
+        self.power_timestamps.extend(timestamps)
+        self.charges.extend(charges)
+
+    @staticmethod
+    def condition(pins, state=True):
+        """Get the bit masks of a condition on the pins.
+
+        :param pins: Pin number or dict of pin numbers and states.
+        :type pins: int or dict
+        :param state: State of the pin if `pins` is a pin number.
+        :type state: bool
+        :return: Mask of the pins in the condition and their states.
+        :rtype: tuple(int, int)
+        """
+        if not isinstance(pins, dict):
+            pins = {pins: state}
+        care = want = 0
+        for pin, pin_state in pins.items():
+            care |= 1 << pin
+            if pin_state:
+                want |= 1 << pin
+        return care, want
+
+    def runs(self, pins, state=True):
+        """Get the cached runs of a condition, extended to the new data.
+
+        Only the intervals before the last one are final (the last one is
+        still growing), so the runs cover those and the start of a run that
+        is still going on.
+
+        :return: Start times, end times and the start of the run that is
+            still going on (or None).
+        :rtype: tuple(array, array, float or None)
+        """
+        care, want = self.condition(pins, state)
+        starts, ends, done, run_start = self.cache.get(
+            (care, want), (array("d"), array("d"), 0, None))
+        closed = len(self.masks) - 1
+        for index in range(done, closed):
+            if self.masks[index] & care == want:
+                if run_start is None:
+                    run_start = self.starts[index]
+            elif run_start is not None:
+                starts.append(run_start)
+                ends.append(self.starts[index])
+                run_start = None
+        self.cache[(care, want)] = (starts, ends, max(closed, done),
+                                    run_start)
+        return starts, ends, run_start
+
+    def intervals(self, pins, state=True, start_time=None, end_time=None):
+        """Get the intervals in which a condition on the pins holds.
+
+        :param pins: Pin number or dict of pin numbers and states.
+        :type pins: int or dict
+        :param state: State of the pin if `pins` is a pin number.
+        :type state: bool
+        :param start_time: Start of the time range (default: all).
+        :type start_time: float or None
+        :param end_time: End of the time range (default: all).
+        :type end_time: float or None
+        :return: List of start and end times, clipped to the time range.
+        :rtype: list(tuple(float, float))
+        """
+        if not self.masks:
+            return []
+        starts, ends, run_start = self.runs(pins, state)
+        care, want = self.condition(pins, state)
+        first = 0 if start_time is None else bisect_right(ends, start_time)
+        last = len(starts) if end_time is None else \
+            bisect_left(starts, end_time, first)
+        intervals = list(zip(starts[first:last], ends[first:last]))
+        # The run that is still going on
+        if self.masks[-1] & care == want:
+            trailing = (self.starts[-1] if run_start is None else run_start,
+                        self.end_time)
+        elif run_start is not None:
+            trailing = (run_start, self.starts[-1])
+        else:
+            trailing = None
+        if trailing is not None and \
+                (end_time is None or trailing[0] < end_time) and \
+                (start_time is None or trailing[1] > start_time):
+            intervals.append(trailing)
+        if start_time is not None or end_time is not None:
+            intervals = [
+                (start if start_time is None else max(start, start_time),
+                 end if end_time is None else min(end, end_time))
+                for start, end in intervals]
+        return intervals
+
+    def charge(self, start_time, end_time):
+        """Get the charge of the power samples between two timestamps.
+
+        Uses the same left Riemann sum as :func:`power_and_time_per_pulse`,
+        looked up in the cumulative charge.
+
+        :return: Charge (Coulomb for current samples).
+        :rtype: float
+        """
+        start = bisect_right(self.power_timestamps, start_time) - 1
+        end = bisect_right(self.power_timestamps, end_time) - 1
+        return (self.charges[end] if end >= 0 else 0.0) - \
+            (self.charges[start] if start >= 0 else 0.0)
+
+    def summary(self, pins, state=True, start_time=None, end_time=None):
+        """Get the time and charge in which a condition on the pins holds.
+
+        :param pins: Pin number or dict of pin numbers and states.
+        :type pins: int or dict
+        :return: Dictionary with the number of intervals, the total time,
+            the charge and the average current.
+        :rtype: dict
+        """
+        intervals = self.intervals(pins, state, start_time, end_time)
+        time = sum(end - start for start, end in intervals)
+        charge = sum(self.charge(start, end) for start, end in intervals)
+        return {
+            "intervals": len(intervals),
+            "time": time,
+            "charge": charge,
+            "average_current": charge / time if time else float("nan"),
+        }
+
+    def summary_per_state(self, pins, start_time=None, end_time=None):
+        """Get the time and charge of each state of a combination of pins.
+
+        :param pins: Pin numbers.
+        :type pins: list(int)
+        :return: Dictionary of the states of the pins (tuple of bools) and
+            dictionaries with the total time, charge and average current.
+        :rtype: dict
+        """
+        summaries = {}
+        if not self.masks:
+            return summaries
+        first = 0 if start_time is None else \
+            max(bisect_right(self.starts, start_time) - 1, 0)
+        last = len(self.starts) if end_time is None else \
+            bisect_left(self.starts, end_time, first)
+        for index in range(first, last):
+            start = self.starts[index]
+            end = self.starts[index + 1] if index + 1 < len(self.starts) \
+                else self.end_time
+            if start_time is not None:
+                start = max(start, start_time)
+            if end_time is not None:
+                end = min(end, end_time)
+            mask = self.masks[index]
+            key = tuple(bool(mask >> pin & 1) for pin in pins)
+            summary = summaries.setdefault(key, {"time": 0.0, "charge": 0.0})
+            summary["time"] += end - start
+            summary["charge"] += self.charge(start, end)
+        for summary in summaries.values():
+            summary["average_current"] = summary["charge"] / summary["time"] \
+                if summary["time"] else float("nan")
+        return summaries
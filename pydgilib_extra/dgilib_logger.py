@@ -1,12 +1,13 @@
 """This module wraps the logging functionality for DGILibExtra."""
 
-from os import getcwd
-from time import time
+from math import ceil
+from os import getcwd, path
+from time import time, sleep
 
+from pydgilib.dgilib_config import RUNNING
 from pydgilib_extra.dgilib_data import LoggerData
 from pydgilib_extra.dgilib_extra_config import (
     LOGGER_CSV, LOGGER_OBJECT, LOGGER_PLOT, FILE_NAME_BASE, POLLING, POWER)
-from pydgilib_extra.dgilib_plot import DGILibPlot
 
 
 class DGILibLogger(object):
@@ -37,6 +38,12 @@ class DGILibLogger(object):
         self.file_name_base = kwargs.get("file_name_base", FILE_NAME_BASE)
         self.log_folder = kwargs.get("log_folder", getcwd())
 
+        # clock_alignment - ClockAlignment that shifts the GPIO timestamps to
+        #     the power time base
+        self.clock_alignment = kwargs.get("clock_alignment")
+        # polling_start_time - Host time at which the polling was started
+        self.polling_start_time = None
+
         # Enable the plot logger if figure has been specified.
         if (LOGGER_PLOT not in self.loggers and
                 ("fig" in kwargs or "ax" in kwargs)):
@@ -45,6 +52,8 @@ class DGILibLogger(object):
         # Set self.figure if LOGGER_PLOT enabled
         # Create axes self.axes if LOGGER_PLOT is enabled
         if LOGGER_PLOT in self.loggers:
+            # Only import matplotlib when plotting
+            from pydgilib_extra.dgilib_plot import DGILibPlot
             self.plotobj = DGILibPlot(self.dgilib_extra, *args, **kwargs)
             self.refresh_plot = self.plotobj.refresh_plot
             self.plot_still_exists = self.plotobj.plot_still_exists
@@ -54,48 +63,113 @@ class DGILibLogger(object):
             if (LOGGER_OBJECT not in self.loggers):
                 self.loggers.append(LOGGER_OBJECT)
 
-    def start(self):
-        """Call to start logging."""
+    def start(self, mode=0, parameter=0, interface_ids=None):
+        """Call to start logging.
+
+        Parameters
+        ----------
+        mode : int
+            Mode of the power parser, 0 for continuous and 1 for oneshot
+            capturing (default: `0`, see
+            :meth:`DGILib.auxiliary_power_start`)
+
+        parameter : int
+            Mode specific parameter of the power parser (default: `0`)
+
+        interface_ids : list(int)
+            List of interface ids to start polling on (default: all enabled
+            interfaces)
+        """
         if LOGGER_CSV in self.loggers:
-            for interface in self.dgilib_extra.interfaces.values():
+            for interface in self.enabled_interfaces():
                 interface.init_csv_writer(self.log_folder)
 
         # Start the data polling
-        self.start_polling()
+        self.start_polling(interface_ids, mode, parameter)
 
         # Create data structure self.data if LOGGER_OBJECT is enabled
         if LOGGER_OBJECT in self.loggers:
             self.dgilib_extra.empty_data()
 
-    def update_callback(self, return_data=False):
-        """Call to get new data."""
-        if return_data:
-            logger_data = LoggerData()
-        # Get data
-        for interface_id, interface in self.dgilib_extra.interfaces.items():
+    def enabled_interfaces(self):
+        """Get the interface objects of the enabled interfaces.
+
+        Interfaces that were not enabled are still classes in
+        `dgilib_extra.interfaces`.
+
+        Returns
+        -------
+        list(DGILibInterface)
+            Interfaces that are enabled.
+        """
+        return [self.dgilib_extra.interfaces[interface_id]
+                for interface_id in self.dgilib_extra.enabled_interfaces]
+
+    def read(self):
+        """Read new data from all interfaces.
+
+        Returns
+        -------
+        LoggerData
+            New data of the interfaces.
+        """
+        logger_data = LoggerData()
+        for interface_id in self.dgilib_extra.enabled_interfaces:
             # Read from the interface
-            interface_data = interface.read()
+            interface_data = self.dgilib_extra.interfaces[interface_id].read()
             # Check if any data has arrived
+            if interface_data:
+                logger_data.extend(interface_id, interface_data)
+        if self.clock_alignment is not None:
+            self.clock_alignment(logger_data)
+        return logger_data
+
+    def commit(self, logger_data):
+        """Pass data to the enabled loggers.
+
+        Parameters
+        ----------
+        logger_data : LoggerData
+            Data to write to the csv files, merge into `self.data` and/or
+            draw on the plot.
+        """
+        for interface_id, interface_data in logger_data.items():
             if interface_data:
                 if LOGGER_CSV in self.loggers:
-                    interface.csv_write_rows(interface_data)
+                    self.dgilib_extra.interfaces[interface_id].csv_write_rows(
+                        interface_data)
                 # Merge data into self.data if LOGGER_OBJECT is enabled
                 if LOGGER_OBJECT in self.loggers:
-                    self.dgilib_extra.data[interface_id] += interface_data
+                    self.dgilib_extra.data.extend(interface_id, interface_data)
                 # Update the plot if LOGGER_PLOT is enabled
                 if LOGGER_PLOT in self.loggers:
                     self.plotobj.update_plot(self.dgilib_extra.data)
-                if return_data:
-                    logger_data[interface_id] += interface_data
+
+    def update_callback(self, return_data=False):
+        """Call to get new data."""
+        # Get data
+        logger_data = self.read()
+        self.commit(logger_data)
 
         # Return the data
         if return_data:
             return logger_data
 
-    def stop(self, return_data=False):
-        """Call to stop logging."""
+    def stop(self, return_data=False, interface_ids=None):
+        """Call to stop logging.
+
+        Parameters
+        ----------
+        return_data : bool
+            Return the last data if `LOGGER_OBJECT` is not enabled (default:
+            `False`)
+
+        interface_ids : list(int)
+            List of interface ids to stop polling on, those passed to
+            :meth:`start` (default: all enabled interfaces)
+        """
         # Stop the data polling
-        self.stop_polling()
+        self.stop_polling(interface_ids)
 
         # Get last data from buffer
         if LOGGER_OBJECT in self.loggers:
@@ -105,15 +179,32 @@ class DGILibLogger(object):
 
         # Close file handle
         if LOGGER_CSV in self.loggers:
-            for interface in self.dgilib_extra.interfaces.values():
+            for interface in self.enabled_interfaces():
                 interface.close_csv_writer()
+            # Save the pyramids next to the csv files
+            if LOGGER_OBJECT in self.loggers:
+                self.save_pyramids()
 
         if LOGGER_OBJECT in self.loggers:
             return self.dgilib_extra.data
         elif return_data:
             return data
 
-    def log(self, duration=10, stop_function=None, min_duration=0.2):
+    def save_pyramids(self):
+        """Save the pyramids of `dgilib_extra.data` next to the csv files.
+
+        The pyramid of an interface is saved as
+        ``<file_name_base>_<name>_pyramid.bin`` in the log folder (see
+        :meth:`InterfacePyramid.load`).
+        """
+        for interface_id, pyramid in self.dgilib_extra.data.pyramids.items():
+            interface = self.dgilib_extra.interfaces[interface_id]
+            pyramid.save(path.join(
+                self.log_folder,
+                f"{self.file_name_base}_{interface.name}_pyramid.bin"))
+
+    def log(self, duration=10, stop_function=None, min_duration=0.2,
+            oneshot=False):
         """Run the logger for the specified amount of time.
 
         Parameters
@@ -127,17 +218,27 @@ class DGILibLogger(object):
             stopped even if the duration has not been reached (default:
             `None`).
 
+        oneshot : bool
+            Capture in oneshot mode, see :meth:`log_oneshot`. Can not be
+            combined with a `stop_function` (default: `False`).
+
         Returns
         -------
         LoggerData
             Returns the logged data as a :class:`LoggerData` object if
             `LOGGER_OBJECT` was passed to the logger.
         """
+        if oneshot:
+            if stop_function is not None:
+                raise ValueError(
+                    "stop_function can not be evaluated in oneshot mode.")
+            return self.log_oneshot(duration)
+
         self.start()
 
         if LOGGER_PLOT in self.loggers:
             # So that the plot has xmax (being time) as big as duration now
-            if self.plotobj is type(DGILibPlot):
+            if self.plotobj is type(self.plotobj):
                 self.plotobj.xmax = duration
 
         cur_time = time()
@@ -166,6 +267,173 @@ class DGILibLogger(object):
         if LOGGER_OBJECT in self.loggers:
             return self.dgilib_extra.data
 
+    def log_oneshot(self, duration=10, timeout=1, poll_interval=0.1,
+                    return_data=False):
+        """Run the logger in oneshot mode.
+
+        The power parser is started in oneshot mode (see
+        :meth:`DGILib.auxiliary_power_start`) so it captures on its own for
+        the duration (rounded up to whole seconds). The host sleeps instead
+        of polling and the buffers are read once when the parser is `DONE`.
+
+        Only the power interfaces are captured. Polling of the other
+        interfaces (GPIO) is not started, their buffers would overflow while
+        the host sleeps.
+
+        Parameters
+        ----------
+        duration : float
+            Amount of time to log data, rounded up to whole seconds
+            (default: `10`).
+
+        timeout : float
+            Amount of time to wait for the parser after the duration has
+            passed (default: `1`).
+
+        poll_interval : float
+            Time between checks of the parser status (default: `0.1`).
+
+        return_data : bool
+            Return the data if `LOGGER_OBJECT` is not enabled (default:
+            `False`, see :meth:`stop`)
+
+        Returns
+        -------
+        LoggerData
+            Returns the logged data as a :class:`LoggerData` object if
+            `LOGGER_OBJECT` was passed to the logger or `return_data` is set.
+        """
+        duration = ceil(duration)
+        interface_ids = [
+            interface_id
+            for interface_id in self.dgilib_extra.enabled_interfaces
+            if self.dgilib_extra.interfaces[interface_id].polling_type ==
+            POWER]
+        self.start(1, duration, interface_ids)
+
+        sleep(duration)
+
+        # Wait for the power parser to finish the capture
+        if interface_ids:
+            end_time = time() + timeout
+            while self.dgilib_extra.auxiliary_power_get_status() == RUNNING \
+                    and time() < end_time:
+                sleep(poll_interval)
+
+        return self.stop(return_data, interface_ids)
+
+    def log_triggered(self, trigger, duration=10, pre_trigger=0.1,
+                      post_trigger=1, max_triggers=1):
+        """Run the logger in triggered capture mode.
+
+        Acquisition runs continuously into a pre-trigger ring buffer (a
+        :class:`LoggerData` with `max_duration` set to `pre_trigger`). Only
+        when the trigger condition is met, the pre-trigger window and the
+        data of the following `post_trigger` seconds are passed to the
+        loggers.
+
+        Triggers during a window are ignored. The pre-trigger window of the
+        next trigger starts at the end of the previous window at the
+        earliest, so no sample is logged twice. Several triggers can be
+        logged from one chunk of data.
+
+        Parameters
+        ----------
+        trigger : callable
+            Function that will be evaluated on each chunk of new data (of
+            type :class:`LoggerData`). Returns the timestamp of the trigger
+            event or `None`. If it has a `trigger_times` method, that is
+            called instead and returns the timestamps of all events in the
+            chunk in order. See :class:`GPIOEdgeTrigger` and
+            :class:`PowerThresholdTrigger`.
+
+        duration : float
+            Maximum amount of time to wait for triggers (default: `10`).
+
+        pre_trigger : float
+            Amount of time before the trigger to log (default: `0.1`).
+
+        post_trigger : float
+            Amount of time after the trigger to log (default: `1`).
+
+        max_triggers : int or None
+            Stop after this many triggers have been logged. `None` logs
+            triggers until the duration has been reached (default: `1`).
+
+        Returns
+        -------
+        LoggerData
+            Returns the logged data as a :class:`LoggerData` object if
+            `LOGGER_OBJECT` was passed to the logger.
+        """
+        self.start()
+
+        ring = LoggerData(
+            [interface.interface_id for interface in
+             self.enabled_interfaces()], max_duration=pre_trigger)
+        num_triggers = 0
+        # Start and end time of the window that is being logged
+        window = None
+        # End time of the last window that was logged
+        last_end_time = None
+        end_time = time() + duration
+
+        while time() < end_time and (
+                max_triggers is None or num_triggers < max_triggers):
+            logger_data = self.read()
+            # Evaluate the trigger on all data to keep its state up to date
+            if hasattr(trigger, "trigger_times"):
+                trigger_times = iter(trigger.trigger_times(logger_data))
+            else:
+                trigger_time = trigger(logger_data)
+                trigger_times = iter(
+                    () if trigger_time is None else (trigger_time,))
+            while True:
+                if window is None:
+                    if max_triggers is not None and \
+                            num_triggers >= max_triggers:
+                        break
+                    # First trigger after the last window
+                    trigger_time = next(
+                        (trigger_time for trigger_time in trigger_times
+                         if last_end_time is None or
+                         trigger_time >= last_end_time), None)
+                    if trigger_time is None:
+                        break
+                    window = (trigger_time - pre_trigger,
+                              trigger_time + post_trigger)
+                    if last_end_time is not None:
+                        window = (max(window[0], last_end_time), window[1])
+                    self.commit(ring.select_time(*window))
+                self.commit(logger_data.select_time(*window))
+                if not any(interface_data.timestamps[-1] >= window[1]
+                           for interface_data in logger_data.values()
+                           if interface_data):
+                    break
+                # The window has been logged, look for the next trigger in
+                # the rest of the chunk
+                last_end_time = window[1]
+                window = None
+                num_triggers += 1
+            ring += logger_data
+
+        # Stop the data polling and get the last data of the trigger window
+        self.stop_polling()
+        logger_data = self.read()
+        if window is not None:
+            self.commit(logger_data.select_time(*window))
+
+        # Close file handle
+        if LOGGER_CSV in self.loggers:
+            for interface in self.enabled_interfaces():
+                interface.close_csv_writer()
+            # Save the pyramids next to the csv files
+            if LOGGER_OBJECT in self.loggers:
+                self.save_pyramids()
+
+        if LOGGER_OBJECT in self.loggers:
+            return self.dgilib_extra.data
+
     def which_polling(self, interface_ids=None):
         """which_polling
 
@@ -193,7 +461,7 @@ class DGILibLogger(object):
                 self.dgilib_extra.interfaces[interface_id].polling_type
         return polling, power
 
-    def start_polling(self, interface_ids=None):
+    def start_polling(self, interface_ids=None, mode=0, parameter=0):
         """start_polling
 
         Starts polling on the specified interfaces. By default polling will be
@@ -203,12 +471,25 @@ class DGILibLogger(object):
         ----------
         interface_ids : list(int)
             List of interface ids (default: all enabled interfaces)
+
+        mode : int
+            Mode of the power parser, 0 for continuous and 1 for oneshot
+            capturing (default: `0`)
+
+        parameter : int
+            Mode specific parameter of the power parser, the capture time in
+            seconds for oneshot capturing (default: `0`)
+
+        The host time (:func:`time.time`) just before the polling is started
+        is stored in `polling_start_time`.
         """
         polling, power = self.which_polling(interface_ids)
+        # Host time at which the timestamps of the device start
+        self.polling_start_time = time()
         if polling:
             self.dgilib_extra.start_polling()
         if power:
-            self.dgilib_extra.auxiliary_power_start()
+            self.dgilib_extra.auxiliary_power_start(mode, parameter)
 
     def stop_polling(self, interface_ids=None):
         """stop_polling
@@ -0,0 +1,242 @@
+"""This module logs data from multiple DGI devices in parallel."""
+
+from threading import Barrier, BrokenBarrierError, Event, Thread
+from time import sleep, time
+
+from pydgilib.dgilib import DGILib
+from pydgilib_extra.dgilib_extra_config import (
+    LOGGER_CSV, LOGGER_OBJECT, FILE_NAME_BASE)
+from pydgilib_extra.dgilib_extra import DGILibExtra
+
+
+class StartOffset(object):
+    """Shift the data of a device to the common time base.
+
+    Used as the `clock_alignment` of the logger of each device while
+    :meth:`DGILibMulti.log` runs, so the samples are shifted before they are
+    passed to the loggers (and the statistics and pyramids of the data). The
+    `clock_alignment` the logger already had is applied first.
+
+    Parameters
+    ----------
+    clock_alignment : callable or None
+        `clock_alignment` of the logger (default: `None`)
+    """
+
+    def __init__(self, clock_alignment=None):
+        """Instantiate StartOffset object."""
+        self.clock_alignment = clock_alignment
+        self.offset = 0
+
+    def __call__(self, logger_data):
+        """Shift the timestamps of logger_data by `offset` (in place)."""
+        if self.clock_alignment is not None:
+            self.clock_alignment(logger_data)
+        if self.offset:
+            for interface_data in logger_data.values():
+                interface_data.shift(self.offset)
+        return logger_data
+
+
+class DGILibMulti(object):
+    """Log data from multiple DGI devices in parallel.
+
+    Opens a :class:`DGILibExtra` session for each device and runs the
+    acquisition loop of each device in its own thread (the calls to DGILib
+    release the GIL). The start and stop of the loggers are aligned and the
+    timestamps of all devices are shifted to a common host time base.
+
+    :Example:
+
+    >>> with DGILibMulti() as dgilib_multi:
+    ...     data = dgilib_multi.log(1)
+    >>> data.keys()
+    dict_keys([b'ATML3138061800001604', b'ATML3138061800001605'])
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Instantiate DGILibMulti object.
+
+        Parameters
+        ----------
+        device_sns : list(bytes) or None
+            Serial numbers of the devices to use (default: `None`, use all
+            connected devices)
+
+        timeout : float
+            Maximum time to wait for all devices to be ready (default: `10`)
+
+        All other arguments are passed on to :class:`DGILibExtra`.
+        """
+        self.args = args
+        self.kwargs = dict(kwargs)
+        self.device_sns = self.kwargs.pop("device_sns", None)
+        self.timeout = self.kwargs.pop("timeout", 10)
+        self.verbose = self.kwargs.get("verbose", 0)
+
+        if self.device_sns is None:
+            self.device_sns = self.discover_devices()
+
+        # Always log in object, give the csv files of each device their own
+        # name
+        loggers = list(self.kwargs.get(
+            "loggers", DGILibExtra.default_loggers))
+        if LOGGER_OBJECT not in loggers:
+            loggers.append(LOGGER_OBJECT)
+        self.kwargs["loggers"] = loggers
+        file_name_base = self.kwargs.get("file_name_base", FILE_NAME_BASE)
+
+        self.devices = {}
+        for device_sn in self.device_sns:
+            kwargs = dict(self.kwargs, device_sn=device_sn)
+            if LOGGER_CSV in loggers:
+                kwargs["file_name_base"] = \
+                    f"{file_name_base}_{device_sn.decode()}"
+            self.devices[device_sn] = DGILibExtra(*self.args, **kwargs)
+
+        self.data = None
+
+    def __enter__(self):
+        """For usage in ``with DGILibMulti() as dgilib_multi:`` syntax.
+
+        If a session cannot be opened, the sessions that were already opened
+        are closed again before the error is raised.
+        """
+        entered = []
+        try:
+            for device in self.devices.values():
+                device.__enter__()
+                entered.append(device)
+        except BaseException as error:
+            self.exit_devices(
+                entered, type(error), error, error.__traceback__)
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """For usage in ``with DGILibMulti() as dgilib_multi:`` syntax.
+
+        All sessions are closed, the first error is raised after that.
+        """
+        error = self.exit_devices(
+            self.devices.values(), exc_type, exc_value, traceback)
+        if error is not None:
+            raise error
+
+    @staticmethod
+    def exit_devices(devices, exc_type, exc_value, traceback):
+        """Close the sessions of devices, even if closing one fails.
+
+        Returns
+        -------
+        Exception or None
+            The first error raised while closing the sessions.
+        """
+        first_error = None
+        for device in devices:
+            try:
+                device.__exit__(exc_type, exc_value, traceback)
+            except Exception as error:
+                if first_error is None:
+                    first_error = error
+        return first_error
+
+    def discover_devices(self):
+        """Get the serial numbers of all connected devices.
+
+        Returns
+        -------
+        list(bytes)
+            Serial numbers of the connected devices.
+        """
+        dgilib = DGILib(*self.args, **self.kwargs)
+        return dgilib.get_device_serials(dgilib.use_discovery_cache)
+
+    def log(self, duration=10):
+        """Log the data of all devices for the specified amount of time.
+
+        All threads wait for each other before the polling is started, and
+        the polling of all devices is stopped at the same time. The host time
+        just before the polling of each device was started
+        (`DGILibLogger.polling_start_time`) is used to shift its timestamps
+        to the common time base (the start time of the first device). The
+        data is shifted as it is read (see :class:`StartOffset`), so the
+        retention policy, statistics and pyramids of the data of each device
+        are kept.
+
+        Parameters
+        ----------
+        duration : float
+            Amount of time to log data (default: `10`).
+
+        Returns
+        -------
+        dict
+            Dictionary of device serial numbers and :class:`LoggerData`.
+        """
+        barrier = Barrier(len(self.devices) + 1, timeout=self.timeout)
+        stop_event = Event()
+        start_times = {}
+        results = {}
+        errors = []
+        start_offsets = {}
+        for device_sn, device in self.devices.items():
+            start_offsets[device_sn] = StartOffset(
+                device.logger.clock_alignment)
+            device.logger.clock_alignment = start_offsets[device_sn]
+
+        def run(device_sn, device):
+            polling = False
+            try:
+                barrier.wait()
+                polling = True
+                device.logger.start()
+                start_times[device_sn] = device.logger.polling_start_time
+                # Wait until all devices have started
+                barrier.wait()
+                start_offsets[device_sn].offset = \
+                    start_times[device_sn] - min(start_times.values())
+                while not stop_event.is_set():
+                    device.logger.update_callback()
+                polling = False
+                results[device_sn] = device.logger.stop()
+            except BrokenBarrierError:
+                pass
+            except Exception as error:
+                errors.append(error)
+                barrier.abort()
+                stop_event.set()
+            finally:
+                if polling:
+                    device.logger.stop_polling()
+
+        threads = [Thread(target=run, args=item)
+                   for item in self.devices.items()]
+        for thread in threads:
+            thread.start()
+        try:
+            barrier.wait()
+            barrier.wait()
+            end_time = time() + duration
+            while time() < end_time and not stop_event.is_set():
+                sleep(min(0.1, max(end_time - time(), 0)))
+        except BrokenBarrierError:
+            pass
+        finally:
+            stop_event.set()
+            for thread in threads:
+                thread.join()
+            for device_sn, device in self.devices.items():
+                device.logger.clock_alignment = \
+                    start_offsets[device_sn].clock_alignment
+        if errors:
+            raise errors[0]
+
+        self.data = results
+        if self.verbose:
+            for device_sn, logger_data in results.items():
+                print(f"{device_sn}: start offset "
+                      f"{start_offsets[device_sn].offset} s")
+                print(logger_data)
+
+        return self.data
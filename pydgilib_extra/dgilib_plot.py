@@ -4,6 +4,7 @@ import sys
 
 from pydgilib_extra.dgilib_extra_config import *
 from pydgilib_extra.dgilib_calculations import StreamingCalculation
+from pydgilib_extra.dgilib_data import RollingInterfaceData
 #from tests_plot.dgilib_averages import HoldTimes
 
 import matplotlib.pyplot as plt; plt.ion()
@@ -67,13 +68,18 @@ class HoldTimes(StreamingCalculation):
             data_gpio = self.data
         if len(data_gpio.timestamps) <= 1:
             return []  # We can't identify intervals with only one value
-        if self.index > (len(data_gpio.timestamps) - 1):
+        # self.index is absolute, subtract the samples dropped by a rolling
+        # window (see RollingInterfaceData)
+        offset = data_gpio.offset \
+            if isinstance(data_gpio, RollingInterfaceData) else 0
+        index = max(self.index - offset, 0)
+        if index > (len(data_gpio.timestamps) - 1):
             return []  # We're being asked to do an index that does not exist yet, so just skip
 
         hold_times = []
 
         (_, true_to_false_times, false_to_true_times) = self.identify_toggle_times(
-            pin, data_gpio, self.index)
+            pin, data_gpio, index)
 
         #print("T2F: " + str(true_to_false_times))
         #print("F2T: " + str(false_to_true_times))
@@ -112,7 +118,7 @@ class HoldTimes(StreamingCalculation):
 
         try:
             self.index = data_gpio.timestamps.index(
-                hold_times_list[-1][-1]) + 1
+                hold_times_list[-1][-1]) + 1 + offset
         except IndexError:
             # If you remove this, you get an error
             pass
@@ -414,7 +420,13 @@ class DGILibPlot(object):
         self.window_title = kwargs.get("window_title",
                                        "Plot of current (in amperes) and" +
                                        "gpio pins")
-        self.fig.canvas.set_window_title(self.window_title)
+        # Newer versions of matplotlib only have set_window_title on the
+        # figure manager
+        manager = getattr(self.fig.canvas, "manager", None)
+        if manager is not None:
+            manager.set_window_title(self.window_title)
+        else:
+            self.fig.canvas.set_window_title(self.window_title)
 
         self.ax = kwargs.get("ax")
         if self.ax is None:
@@ -800,7 +812,7 @@ class DGILibPlot(object):
             for pin, plot_pin in enumerate(self.plot_pins):
                 if plot_pin:
                     self.ln_pins[pin].set_xdata(
-                        data.gpio.timestamps + extend_gpio * [data.power.timestamps[-1]])
+                        list(data.gpio.timestamps) + extend_gpio * [data.power.timestamps[-1]])
                     self.ln_pins[pin].set_ydata(
                         data.gpio.get_select_in_value(pin) + extend_gpio * [data.gpio.values[-1][pin]])
             self.ax.set_title(f"Logging. Collected {len(data.power)} power samples and {len(data.gpio)} gpio samples.")
@@ -0,0 +1,203 @@
+"""This module keeps DGILib connections open across short sessions."""
+
+import atexit
+from threading import Lock
+
+
+class DGILibConnection(object):
+    """State of a connection that is kept open by :class:`DGILibPool`.
+
+    Attributes
+    ----------
+    session : DGILibExtra
+        The session that uses (or last used) the connection, used to
+        disconnect. Only this session can return the connection to the pool.
+
+    dgi_hndl : c_uint
+        Handle of the connection.
+
+    power_hndl : c_uint or None
+        Handle of the power parser, if it was initialized.
+
+    available_interfaces : list(int)
+        Interfaces of the device (result of `interface_list`).
+
+    timer_factor : float or None
+        Factor to multiply timestamps by to get seconds.
+
+    calibration_valid : bool
+        Whether the Auxiliary Power interface was calibrated on this
+        connection.
+
+    configurations : dict
+        Last applied configuration of the interfaces (see
+        :meth:`DGILibExtra.get_configuration`).
+
+    complete_configurations : set(int)
+        Interfaces of which the whole configuration was read.
+
+    in_use : bool
+        Whether a session is using the connection.
+    """
+
+    def __init__(self, session):
+        """Instantiate DGILibConnection object."""
+        self.session = session
+        self.in_use = True
+        self.store(session)
+
+    def store(self, session):
+        """Store the connection state of `session`."""
+        self.session = session
+        self.dgi_hndl = session.dgi_hndl
+        self.power_hndl = session.power_hndl
+        self.available_interfaces = list(session.available_interfaces)
+        self.timer_factor = session.timer_factor
+        self.calibration_valid = session.calibration_valid
+        self.configurations = {
+            interface_id: dict(configuration) for interface_id, configuration
+            in session.configurations.items()}
+        self.complete_configurations = set(session.complete_configurations)
+
+    def restore(self, session):
+        """Restore the connection state in `session`."""
+        session.dgi_hndl = self.dgi_hndl
+        session.power_hndl = self.power_hndl
+        session.available_interfaces = list(self.available_interfaces)
+        session.timer_factor = self.timer_factor
+        session.calibration_valid = self.calibration_valid
+        session.configurations = {
+            interface_id: dict(configuration) for interface_id, configuration
+            in self.configurations.items()}
+        session.complete_configurations = set(self.complete_configurations)
+
+
+class DGILibPool(object):
+    """Pool of open DGILib connections, keyed by device serial number.
+
+    Setting up a session (`connect`, `interface_list`, `get_time_factor` and
+    calibration) takes much longer than a short measurement. When a
+    :class:`DGILibExtra` session is created with the ``connection_pool``
+    keyword argument, it leases the connection of its device from the pool and
+    only sets up the connection if the pool does not have one. On exit the
+    interfaces are disabled and reset, and the connection is returned to the
+    pool instead of being disconnected.
+
+    Connections are closed with :meth:`close`, which is also called when the
+    interpreter exits for the default pool (`connection_pool`).
+
+    :Example:
+
+    >>> for _ in range(10):
+    ...     with DGILibExtra(connection_pool=True) as dgilib:
+    ...         data = dgilib.logger.log(0.1)
+    >>> connection_pool.close()
+    """
+
+    def __init__(self):
+        """Instantiate DGILibPool object."""
+        self.connections = {}
+        self.lock = Lock()
+
+    def acquire(self, session):
+        """Lease the connection of the device of `session`.
+
+        Parameters
+        ----------
+        session : DGILibExtra
+            Session to lease the connection for, the device is selected with
+            :meth:`DGILib.select_device`.
+
+        Returns
+        -------
+        bool
+            `True` if an open connection was restored in `session`, `False`
+            if the session has to set up the connection itself.
+        """
+        session.select_device()
+        with self.lock:
+            connection = self.connections.get(session.device_sn)
+            if connection is None or connection.in_use:
+                return False
+            connection.in_use = True
+            connection.session = session
+            connection.restore(session)
+        if session.verbose:
+            session.tracer.trace(
+                f"Reusing connection to {session.device_sn}")
+        return True
+
+    def owns(self, session, connection):
+        """Check if `session` is the session that leased `connection`."""
+        return connection.in_use and connection.session is session
+
+    def release(self, session):
+        """Return the connection of `session` to the pool.
+
+        A connection that is leased by another session is not replaced, the
+        session has to close its own connection then.
+
+        Parameters
+        ----------
+        session : DGILibExtra
+            Session of which the interfaces have been disabled and reset.
+
+        Returns
+        -------
+        bool
+            `True` if the connection was returned to the pool, `False` if
+            the session has to close it.
+        """
+        with self.lock:
+            connection = self.connections.get(session.device_sn)
+            if connection is None:
+                connection = self.connections[session.device_sn] = \
+                    DGILibConnection(session)
+            elif self.owns(session, connection):
+                connection.store(session)
+            else:
+                if session.verbose:
+                    session.tracer.trace(
+                        f"Connection to {session.device_sn} is already in "
+                        f"the pool, closing the connection of the session")
+                return False
+            connection.in_use = False
+        return True
+
+    def discard(self, session):
+        """Remove the connection of `session` from the pool.
+
+        Used when the session is closed in an unknown state, the connection
+        itself is closed by the session. The connection of another session
+        is kept.
+        """
+        with self.lock:
+            connection = self.connections.get(session.device_sn)
+            if connection is not None and self.owns(session, connection):
+                del self.connections[session.device_sn]
+
+    def close(self, device_sn=None):
+        """Close the connections that are not in use.
+
+        Parameters
+        ----------
+        device_sn : bytes or None
+            Serial number of the device to close the connection of (default:
+            `None`, close all connections).
+        """
+        with self.lock:
+            device_sns = [
+                sn for sn, connection in self.connections.items()
+                if not connection.in_use and device_sn in (None, sn)]
+            connections = [self.connections.pop(sn) for sn in device_sns]
+        for connection in connections:
+            session = connection.session
+            connection.restore(session)
+            if session.power_hndl is not None:
+                session.auxiliary_power_uninitialize()
+                session.power_hndl = None
+            session.disconnect()
+
+
+connection_pool = DGILibPool()
+atexit.register(connection_pool.close)
@@ -0,0 +1,282 @@
+"""This module provides downsampled views of DGILib Interface Data."""
+
+import json
+import sys
+from array import array
+from bisect import bisect_left
+from math import ceil, floor, inf
+
+from pydgilib_extra.dgilib_data import InterfaceData
+
+# Width of the finest buckets in seconds (a power of two)
+BASE_RESOLUTION = 2 ** -8
+# First bytes of a saved pyramid file
+PYRAMID_MAGIC = b"DGIPYR1\n"
+
+
+class PyramidLevel(object):
+    """Min, max, sum and count of the values per bucket of one level."""
+
+    __slots__ = ['mins', 'maxs', 'sums', 'counts']
+
+    def __init__(self):
+        """Instantiate PyramidLevel object."""
+        self.mins = array("d")
+        self.maxs = array("d")
+        self.sums = array("d")
+        self.counts = array("Q")
+
+    def __len__(self):
+        """Get the number of buckets."""
+        return len(self.counts)
+
+    def grow(self, length):
+        """Add empty buckets until the level has `length` buckets."""
+        missing = length - len(self.counts)
+        if missing > 0:
+            self.mins.extend([inf] * missing)
+            self.maxs.extend([-inf] * missing)
+            self.sums.extend([0.0] * missing)
+            self.counts.extend([0] * missing)
+
+    def add(self, bucket, minimum, maximum, total, count):
+        """Add the summary of some values to a bucket."""
+        if minimum < self.mins[bucket]:
+            self.mins[bucket] = minimum
+        if maximum > self.maxs[bucket]:
+            self.maxs[bucket] = maximum
+        self.sums[bucket] += total
+        self.counts[bucket] += count
+
+    def arrays(self):
+        """Get the arrays of the level."""
+        return (self.mins, self.maxs, self.sums, self.counts)
+
+
+class InterfacePyramid(object):
+    """Multi-resolution summary of the values of an interface.
+
+    The timeline is divided in buckets of `base_resolution` seconds, and
+    every next level has buckets twice as wide. Each bucket keeps the min,
+    max, sum and count of the values in it, so a plot or a trend over hours
+    can read a few thousand buckets instead of all samples (see
+    :meth:`query`).
+
+    The pyramid is updated with each chunk of new data (see :meth:`update`).
+    The values of a chunk are summarized per bucket of the finest level, and
+    only the buckets that changed are updated in the coarser levels. Levels
+    are added as the capture grows.
+
+    Attributes
+    ----------
+    origin : float or None
+        Start time of the first bucket (a multiple of `base_resolution`).
+
+    levels : list(PyramidLevel)
+        Levels from fine to coarse, the buckets of level `n` are
+        ``base_resolution * 2 ** n`` seconds wide.
+    """
+
+    def __init__(self, interface_data=None, base_resolution=BASE_RESOLUTION):
+        """Instantiate InterfacePyramid object.
+
+        Parameters
+        ----------
+        interface_data : InterfaceData or None
+            Samples to start with (default: `None`)
+
+        base_resolution : float
+            Width of the finest buckets in seconds, should be a power of two
+            (default: `BASE_RESOLUTION`)
+        """
+        self.base_resolution = base_resolution
+        self.origin = None
+        self.levels = [PyramidLevel()]
+        if interface_data is not None:
+            self.update(interface_data)
+
+    def resolution(self, level):
+        """Get the width of the buckets of a level in seconds."""
+        return self.base_resolution * 2 ** level
+
+    def update(self, interface_data):
+        """Add the samples of a chunk of new data.
+
+        Parameters
+        ----------
+        interface_data : InterfaceData
+            New samples, newer than the samples added before.
+        """
+        timestamps = interface_data.timestamps
+        values = interface_data.values
+        if not len(timestamps):
+            return self
+        if not isinstance(timestamps, list):
+            timestamps = list(timestamps)
+            values = list(values)
+        if self.origin is None:
+            self.origin = floor(timestamps[0] / self.base_resolution) * \
+                self.base_resolution
+
+        # Summarize the values per bucket of the finest level
+        level = self.levels[0]
+        width = self.base_resolution
+        first_bucket = self.bucket(timestamps[0])
+        last_bucket = self.bucket(timestamps[-1])
+        level.grow(last_bucket + 1)
+        start = 0
+        length = len(timestamps)
+        for bucket in range(first_bucket, last_bucket + 1):
+            end = length if bucket == last_bucket else bisect_left(
+                timestamps, self.origin + (bucket + 1) * width, start)
+            if end > start:
+                chunk = values[start:end]
+                level.add(bucket, min(chunk), max(chunk), sum(chunk),
+                          end - start)
+                start = end
+
+        # Update the buckets of the coarser levels that changed, a new level
+        # is filled from the start
+        number = 0
+        while len(self.levels[number]) > 1:
+            number += 1
+            if number == len(self.levels):
+                self.levels.append(PyramidLevel())
+                first_bucket = 0
+            else:
+                first_bucket >>= 1
+            last_bucket >>= 1
+            fine = self.levels[number - 1]
+            coarse = self.levels[number]
+            coarse.grow(last_bucket + 1)
+            for bucket in range(first_bucket, last_bucket + 1):
+                coarse.mins[bucket] = inf
+                coarse.maxs[bucket] = -inf
+                coarse.sums[bucket] = 0.0
+                coarse.counts[bucket] = 0
+                for child in (2 * bucket, 2 * bucket + 1):
+                    if child < len(fine) and fine.counts[child]:
+                        coarse.add(bucket, fine.mins[child],
+                                   fine.maxs[child], fine.sums[child],
+                                   fine.counts[child])
+        return self
+
+    def bucket(self, timestamp, level=0):
+        """Get the index of the bucket of a timestamp."""
+        return int((timestamp - self.origin) // self.resolution(level))
+
+    def select_level(self, start_time=None, end_time=None, resolution=None,
+                     max_buckets=None):
+        """Get the finest level that satisfies the resolution constraints.
+
+        Parameters
+        ----------
+        start_time, end_time : float or None
+            Time range of the query (default: `None`, all buckets)
+
+        resolution : float or None
+            Minimum width of the buckets in seconds (default: `None`)
+
+        max_buckets : int or None
+            Maximum number of buckets between `start_time` and `end_time`
+            (default: `None`)
+
+        Returns
+        -------
+        int
+            Number of the level.
+        """
+        if self.origin is None:
+            return 0
+        if start_time is None:
+            start_time = self.origin
+        if end_time is None:
+            end_time = self.origin + len(self.levels[0]) * self.base_resolution
+        for number in range(len(self.levels)):
+            width = self.resolution(number)
+            if resolution is not None and width < resolution:
+                continue
+            if max_buckets is not None and \
+                    (end_time - start_time) / width > max_buckets:
+                continue
+            return number
+        return len(self.levels) - 1
+
+    def query(self, start_time=None, end_time=None, resolution=None,
+              max_buckets=None):
+        """Get the buckets of a time range at a resolution.
+
+        Returns the buckets that overlap ``start_time <= timestamp <
+        end_time``. The level is chosen with :meth:`select_level`, e.g. use
+        ``max_buckets`` of about the width of a plot in pixels. Empty buckets
+        are left out.
+
+        :Example:
+
+        >>> overview = data.pyramids[INTERFACE_POWER].query(max_buckets=2000)
+        >>> means = overview.get_select_in_value(1)
+
+        Returns
+        -------
+        InterfaceData
+            Start times of the buckets and values of ``[min, mean, max]``
+            per bucket.
+        """
+        interface_data = InterfaceData()
+        if self.origin is None:
+            return interface_data
+        number = self.select_level(start_time, end_time, resolution,
+                                   max_buckets)
+        level = self.levels[number]
+        width = self.resolution(number)
+        first_bucket = 0 if start_time is None else \
+            max(self.bucket(start_time, number), 0)
+        last_bucket = len(level) if end_time is None else \
+            min(ceil((end_time - self.origin) / width), len(level))
+        for bucket in range(first_bucket, last_bucket):
+            count = level.counts[bucket]
+            if count:
+                interface_data.timestamps.append(
+                    self.origin + bucket * width)
+                interface_data.values.append([
+                    level.mins[bucket], level.sums[bucket] / count,
+                    level.maxs[bucket]])
+        return interface_data
+
+    def save(self, file_path):
+        """Save the pyramid to a file.
+
+        The file has a header line with the parameters and the lengths of the
+        levels (json) followed by the raw arrays of the levels.
+        """
+        header = {
+            "base_resolution": self.base_resolution,
+            "origin": self.origin,
+            "byteorder": sys.byteorder,
+            "levels": [len(level) for level in self.levels],
+        }
+        with open(file_path, "wb") as pyramid_file:
+            pyramid_file.write(PYRAMID_MAGIC)
+            pyramid_file.write(json.dumps(header).encode() + b"\n")
+            for level in self.levels:
+                for level_array in level.arrays():
+                    level_array.tofile(pyramid_file)
+
+    @classmethod
+    def load(cls, file_path):
+        """Load a pyramid that was saved with :meth:`save`."""
+        with open(file_path, "rb") as pyramid_file:
+            if pyramid_file.readline() != PYRAMID_MAGIC:
+                raise ValueError(f"{file_path} is not a pyramid file.")
+            header = json.loads(pyramid_file.readline())
+            pyramid = cls(base_resolution=header["base_resolution"])
+            pyramid.origin = header["origin"]
+            pyramid.levels = []
+            for length in header["levels"]:
+                level = PyramidLevel()
+                for level_array in level.arrays():
+                    level_array.fromfile(pyramid_file, length)
+                    if header["byteorder"] != sys.byteorder:
+                        level_array.byteswap()
+                pyramid.levels.append(level)
+        return pyramid
@@ -0,0 +1,290 @@
+"""This module provides DGILib Logger Data in shared memory."""
+
+import struct
+import sys
+from array import array
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+from pydgilib.dgilib_config import INTERFACE_GPIO
+from pydgilib_extra.dgilib_extra_config import INTERFACE_POWER, NUM_PINS
+from pydgilib_extra.dgilib_extra_exceptions import SharedDataFullError
+from pydgilib_extra.dgilib_data import InterfaceData, LoggerData
+
+# Default number of samples per interface
+SHARED_CAPACITY = 1 << 20
+# Header of the segment: magic and number of interfaces
+SHARED_MAGIC = b"DGISHM1\0"
+_HEADER = struct.Struct("<8sQ")
+# Entry per interface: interface id, pins per sample (0 for float values),
+# capacity, number of samples and offset of the arrays in the segment
+_ENTRY = struct.Struct("<qQQQQ")
+# Offset of the number of samples in an entry
+_COUNT_OFFSET = 24
+
+
+def attach_shared_memory(name):
+    """Attach to an existing shared memory segment.
+
+    The segment is not registered with the resource tracker of this
+    process, so it is not removed when a consumer exits. The producer that
+    created it unlinks it.
+    """
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+    # Python < 3.13 always registers the segment
+    shared_memory = SharedMemory(name=name)
+    resource_tracker.unregister(shared_memory._name, "shared_memory")
+    return shared_memory
+
+
+class SharedInterfaceData(InterfaceData):
+    """Class to store DGILib Logger Interface Data in shared memory.
+
+    The timestamps and values are stored in preallocated arrays inside a
+    segment of :class:`SharedLoggerData`, with the number of samples in its
+    header. The producer appends samples (the arrays first, then the
+    number), consumers see the samples up to the number they read.
+    `timestamps` (and float `values`) are read-only views into the segment,
+    GPIO pin values are stored as one bit mask per sample.
+    """
+
+    __slots__ = ['buffer', 'entry', 'pins', 'capacity', 'readonly',
+                 '_timestamps', '_values', '_count', '_cache']
+
+    def __init__(self, buffer, entry, readonly=False):
+        """Take the buffer of the segment and the offset of the entry.
+
+        Parameters
+        ----------
+        buffer : memoryview
+            Buffer of the shared memory segment.
+
+        entry : int
+            Offset of the entry of the interface in the header.
+
+        readonly : bool
+            Do not allow appending samples (default: `False`)
+        """
+        self.buffer = buffer
+        self.entry = entry
+        self.readonly = readonly
+        _, self.pins, self.capacity, _, offset = _ENTRY.unpack_from(
+            buffer, entry)
+        size = 8 * self.capacity
+        self._timestamps = buffer[offset:offset + size].cast("d")
+        self._values = buffer[offset + size:offset + 2 * size].cast(
+            "Q" if self.pins else "d")
+        self._count = buffer[entry + _COUNT_OFFSET:
+                             entry + _COUNT_OFFSET + 8].cast("Q")
+        self._cache = (0, [])
+
+    def __len__(self):
+        """Get the number of samples."""
+        return self._count[0]
+
+    @property
+    def timestamps(self):
+        """Timestamps of the samples (read-only view)."""
+        return self._timestamps[:self._count[0]].toreadonly()
+
+    @property
+    def values(self):
+        """Values of the samples (read-only view or list of pin values)."""
+        count = self._count[0]
+        if not self.pins:
+            return self._values[:count].toreadonly()
+        # Decode the new bit masks only
+        decoded, pin_values = self._cache
+        if decoded < count:
+            pins = range(self.pins)
+            pin_values = pin_values + [
+                [bool(mask >> pin & 1) for pin in pins]
+                for mask in self._values[decoded:count]]
+            self._cache = (count, pin_values)
+        return pin_values[:count]
+
+    def __iter__(self):
+        """Iterate over the samples.
+
+        Used to provide `for timestamp, value in interface_data` syntax
+        """
+        return zip(self.timestamps, self.values)
+
+    def __getitem__(self, index):
+        """Get item.
+
+        Used to provide `timestamp, value = interface_data[5]` and
+        `timestamp, value = interface_data[2:5]` syntax
+        """
+        timestamps = self.timestamps[index]
+        values = self.values[index]
+        if isinstance(index, slice):
+            return (timestamps.tolist(), list(values))
+        return (timestamps, values)
+
+    def __iadd__(self, interface_data):
+        """Append new interface_data (in-place).
+
+        Used to provide `interface_data += interface_data1` syntax
+        """
+        if self.readonly:
+            raise PermissionError("SharedInterfaceData is attached read-only.")
+        if not isinstance(interface_data, InterfaceData):
+            interface_data = InterfaceData() + interface_data
+        count = self._count[0]
+        new = len(interface_data)
+        if count + new > self.capacity:
+            raise SharedDataFullError(
+                f"SharedInterfaceData can hold {self.capacity} samples, got "
+                f"{count + new}.")
+        self._timestamps[count:count + new] = array(
+            "d", interface_data.timestamps)
+        if self.pins:
+            self._values[count:count + new] = array("Q", [
+                sum(1 << pin for pin, value in enumerate(pin_values)
+                    if value) for pin_values in interface_data.values])
+        else:
+            self._values[count:count + new] = array(
+                "d", interface_data.values)
+        # Publish the samples after they are written
+        self._count[0] = count + new
+        return self
+
+    def __reduce_ex__(self, protocol):
+        """Pickle a copy of the samples as :class:`InterfaceData`."""
+        return (InterfaceData, (self.timestamps.tolist(), list(self.values)))
+
+    def release(self):
+        """Release the views into the segment."""
+        for view in (self._timestamps, self._values, self._count):
+            view.release()
+
+
+class SharedLoggerData(LoggerData):
+    """Class to store DGILib Logger Data in shared memory.
+
+    All interfaces are stored in one :class:`SharedMemory` segment. It starts
+    with a header that describes the arrays of each interface (see
+    :class:`SharedInterfaceData`) and their number of samples, so another
+    process can attach to the segment by its name and read the samples while
+    they are logged, without copying them through a pipe.
+
+    :Example:
+
+    >>> data = SharedLoggerData(capacity=10 ** 7)  # Producer
+    >>> data.extend(INTERFACE_POWER, dgilib.interfaces[INTERFACE_POWER].read())
+    >>> shared = SharedLoggerData.attach(data.name)  # Consumer
+    >>> len(shared.power)
+
+    Pickling sends the name of the segment, so the data can be passed to a
+    :class:`multiprocessing.Process` or a process pool, which attaches to it
+    read-only. The producer has to :meth:`unlink` the segment when it is no
+    longer used.
+    """
+
+    def __init__(self, interfaces=None, capacity=SHARED_CAPACITY, name=None,
+                 create=True, readonly=False):
+        """Create (or attach to) a shared memory segment.
+
+        Parameters
+        ----------
+        interfaces : list(int) or None
+            Interface ids to store (default: `None`, GPIO and power)
+
+        capacity : int or dict
+            Number of samples per interface, or a dict of interface ids and
+            numbers of samples (default: `SHARED_CAPACITY`)
+
+        name : str or None
+            Name of the segment (default: `None`, a unique name when it is
+            created)
+
+        create : bool
+            Create a new segment, else attach to the segment `name`
+            (default: `True`)
+
+        readonly : bool
+            Do not allow appending samples (default: `False`)
+        """
+        LoggerData.__init__(self, {})
+        if create:
+            if interfaces is None:
+                interfaces = [INTERFACE_GPIO, INTERFACE_POWER]
+            offset = _HEADER.size + _ENTRY.size * len(interfaces)
+            entries = []
+            for interface in interfaces:
+                samples = capacity.get(interface, SHARED_CAPACITY) \
+                    if isinstance(capacity, dict) else capacity
+                pins = NUM_PINS if interface == INTERFACE_GPIO else 0
+                entries.append((interface, pins, samples, 0, offset))
+                offset += 16 * samples
+            shared_memory = SharedMemory(name=name, create=True, size=offset)
+            _HEADER.pack_into(shared_memory.buf, 0, SHARED_MAGIC,
+                              len(entries))
+            for number, entry in enumerate(entries):
+                _ENTRY.pack_into(shared_memory.buf,
+                                 _HEADER.size + _ENTRY.size * number, *entry)
+        else:
+            shared_memory = attach_shared_memory(name)
+        object.__setattr__(self, "shared_memory", shared_memory)
+        object.__setattr__(self, "readonly", readonly)
+
+        magic, number = _HEADER.unpack_from(shared_memory.buf)
+        if magic != SHARED_MAGIC:
+            raise ValueError(
+                f"Shared memory {shared_memory.name} is not SharedLoggerData.")
+        for entry in range(_HEADER.size, _HEADER.size + _ENTRY.size * number,
+                           _ENTRY.size):
+            interface = _ENTRY.unpack_from(shared_memory.buf, entry)[0]
+            self[interface] = SharedInterfaceData(
+                shared_memory.buf, entry, readonly)
+
+    @classmethod
+    def attach(cls, name, readonly=True):
+        """Attach to the segment of a SharedLoggerData in another process.
+
+        Parameters
+        ----------
+        name : str
+            Name of the segment (`SharedLoggerData.name`).
+
+        readonly : bool
+            Do not allow appending samples (default: `True`)
+        """
+        return cls(name=name, create=False, readonly=readonly)
+
+    @property
+    def name(self):
+        """Name of the shared memory segment."""
+        return self.shared_memory.name
+
+    def __reduce_ex__(self, protocol):
+        """Pickle the name of the segment, unpickling attaches read-only."""
+        return (SharedLoggerData.attach, (self.name,))
+
+    def close(self):
+        """Close the segment in this process."""
+        for interface_data in self.values():
+            if isinstance(interface_data, SharedInterfaceData):
+                interface_data.release()
+        self.clear()
+        self.shared_memory.close()
+
+    def unlink(self):
+        """Remove the segment (call once, in the producer)."""
+        if sys.version_info < (3, 13):
+            # Attaching in this process (or a child) unregistered the name
+            resource_tracker.register(self.shared_memory._name,
+                                      "shared_memory")
+        self.shared_memory.unlink()
+
+    def __enter__(self):
+        """For usage in ``with SharedLoggerData() as data:`` syntax."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close the segment, and remove it if it was created here."""
+        self.close()
+        if not self.readonly:
+            self.unlink()
@@ -0,0 +1,348 @@
+"""This module provides streaming statistics of DGILib Interface Data."""
+
+from math import asin, inf, pi, sin, sqrt
+
+# Size of QuantileSketch, it keeps at most this many centroids
+COMPRESSION = 100
+
+
+class QuantileSketch(object):
+    """Approximate quantiles of a stream of values.
+
+    A merging digest (like the t-digest): the values are kept in a small
+    number of weighted centroids. Centroids near the median may hold many
+    values, centroids in the tails only a few, so the extreme quantiles
+    stay accurate. New values are buffered and merged into the centroids in
+    one sorted pass when the buffer is full.
+
+    Parameters
+    ----------
+    compression : int
+        Size of the sketch, the rank error of the quantiles is roughly
+        `1 / compression` (default: `COMPRESSION`)
+    """
+
+    def __init__(self, compression=COMPRESSION):
+        """Instantiate QuantileSketch object."""
+        self.compression = compression
+        self.means = []
+        self.weights = []
+        self.buffer = []
+        self.count = 0
+        self.min = inf
+        self.max = -inf
+
+    def update(self, values):
+        """Add values to the sketch."""
+        values = list(values)
+        if not values:
+            return self
+        self.count += len(values)
+        self.min = min(self.min, min(values))
+        self.max = max(self.max, max(values))
+        self.buffer.extend(values)
+        if len(self.buffer) >= 10 * self.compression:
+            self.compress()
+        return self
+
+    def merge(self, sketch):
+        """Add the values of another sketch to this sketch."""
+        if not sketch.count:
+            return self
+        sketch.compress()
+        self.compress()
+        self.count += sketch.count
+        self.min = min(self.min, sketch.min)
+        self.max = max(self.max, sketch.max)
+        self._merge(sorted(zip(self.means + sketch.means,
+                               self.weights + sketch.weights)))
+        return self
+
+    def compress(self):
+        """Merge the buffered values into the centroids."""
+        if self.buffer:
+            self.buffer.sort()
+            centroids = list(zip(self.means, self.weights))
+            centroids.extend(zip(self.buffer, [1] * len(self.buffer)))
+            centroids.sort()
+            self.buffer = []
+            self._merge(centroids)
+
+    def _merge(self, centroids):
+        """Merge sorted centroids into `self.means` and `self.weights`.
+
+        Neighbouring centroids are combined as long as the combined centroid
+        spans at most one unit of the scale function
+        ``compression / (2 pi) * asin(2 q - 1)`` (of the t-digest).
+        """
+        total = sum(weight for _, weight in centroids)
+        scale = self.compression / (2 * pi)
+        means = []
+        weights = []
+        mean, weight = centroids[0]
+        cumulative = 0
+        limit = total * self._quantile_limit(0, scale)
+        for next_mean, next_weight in centroids[1:]:
+            merged = weight + next_weight
+            if cumulative + merged <= limit:
+                mean += (next_mean - mean) * next_weight / merged
+                weight = merged
+            else:
+                means.append(mean)
+                weights.append(weight)
+                cumulative += weight
+                limit = total * self._quantile_limit(
+                    cumulative / total, scale)
+                mean, weight = next_mean, next_weight
+        means.append(mean)
+        weights.append(weight)
+        self.means = means
+        self.weights = weights
+
+    @staticmethod
+    def _quantile_limit(quantile, scale):
+        """Get the largest quantile a centroid starting at quantile spans."""
+        k = scale * asin(2 * quantile - 1) + 1
+        if k >= scale * pi / 2:
+            return 1
+        return (sin(k / scale) + 1) / 2
+
+    def quantile(self, quantile):
+        """Get the approximate value at a quantile (between 0 and 1).
+
+        Returns
+        -------
+        float
+            Value at the quantile, `nan` if the sketch is empty.
+        """
+        if not self.count:
+            return float("nan")
+        self.compress()
+        if quantile <= 0:
+            return self.min
+        if quantile >= 1:
+            return self.max
+        target = quantile * self.count
+        # Interpolate between the centers of the centroids
+        previous_mean, previous_center = self.min, 0
+        center = 0
+        for mean, weight in zip(self.means, self.weights):
+            center += weight / 2
+            if target < center:
+                if center == previous_center:
+                    return mean
+                return previous_mean + (mean - previous_mean) * \
+                    (target - previous_center) / (center - previous_center)
+            previous_mean, previous_center = mean, center
+            center += weight / 2
+        return previous_mean + (self.max - previous_mean) * \
+            (target - previous_center) / max(self.count - previous_center, 1)
+
+
+class InterfaceStatistics(object):
+    """Streaming statistics of the values of an interface.
+
+    Updated with each chunk of new samples (see :meth:`update`), so the
+    statistics of a capture can be read at any time without going over the
+    samples again. Statistics of windows (chunks or captures) can be
+    combined with :meth:`merge` or ``+``.
+
+    The time-weighted mean integrates the values with the same left Riemann
+    sum as :func:`power_and_time_per_pulse`: each value is weighted by the
+    time since the previous sample.
+
+    Attributes
+    ----------
+    count : int
+        Number of samples.
+
+    min, max : float
+        Smallest and largest value.
+
+    first_timestamp, last_timestamp : float or None
+        Timestamps of the first and last sample.
+
+    integral : float
+        Sum of the values times the time since the previous sample (the
+        charge in Coulomb for current samples).
+
+    quantiles : QuantileSketch
+        Sketch of the distribution of the values.
+    """
+
+    def __init__(self, interface_data=None, compression=COMPRESSION):
+        """Instantiate InterfaceStatistics object.
+
+        Parameters
+        ----------
+        interface_data : InterfaceData or None
+            Samples to start with (default: `None`)
+
+        compression : int
+            Size of the quantile sketch (default: `COMPRESSION`)
+        """
+        self.count = 0
+        self.sum = 0.0
+        self.sum_squares = 0.0
+        self._mean = 0.0
+        self._moment = 0.0
+        self.min = inf
+        self.max = -inf
+        self.first_timestamp = None
+        self.first_value = None
+        self.last_timestamp = None
+        self.integral = 0.0
+        self.quantiles = QuantileSketch(compression)
+        if interface_data is not None:
+            self.update(interface_data)
+
+    def update(self, interface_data):
+        """Add the samples of a chunk of new data.
+
+        Parameters
+        ----------
+        interface_data : InterfaceData
+            New samples, newer than the samples added before.
+        """
+        values = interface_data.values
+        count = len(values)
+        if not count:
+            return self
+        timestamps = interface_data.timestamps
+        chunk_sum = sum(values)
+        chunk_mean = chunk_sum / count
+        chunk_moment = sum((value - chunk_mean) ** 2 for value in values)
+        self.sum_squares += sum(value * value for value in values)
+        self._add_moments(count, chunk_sum, chunk_mean, chunk_moment)
+        self.min = min(self.min, min(values))
+        self.max = max(self.max, max(values))
+
+        previous = self.last_timestamp
+        integral = 0.0
+        for timestamp, value in zip(timestamps, values):
+            if previous is not None:
+                integral += value * (timestamp - previous)
+            previous = timestamp
+        self.integral += integral
+        if self.first_timestamp is None:
+            self.first_timestamp = timestamps[0]
+            self.first_value = values[0]
+        self.last_timestamp = previous
+
+        self.quantiles.update(values)
+        return self
+
+    def _add_moments(self, count, chunk_sum, chunk_mean, chunk_moment):
+        """Combine the mean and variance with the ones of another window."""
+        total = self.count + count
+        delta = chunk_mean - self._mean
+        self._moment += chunk_moment + delta * delta * self.count * count / \
+            total
+        self._mean += delta * count / total
+        self.count = total
+        self.sum += chunk_sum
+
+    def merge(self, statistics):
+        """Add the statistics of the next window (in-place).
+
+        The window of `statistics` has to start after the window of these
+        statistics. The time between the two windows is weighted with the
+        first value of the next window.
+        """
+        if not statistics.count:
+            return self
+        self.sum_squares += statistics.sum_squares
+        self._add_moments(statistics.count, statistics.sum,
+                          statistics._mean, statistics._moment)
+        self.min = min(self.min, statistics.min)
+        self.max = max(self.max, statistics.max)
+        self.integral += statistics.integral
+        if self.first_timestamp is None:
+            self.first_timestamp = statistics.first_timestamp
+            self.first_value = statistics.first_value
+        else:
+            self.integral += statistics.first_value * (
+                statistics.first_timestamp - self.last_timestamp)
+        self.last_timestamp = statistics.last_timestamp
+        self.quantiles.merge(statistics.quantiles)
+        return self
+
+    __iadd__ = merge
+
+    def __add__(self, statistics):
+        """Combine the statistics of two windows (copy).
+
+        Used to provide `statistics = statistics1 + statistics2` syntax
+        """
+        combined = InterfaceStatistics(
+            compression=self.quantiles.compression)
+        combined.merge(self)
+        combined.merge(statistics)
+        return combined
+
+    @property
+    def mean(self):
+        """Mean of the values."""
+        return self._mean if self.count else float("nan")
+
+    @property
+    def variance(self):
+        """Variance of the values."""
+        return self._moment / self.count if self.count else float("nan")
+
+    @property
+    def std(self):
+        """Standard deviation of the values."""
+        return sqrt(self.variance)
+
+    @property
+    def rms(self):
+        """Root mean square of the values."""
+        return sqrt(self.sum_squares / self.count) if self.count else \
+            float("nan")
+
+    @property
+    def duration(self):
+        """Time between the first and the last sample."""
+        if self.first_timestamp is None:
+            return 0.0
+        return self.last_timestamp - self.first_timestamp
+
+    @property
+    def time_weighted_mean(self):
+        """Mean of the values weighted by the time between the samples."""
+        return self.integral / self.duration if self.duration else \
+            self.mean
+
+    def quantile(self, quantile):
+        """Get the approximate value at a quantile (between 0 and 1)."""
+        return self.quantiles.quantile(quantile)
+
+    def summary(self, quantiles=(0.5, 0.9, 0.99)):
+        """Get the statistics as a dictionary.
+
+        Parameters
+        ----------
+        quantiles : tuple(float)
+            Quantiles to include, as ``"p50"`` etc. (default:
+            ``(0.5, 0.9, 0.99)``)
+
+        Returns
+        -------
+        dict
+            Dictionary with the count, mean, time-weighted mean, RMS,
+            standard deviation, min, max, duration and the quantiles.
+        """
+        summary = {
+            "count": self.count,
+            "mean": self.mean,
+            "time_weighted_mean": self.time_weighted_mean,
+            "rms": self.rms,
+            "std": self.std,
+            "min": self.min,
+            "max": self.max,
+            "duration": self.duration,
+        }
+        for quantile in quantiles:
+            summary[f"p{quantile * 100:g}"] = self.quantile(quantile)
+        return summary
@@ -26,6 +26,10 @@ setup(
             "ATPOWERDEBUGGER"
     ],
     zip_safe=False,
+    entry_points={
+        "console_scripts": [
+            "pydgilib-log = pydgilib_extra.dgilib_cli:main",
+            "pydgilib-batch = pydgilib_extra.dgilib_batch:main"]},
     setup_requires=[
         # ... (other setup requirements)
     ] + pytest_runner,
@@ -1,12 +1,254 @@
-"""This module holds the benchmark tests for DGILibExtra."""
+"""This module holds the benchmark tests for DGILibExtra.
+
+The acquisition benchmarks run against :class:`DGILibSimulator` with a
+manual clock, so every call handles the same number of samples. The
+throughput in samples per second is stored in the `extra_info` of each
+benchmark, and the tests fail if it drops below the `min_samples_per_second`
+floor. Compare against a saved run to catch smaller regressions, like:
+
+``pytest tests/test_benchmarks.py --benchmark-compare
+--benchmark-compare-fail=mean:20%``
+"""
+
+from os import path
+
+import matplotlib
+import pytest
 
-from pydgilib_extra.dgilib_data import LoggerData
 from pydgilib.dgilib_config import INTERFACE_GPIO
-from pydgilib_extra.dgilib_extra_config import INTERFACE_POWER
+from pydgilib.dgilib_simulator import DGILibSimulator
+from pydgilib_extra.dgilib_calculations import (
+    power_and_time_per_pulse, rise_and_fall_times, calculate_average)
+from pydgilib_extra import dgilib_data
+from pydgilib_extra.dgilib_data import (
+    InterfaceData, LoggerData, TickInterfaceData)
+from pydgilib_extra.dgilib_extra import DGILibExtra
+from pydgilib_extra.dgilib_extra_config import (
+    INTERFACE_POWER, LOGGER_CSV, LOGGER_OBJECT, LOGGER_PLOT)
+
+matplotlib.use("Agg")
 
 num_iterations = 1000
 num_values = 1000
 
+# Simulated rates and the amount of time that passes between reads
+gpio_rate = 10000
+power_rate = 62500
+read_interval = 0.1
+rounds = 20
+
+# Lower bounds of the throughput, far below the expected values so they only
+# catch severe regressions
+min_samples_per_second = {
+    "interface_read_data": 5e3,
+    "gpio_read": 5e3,
+    "gpio_timestamps": 1e6,
+    "power_read_buffer": 2e5,
+    "update_callback": 5e3,
+    # Redraws the whole plot every call
+    "update_callback_plot": 1e2,
+    "csv_read_file": 2e4,
+    "calculations": 2e4,
+    "contains": 1e6,
+}
+
+
+class ManualClock(object):
+    """Clock for DGILibSimulator that only advances when told to."""
+
+    def __init__(self):
+        """Instantiate ManualClock object."""
+        self.time = 0
+
+    def __call__(self):
+        """Get the time."""
+        return self.time
+
+
+def report_throughput(benchmark, name, samples):
+    """Store the throughput of the benchmark and check the lower bound.
+
+    With ``--benchmark-disable`` the function only ran once to check that it
+    works, there are no timings to check.
+    """
+    if benchmark.disabled:
+        return
+    samples_per_second = samples / benchmark.stats.stats.mean
+    benchmark.extra_info["samples_per_call"] = samples
+    benchmark.extra_info["samples_per_second"] = samples_per_second
+    assert samples_per_second > min_samples_per_second[name]
+
+
+@pytest.fixture
+def simulated(tmp_path):
+    """Get a function that opens a DGILibExtra session on a simulator."""
+    sessions = []
+
+    def open_session(**kwargs):
+        simulator = DGILibSimulator(
+            calibration_time=0, gpio_rate=gpio_rate, power_rate=power_rate)
+        clock = simulator.clock = ManualClock()
+        config = dict(loggers=[LOGGER_OBJECT], calibration_cache_file=None,
+                      power_buffer_size=100000, log_folder=str(tmp_path))
+        config.update(kwargs)
+        dgilib = DGILibExtra(simulator, **config)
+        dgilib.__enter__()
+        sessions.append(dgilib)
+        device = simulator.devices[0]
+
+        def advance():
+            """Generate the samples of the next read interval."""
+            clock.time += read_interval
+            device.generate_gpio(clock.time)
+            device.generate_power(clock.time)
+
+        return dgilib, advance
+
+    yield open_session
+
+    for dgilib in sessions:
+        dgilib.__exit__(None, None, None)
+
+
+def simulated_logger_data(duration=1):
+    """Log `duration` seconds of simulated data."""
+    simulator = DGILibSimulator(
+        calibration_time=0, gpio_rate=gpio_rate, power_rate=power_rate)
+    clock = simulator.clock = ManualClock()
+    with DGILibExtra(simulator, loggers=[LOGGER_OBJECT],
+                     calibration_cache_file=None) as dgilib:
+        dgilib.logger.start()
+        clock.time += duration
+        return dgilib.logger.stop()
+
+
+def test_interface_read_data(benchmark, simulated):
+    """Benchmark DGILib.interface_read_data."""
+    dgilib, advance = simulated()
+    dgilib.logger.start()
+    ticks, _ = benchmark.pedantic(
+        dgilib.interface_read_data, (INTERFACE_GPIO,), setup=advance,
+        rounds=rounds)
+    dgilib.logger.stop()
+
+    assert len(ticks) == gpio_rate * read_interval
+    report_throughput(benchmark, "interface_read_data", len(ticks))
+
+
+def test_gpio_read(benchmark, simulated):
+    """Benchmark DGILibInterfaceGPIO.read."""
+    dgilib, advance = simulated()
+    dgilib.logger.start()
+    samples = gpio_rate * read_interval
+    benchmark.pedantic(
+        dgilib.interfaces[INTERFACE_GPIO].read, setup=advance, rounds=rounds)
+    dgilib.logger.stop()
+
+    report_throughput(benchmark, "gpio_read", samples)
+
+
+@pytest.mark.parametrize("use_numpy", (True, False),
+                         ids=("numpy", "python"))
+def test_gpio_timestamps(benchmark, monkeypatch, use_numpy):
+    """Benchmark the conversion of the GPIO ticks to seconds."""
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(dgilib_data, "numpy", False)
+    # Ten seconds of GPIO ticks of the 16 MHz timer
+    samples = gpio_rate * 10
+    ticks = list(range(0, samples * 1600, 1600))
+    values = [[False] * 4] * samples
+
+    def setup():
+        """Get new ticks to convert."""
+        return (TickInterfaceData(
+            list(ticks), values, 1, 16000000, time_offset=0.5),), {}
+
+    timestamps = benchmark.pedantic(
+        TickInterfaceData.timestamps.fget, setup=setup, rounds=rounds)
+
+    assert timestamps[1] == pytest.approx(0.5001)
+    report_throughput(benchmark, "gpio_timestamps", samples)
+
+
+def test_power_read_buffer(benchmark, simulated):
+    """Benchmark DGILibInterfacePower.read_buffer."""
+    dgilib, advance = simulated()
+    power = dgilib.interfaces[INTERFACE_POWER]
+    dgilib.logger.start()
+    interface_data = benchmark.pedantic(
+        power.read_buffer, (power.power_buffers[0],), setup=advance,
+        rounds=rounds)
+    dgilib.logger.stop()
+
+    assert len(interface_data) == power_rate * read_interval
+    report_throughput(benchmark, "power_read_buffer", len(interface_data))
+
+
+@pytest.mark.parametrize("loggers", ([LOGGER_OBJECT], [LOGGER_CSV],
+                                     [LOGGER_OBJECT, LOGGER_PLOT]),
+                         ids=("object", "csv", "plot"))
+def test_update_callback(benchmark, simulated, loggers):
+    """Benchmark DGILibLogger.update_callback for each logger type."""
+    dgilib, advance = simulated(loggers=loggers)
+    plot = LOGGER_PLOT in loggers
+    dgilib.logger.start()
+    logger_data = benchmark.pedantic(
+        dgilib.logger.update_callback, (True,), setup=advance,
+        rounds=3 if plot else rounds)
+    dgilib.logger.stop()
+
+    samples = sum(len(interface_data)
+                  for interface_data in logger_data.values())
+    report_throughput(
+        benchmark, "update_callback_plot" if plot else "update_callback",
+        samples)
+
+
+def test_csv_read_file(benchmark, simulated):
+    """Benchmark DGILibInterface.csv_read_file."""
+    dgilib, advance = simulated(loggers=[LOGGER_CSV])
+    gpio = dgilib.interfaces[INTERFACE_GPIO]
+    dgilib.logger.start()
+    advance()
+    dgilib.logger.stop()
+
+    file_path = path.join(dgilib.logger.log_folder,
+                          gpio.file_name_base + '_' + gpio.name + ".csv")
+    interface_data = benchmark(gpio.csv_read_file, file_path)
+
+    report_throughput(benchmark, "csv_read_file", len(interface_data))
+
+
+@pytest.mark.parametrize("calculation", (
+    lambda data: power_and_time_per_pulse(data, 0),
+    lambda data: rise_and_fall_times(data, 0),
+    lambda data: calculate_average(data.power)),
+    ids=("power_and_time_per_pulse", "rise_and_fall_times",
+         "calculate_average"))
+def test_calculations(benchmark, calculation):
+    """Benchmark the calculations on simulated data."""
+    logger_data = simulated_logger_data()
+    benchmark(calculation, logger_data)
+
+    samples = len(logger_data.gpio) + len(logger_data.power)
+    report_throughput(benchmark, "calculations", samples)
+
+
+def test_contains(benchmark):
+    """Benchmark `in` of a sub-capture and a few samples."""
+    interface_data = simulated_logger_data().power
+    half = len(interface_data) // 2
+    sub_capture = InterfaceData(*interface_data[half:])
+    samples = InterfaceData(*interface_data[::half // 10])
+
+    def contains():
+        return sub_capture in interface_data and samples in interface_data
+    assert benchmark(contains)
+
+    report_throughput(benchmark, "contains", len(interface_data))
+
 
 def data_iadd_speed(num_iterations=10, num_values=1000):
     """test_data_iadd_speed."""
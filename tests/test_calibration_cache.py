@@ -0,0 +1,40 @@
+"""This module holds the automated tests for CalibrationCache."""
+
+from pydgilib_extra import dgilib_extra_config
+from pydgilib_extra.dgilib_interface_power import CalibrationCache
+
+
+def test_calibration_cache(tmp_path):
+    """Tests for CalibrationCache."""
+    file_path = str(tmp_path / "calibration.json")
+    cache = CalibrationCache(file_path, validity=60)
+    assert cache.expired(b"ATML0001", 0) is None
+    cache.store(b"ATML0001", 0, [1, 2, 3])
+    assert cache.expired(b"ATML0001", 0) is False
+    assert cache.expired(b"ATML0001", 1) is None
+
+    # The cache is persisted
+    cache = CalibrationCache(file_path, validity=60)
+    assert cache.get(b"ATML0001", 0)["data"] == [1, 2, 3]
+    cache.validity = -1
+    assert cache.expired(b"ATML0001", 0) is True
+
+
+def test_calibration_cache_corrupt_file(tmp_path):
+    """A corrupt cache file is ignored."""
+    file_path = tmp_path / "calibration.json"
+    file_path.write_text("{")
+    cache = CalibrationCache(str(file_path))
+    assert cache.calibrations == {}
+    assert CalibrationCache(None).expired("ATML0001", 0) is None
+
+
+def test_calibration_cache_folder(tmp_path, monkeypatch):
+    """The cache is saved in the platform cache folder, which is created."""
+    monkeypatch.setattr(dgilib_extra_config.sys, "platform", "linux")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    folder = dgilib_extra_config.cache_folder()
+    assert folder == str(tmp_path / "pydgilib")
+    cache = CalibrationCache(str(tmp_path / "pydgilib" / "calibration.json"))
+    cache.store(b"ATML0001", 0, [1, 2, 3])
+    assert (tmp_path / "pydgilib" / "calibration.json").is_file()
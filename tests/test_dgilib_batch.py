@@ -0,0 +1,55 @@
+"""This module holds the automated tests for the batch analysis."""
+
+import csv
+from os import makedirs, path
+
+from pydgilib_extra.dgilib_batch import (
+    SUMMARY_HEADER, analyze_captures, find_captures, write_summary)
+from pydgilib_extra.dgilib_interface_gpio import DGILibInterfaceGPIO
+from pydgilib_extra.dgilib_interface_power import DGILibInterfacePower
+
+
+def write_capture(capture, pulses):
+    """Write a capture with pulses on pin 0 and a current of 1 mA."""
+    with open(capture + "_gpio.csv", "w", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(DGILibInterfaceGPIO.csv_header)
+        for pulse in range(pulses):
+            writer.writerow([pulse + 0.1, True, False, False, False])
+            writer.writerow([pulse + 0.6, False, False, False, False])
+    with open(capture + "_power.csv", "w", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(DGILibInterfacePower.csv_header)
+        for sample in range(pulses * 100 + 1):
+            writer.writerow([sample / 100, 0.001])
+
+
+def test_analyze_captures(tmp_path):
+    """Captures in a directory are summarized by the worker processes."""
+    folder = str(tmp_path)
+    for night in range(3):
+        makedirs(path.join(folder, f"night{night}"))
+        write_capture(path.join(folder, f"night{night}", "log"), night + 1)
+    # A capture without power data is skipped, a broken one is reported
+    write_capture(path.join(folder, "broken"), 1)
+    with open(path.join(folder, "broken_power.csv"), "w") as csv_file:
+        csv_file.write("timestamp,current\nnot a number,0\n")
+    open(path.join(folder, "lonely_gpio.csv"), "w").close()
+
+    assert len(find_captures(folder)) == 4
+    assert find_captures(path.join(folder, "night*", "*_gpio.csv")) == [
+        path.join(folder, f"night{night}", "log") for night in range(3)]
+
+    summary = path.join(folder, "summary.csv")
+    assert write_summary(
+        analyze_captures(folder, workers=2, max_pending=2), summary) == 4
+    with open(summary, newline="") as csv_file:
+        rows = {row["capture"]: row for row in csv.DictReader(csv_file)}
+    assert list(next(iter(rows.values()))) == SUMMARY_HEADER
+    assert "ValueError" in rows[path.join(folder, "broken")]["error"]
+    for night in range(3):
+        row = rows[path.join(folder, f"night{night}", "log")]
+        assert row["error"] == ""
+        assert int(row["pulses"]) == night + 1
+        assert round(float(row["time_mean"]), 6) == 0.5
+        assert round(float(row["charge_mean"]), 9) == 0.0005
@@ -0,0 +1,135 @@
+"""This module holds the automated tests for DGILib Calculations."""
+
+import matplotlib
+
+from pydgilib_extra import (
+    LoggerData, INTERFACE_POWER, INTERFACE_GPIO, INTERFACE_VOLTAGE,
+    GPIOEdgeTrigger, PowerThresholdTrigger, ClockAlignment, EnergyIntegrator,
+    calculate_energy, calculate_power, energy_and_time_per_pulse)
+from pydgilib_extra.dgilib_data import TickInterfaceData
+from pydgilib_extra.dgilib_plot import HoldTimes
+
+matplotlib.use("Agg")
+
+
+def test_gpio_edge_trigger():
+    """Tests for GPIOEdgeTrigger."""
+    trigger = GPIOEdgeTrigger(1)
+    assert trigger(LoggerData({INTERFACE_GPIO: (
+        [0.0, 1.0], [[False, False], [True, False]])})) is None
+    # The edge between two chunks is detected
+    assert trigger(LoggerData({INTERFACE_GPIO: (
+        [2.0, 3.0], [[True, True], [False, False]])})) == 2.0
+    # Falling edge
+    trigger = GPIOEdgeTrigger(0, rising_edge=False)
+    assert trigger(LoggerData({INTERFACE_GPIO: (
+        [0.0, 1.0, 2.0], [[False], [True], [False]])})) == 2.0
+    assert trigger(LoggerData({INTERFACE_POWER: ([0.0], [1.0])})) is None
+    # All edges of a chunk
+    assert trigger.trigger_times(LoggerData({INTERFACE_GPIO: (
+        [3.0, 4.0, 5.0, 6.0], [[True], [False], [True], [False]])})) == \
+        [4.0, 6.0]
+
+
+def test_power_threshold_trigger():
+    """Tests for PowerThresholdTrigger."""
+    data = LoggerData({INTERFACE_POWER: ([0.0, 1.0, 2.0], [1e-6, 1e-3, 0])})
+    assert PowerThresholdTrigger(1e-4)(data) == 1.0
+    assert PowerThresholdTrigger(1e-2)(data) is None
+    assert PowerThresholdTrigger(1e-7, above=False)(data) == 2.0
+    assert list(PowerThresholdTrigger(1e-7).trigger_times(data)) == \
+        [0.0, 1.0]
+
+
+def test_clock_alignment():
+    """Tests for ClockAlignment."""
+    # The power clock runs 1000 ppm faster and 2 ms ahead of the GPIO clock
+    def power_time(gpio_time):
+        return 0.002 + 1.001 * gpio_time
+
+    alignment = ClockAlignment(0, 1e-3, window=0.005)
+    assert alignment.get_offset(5) == 0
+    for second in range(10):
+        # Toggle the pin (and the load) every 0.5 s, in chunks of one second
+        gpio_times = [second, second + 0.5]
+        power_times = [power_time(t) + dt for t in gpio_times
+                       for dt in (-1e-4, 0, 1e-4)]
+        aligned = alignment(LoggerData({
+            INTERFACE_GPIO: (gpio_times, [[second > 0], [False]]),
+            INTERFACE_POWER: (power_times,
+                              [0, 2e-3, 2e-3, 0, 0, 0] if second else
+                              [0, 0, 0, 0, 0, 0])}))
+    assert alignment.count == 9
+    assert round(alignment.drift, 6) == 0.001
+    assert round(alignment.get_offset(100), 6) == 0.102
+    # The GPIO timestamps are aligned without converting the ticks
+    gpio_data = TickInterfaceData([0, 16000000], [[True], [False]],
+                                  1, 16000000)
+    alignment(LoggerData({INTERFACE_GPIO: gpio_data}))
+    assert gpio_data.ticks == [0, 16000000]
+    assert [round(t, 6) for t in aligned[INTERFACE_GPIO].timestamps] == \
+        [round(power_time(t), 6) for t in (9, 9.5)]
+    assert [round(t, 6) for t in gpio_data.timestamps] == \
+        [round(power_time(t), 6) for t in (0, 1)]
+    # Pairs of other sync events
+    alignment = ClockAlignment(0, 1e-3)
+    alignment.add_pair(1, 1.5)
+    assert alignment.get_offset(10) == 0.5
+
+
+def test_hold_times():
+    """HoldTimes continues after the last hold time of GPIO ticks."""
+    # Pin 0 is high for two of every four samples, shifted by the GPIO delay
+    data = TickInterfaceData(list(range(0, 80, 8)),
+                             [[i % 4 < 2] for i in range(10)], 1, 16,
+                             time_offset=0.00075)
+    hold_times = HoldTimes()
+    assert hold_times.identify_hold_times(0, True, data) == \
+        [(2.00075, 3.00075)]
+    assert hold_times.index == 7
+    assert hold_times.identify_hold_times(0, True, data) is None
+
+
+def test_calculate_power():
+    """Tests for calculate_power."""
+    current = LoggerData({INTERFACE_POWER: ([0, 1, 2, 3], [1, 2, 3, 4])})
+    power = calculate_power(current.power, voltage=2)
+    assert power.values == [2, 4, 6, 8]
+    # The voltage is held between its samples
+    voltage = LoggerData({INTERFACE_VOLTAGE: ([0, 1.5], [1, 3])})
+    power = calculate_power(current.power, voltage.voltage)
+    assert power.timestamps == [0, 1, 2, 3]
+    assert power.values == [1, 2, 9, 12]
+
+
+def test_energy_integrator():
+    """Tests for EnergyIntegrator."""
+    integrator = EnergyIntegrator()
+    # 1 mA at 3 V in chunks of one second
+    for second in range(4):
+        timestamps = [second + i / 10 for i in range(10)]
+        assert round(integrator(LoggerData({
+            INTERFACE_POWER: (timestamps, [1e-3] * 10),
+            INTERFACE_VOLTAGE: (timestamps, [3] * 10)})), 9) == \
+            (0.0027 if second == 0 else 0.003)
+    assert round(integrator.total, 9) == 0.0117
+    assert round(integrator.energy(1, 2), 9) == 0.003
+    assert round(integrator.energy(end_time=0.5), 9) == 0.0015
+    # The voltage is kept when it is not logged in a chunk
+    assert round(integrator(LoggerData({
+        INTERFACE_POWER: ([4.0, 5.0], [1e-3, 1e-3])})), 9) == 0.0033
+    assert round(calculate_energy(LoggerData({
+        INTERFACE_POWER: ([0, 1, 2], [1e-3, 1e-3, 1e-3])}), voltage=2), 9) \
+        == 0.004
+
+
+def test_energy_and_time_per_pulse():
+    """Tests for energy_and_time_per_pulse."""
+    data = LoggerData({
+        INTERFACE_GPIO: ([0.1, 0.6, 1.1, 1.6], [[True], [False]] * 2),
+        INTERFACE_POWER: ([i / 10 for i in range(21)], [1e-3] * 21),
+        INTERFACE_VOLTAGE: ([0, 1], [2, 3])})
+    energies, times = energy_and_time_per_pulse(
+        data, 0, start_time=0, initialized=True)
+    assert [round(energy, 9) for energy in energies] == [0.001, 0.0015]
+    assert [round(time, 6) for time in times] == [0.5, 0.5]
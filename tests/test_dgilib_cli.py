@@ -0,0 +1,56 @@
+"""This module holds the automated tests for the command line logger."""
+
+import subprocess
+import sys
+from os import path
+
+from pydgilib_extra.dgilib_cli import main
+
+
+def test_main(tmp_path, capsys):
+    """A simulated capture writes csv files and prints the statistics."""
+    assert main(["--simulate", "-d", "0.5", "-i", "gpio", "-o",
+                 str(tmp_path), "--stats-interval", "0.1",
+                 "--fail-on-overflow", "--launch-time", "0",
+                 "--calibration-cache", "none"]) == 0
+    assert path.isfile(path.join(str(tmp_path), "log_gpio.csv"))
+    assert not path.isfile(path.join(str(tmp_path), "log_power.csv"))
+    err = capsys.readouterr().err
+    assert "samples/s" in err
+    assert "samples: {'gpio': " in err
+    assert "launch_to_first_sample" in err
+
+
+def test_main_oneshot(tmp_path, capsys):
+    """The oneshot capture only reads the power samples, once."""
+    calibration_cache = path.join(str(tmp_path), "calibration.json")
+    assert main(["--simulate", "-d", "0.5", "-p", "oneshot", "-o",
+                 str(tmp_path), "--stats-interval", "0",
+                 "--fail-on-overflow", "--calibration-cache",
+                 calibration_cache]) == 0
+    # The calibration is cached in the given file
+    assert path.isfile(calibration_cache)
+    # The duration is rounded up to whole seconds
+    assert "samples: {'power': 62500}" in capsys.readouterr().err
+
+
+def test_no_matplotlib():
+    """The command line logger does not import matplotlib."""
+    assert subprocess.run([
+        sys.executable, "-c",
+        "import sys, pydgilib_extra.dgilib_cli; "
+        "sys.exit('matplotlib' in sys.modules)"]).returncode == 0
+
+
+def test_lazy_imports():
+    """The optional modules are only imported when they are used."""
+    assert subprocess.run([
+        sys.executable, "-c",
+        "import sys, pydgilib_extra.dgilib_cli; "
+        "lazy = ('dgilib_multi', 'dgilib_batch', 'dgilib_shared', "
+        "'dgilib_pyramid', 'dgilib_intervals'); "
+        "assert not any(f'pydgilib_extra.{name}' in sys.modules "
+        "for name in lazy); "
+        "from pydgilib_extra import DGILibMulti, GPIOIntervalIndex; "
+        "assert 'pydgilib_extra.dgilib_multi' in sys.modules"]
+    ).returncode == 0
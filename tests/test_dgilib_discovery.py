@@ -82,3 +82,15 @@ def test_set_mode(verbose):
     assert dgilib.is_msd_mode(device_sn)
     dgilib.set_mode(device_sn)
     assert not dgilib.is_msd_mode(device_sn)
+
+
+@pytest.mark.parametrize("verbose", verbosity)
+def test_get_device_serials(verbose):
+    """test_get_device_serials.
+
+    DGILibDiscovery.get_device_serials
+    """
+    dgilib = DGILib(verbose=verbose)
+    device_sns = dgilib.get_device_serials(use_cache=False)
+    assert dgilib.get_device_serials() == device_sns
+    assert len(device_sns) == dgilib.get_device_count()
@@ -9,6 +9,7 @@ from pydgilib_extra.dgilib_extra import DGILibExtra
 from pydgilib_extra.dgilib_calculations import (
     power_and_time_per_pulse, rise_and_fall_times, calculate_average)
 from pydgilib_extra.dgilib_data import LoggerData
+from pydgilib_extra.dgilib_pool import DGILibPool
 
 import pytest
 from os import path
@@ -59,6 +60,34 @@ def test_device_reset(verbose):
         dgilib.device_reset()
 
 
+@pytest.mark.parametrize("verbose", verbosity)
+def test_connection_pool(verbose):
+    """test_connection_pool."""
+    connection_pool = DGILibPool()
+    dgi_hndls = []
+    for _ in range(3):
+        with DGILibExtra(verbose=verbose, connection_pool=connection_pool,
+                         **config_dict) as dgilib:
+            dgi_hndls.append(dgilib.dgi_hndl.value)
+            dgilib.logger.log(0.1)
+            assert len(dgilib.data.gpio) or len(dgilib.data.power)
+    assert len(set(dgi_hndls)) == 1
+    assert len(connection_pool.connections) == 1
+    connection_pool.close()
+    assert not connection_pool.connections
+
+
+@pytest.mark.parametrize("verbose", verbosity)
+def test_configuration_cache(verbose):
+    """test_configuration_cache."""
+    with DGILibExtra(verbose=verbose, **config_dict) as dgilib:
+        gpio = dgilib.interfaces[INTERFACE_GPIO]
+        gpio.set_config(read_mode=[True, False, True, False])
+        cached = gpio.get_config()
+        dgilib.invalidate_configuration(INTERFACE_GPIO)
+        assert gpio.get_config() == cached
+
+
 @pytest.mark.parametrize("verbose", verbosity)
 def test_plot_simple(verbose):
     """test_plot_simple."""
@@ -0,0 +1,39 @@
+"""This module holds the automated tests for DGILibInstrumentation."""
+
+from pydgilib.dgilib import DGILib
+from pydgilib.dgilib_config import INTERFACE_GPIO
+from pydgilib.dgilib_instrumentation import DGILibInstrumentation
+from pydgilib.dgilib_simulator import DGILibSimulator
+
+
+def test_instrumentation():
+    """Calls are counted and timed when the instrumentation is enabled."""
+    dgilib = DGILib(DGILibSimulator(), instrument=True)
+    with dgilib:
+        dgilib.interface_enable(INTERFACE_GPIO)
+        dgilib.interface_set_configuration(INTERFACE_GPIO, [0], [15])
+        dgilib.start_polling()
+        dgilib.interface_read_data(INTERFACE_GPIO)
+        dgilib.interface_read_data(INTERFACE_GPIO)
+        dgilib.stop_polling()
+    stats = dgilib.get_stats(reset=True)
+    assert stats["connect"]["calls"] == 1
+    assert stats["interface_read_data"]["calls"] == 2
+    assert stats["interface_read_data"]["total_time"] >= \
+        stats["interface_read_data"]["max_time"] > 0
+    assert stats["interface_read_data"]["transferred"] >= 0
+    assert dgilib.get_stats() == {}
+
+
+def test_instrumentation_disabled():
+    """The instrumentation is not in the way when it is disabled."""
+    simulator = DGILibSimulator()
+    dgilib = DGILib(simulator)
+    assert dgilib.dgilib is simulator
+    dgilib.enable_instrumentation()
+    assert isinstance(dgilib.dgilib, DGILibInstrumentation)
+    # The discovery cache is shared with the wrapped library
+    assert dgilib.dgilib == simulator
+    dgilib.disable_instrumentation()
+    assert dgilib.dgilib is simulator
+    assert dgilib.get_stats() == {}
@@ -0,0 +1,47 @@
+"""This module holds the automated tests for the GPIO interval index."""
+
+from pydgilib_extra import (
+    GPIOIntervalIndex, LoggerData, INTERFACE_GPIO, INTERFACE_POWER)
+
+
+def test_gpio_interval_index():
+    """Intervals and aggregates of pin states over chunks of data."""
+    index = GPIOIntervalIndex()
+    # Pin 0 is high from 1 to 2 and from 3 to 5, pin 1 from 1.5 to 4,
+    # the current is 1 mA plus 2 mA while pin 0 is high
+    gpio = ([0, 1, 1.5, 2, 2.5, 3, 4, 5, 6],
+            [[False, False], [True, False], [True, True], [False, True],
+             [False, True], [True, True], [True, False], [False, False],
+             [False, False]])
+    timestamps = [i / 100 for i in range(601)]
+    current = [3e-3 if 1 < t <= 2 or 3 < t <= 5 else 1e-3
+               for t in timestamps]
+    for start, end, power_start, power_end in ((0, 4, 0, 250),
+                                               (4, 9, 250, 601)):
+        index(LoggerData({
+            INTERFACE_GPIO: (gpio[0][start:end], gpio[1][start:end]),
+            INTERFACE_POWER: (timestamps[power_start:power_end],
+                              current[power_start:power_end])}))
+        if not start:
+            # The interval of pin 1 is still going on
+            assert index.intervals(1) == [(1.5, 2)]
+    assert len(index.starts) == 7
+    assert index.intervals(0) == [(1, 2), (3, 5)]
+    assert index.intervals(0, False) == [(0, 1), (2, 3), (5, 6)]
+    assert index.intervals(1) == [(1.5, 4)]
+    assert index.intervals({0: True, 1: True}) == [(1.5, 2), (3, 4)]
+    assert index.intervals(0, start_time=1.5, end_time=3.5) == \
+        [(1.5, 2), (3, 3.5)]
+
+    summary = index.summary(0)
+    assert summary["intervals"] == 2
+    assert summary["time"] == 3
+    assert round(summary["charge"], 9) == 9e-3
+    assert round(summary["average_current"], 9) == 3e-3
+    assert round(index.summary(0, False)["average_current"], 9) == 1e-3
+
+    states = index.summary_per_state([0, 1])
+    assert {state: summary["time"] for state, summary in states.items()} == \
+        {(False, False): 2, (True, False): 1.5, (True, True): 1.5,
+         (False, True): 1}
+    assert round(states[(True, True)]["charge"], 9) == 4.5e-3
@@ -0,0 +1,80 @@
+"""This module holds the automated tests for DGILibMulti."""
+
+from time import sleep, time
+
+import pytest
+
+from pydgilib.dgilib_exceptions import Error
+from pydgilib.dgilib_simulator import DGILibSimulator
+from pydgilib_extra.dgilib_extra_config import INTERFACE_POWER, LOGGER_OBJECT
+from pydgilib_extra.dgilib_data import RollingInterfaceData
+from pydgilib_extra.dgilib_multi import DGILibMulti
+
+device_sns = [b"ATML0001", b"ATML0002"]
+config_dict = {
+    "loggers": [LOGGER_OBJECT],
+    "calibration_cache_file": None,
+}
+
+
+def simulated_devices(simulator):
+    """Get the simulated devices by serial number."""
+    return {device.serial: device for device in simulator.devices}
+
+
+def test_multi_log():
+    """The timestamps of all devices are shifted to a common time base."""
+    simulator = DGILibSimulator(device_sns, calibration_time=0)
+    # Use the host clock of the logger for the simulated timestamps
+    simulator.clock = time
+    with DGILibMulti(simulator, max_duration={INTERFACE_POWER: 10},
+                     statistics=[INTERFACE_POWER], **config_dict) as multi:
+        # The second device takes longer to return from start, after its
+        # polling has started
+        device = multi.devices[device_sns[1]]
+        empty_data = device.empty_data
+
+        def slow_empty_data():
+            sleep(0.2)
+            empty_data()
+        device.empty_data = slow_empty_data
+
+        data = multi.log(0.3)
+    poll_starts = {device_sn: device.poll_start for device_sn, device in
+                   simulated_devices(simulator).items()}
+    first_start = min(poll_starts.values())
+    for device_sn in device_sns:
+        # The first GPIO sample is taken when the polling starts
+        assert data[device_sn].gpio.timestamps[0] == pytest.approx(
+            poll_starts[device_sn] - first_start, abs=0.02)
+        # The data of the session is returned with its retention policy and
+        # statistics
+        assert isinstance(data[device_sn].power, RollingInterfaceData)
+        assert data[device_sn].statistics[INTERFACE_POWER].count == \
+            len(data[device_sn].power)
+
+
+def test_multi_enter_cleanup():
+    """Sessions that were opened are closed if another one fails."""
+    simulator = DGILibSimulator(device_sns, calibration_time=0)
+    multi = DGILibMulti(simulator, **config_dict)
+    simulator.unplug(device_sns[1])
+    with pytest.raises(Error):
+        multi.__enter__()
+    assert not simulated_devices(simulator)[device_sns[0]].connected
+
+
+def test_multi_exit_cleanup():
+    """All sessions are closed if closing one of them fails."""
+    simulator = DGILibSimulator(device_sns, calibration_time=0)
+    multi = DGILibMulti(simulator, **config_dict)
+    with pytest.raises(RuntimeError):
+        with multi:
+            device = multi.devices[device_sns[0]]
+            exit_device = device.__exit__
+
+            def failing_exit(*args):
+                exit_device(*args)
+                raise RuntimeError("exit failed")
+            device.__exit__ = failing_exit
+    assert not any(device.connected for device in simulator.devices)
@@ -0,0 +1,59 @@
+"""This module holds the automated tests for the downsampled pyramid."""
+
+import random
+from os import path
+
+from pydgilib_extra import (
+    InterfaceData, InterfacePyramid, LoggerData, INTERFACE_POWER,
+    INTERFACE_GPIO)
+
+
+def test_interface_pyramid(tmp_path):
+    """Chunks build the same pyramid as all samples at once."""
+    random.seed(0)
+    timestamps = [i / 1000 for i in range(10000)]
+    values = [random.random() for _ in timestamps]
+    pyramid = InterfacePyramid(base_resolution=2 ** -6)
+    for index in range(0, len(values), 777):
+        pyramid.update(InterfaceData((
+            timestamps[index:index + 777], values[index:index + 777])))
+    complete = InterfacePyramid(InterfaceData((timestamps, values)),
+                                base_resolution=2 ** -6)
+    assert [len(level) for level in pyramid.levels] == \
+        [len(level) for level in complete.levels]
+    assert len(pyramid.levels[-1]) == 1
+    for level, complete_level in zip(pyramid.levels, complete.levels):
+        assert level.counts == complete_level.counts
+        assert (level.mins, level.maxs) == \
+            (complete_level.mins, complete_level.maxs)
+    top = pyramid.levels[-1]
+    assert (top.counts[0], top.mins[0], top.maxs[0]) == \
+        (len(values), min(values), max(values))
+
+    # Queries by time range and resolution
+    overview = pyramid.query(2, 4, max_buckets=10)
+    assert overview.timestamps == [2, 2.25, 2.5, 2.75, 3, 3.25, 3.5, 3.75]
+    minimum, mean, maximum = overview.values[0]
+    window = values[2000:2250]
+    assert (minimum, maximum) == (min(window), max(window))
+    assert abs(mean - sum(window) / len(window)) < 1e-12
+    assert len(pyramid.query(resolution=1)) == 10
+
+    # Saved next to the captures
+    file_path = path.join(str(tmp_path), "log_power_pyramid.bin")
+    pyramid.save(file_path)
+    loaded = InterfacePyramid.load(file_path)
+    assert loaded.origin == pyramid.origin
+    assert [level.arrays() for level in loaded.levels] == \
+        [level.arrays() for level in pyramid.levels]
+
+
+def test_logger_data_pyramids():
+    """LoggerData keeps the pyramids up to date."""
+    data = LoggerData([INTERFACE_GPIO, INTERFACE_POWER],
+                      pyramids=[INTERFACE_POWER])
+    data.extend(INTERFACE_POWER, ([0.0, 0.5], [1.0, 2.0]))
+    data.extend(INTERFACE_POWER, ([1.0, 1.5], [3.0, 4.0]))
+    assert list(data.pyramids) == [INTERFACE_POWER]
+    assert data.pyramids[INTERFACE_POWER].query(resolution=1).values == \
+        [[1.0, 1.5, 2.0], [3.0, 3.5, 4.0]]
@@ -0,0 +1,59 @@
+"""This module holds the automated tests for the shared memory LoggerData."""
+
+import pickle
+from multiprocessing import get_context
+
+import pytest
+
+from pydgilib_extra import (
+    SharedLoggerData, InterfaceData, INTERFACE_GPIO, INTERFACE_POWER)
+from pydgilib_extra.dgilib_extra_exceptions import SharedDataFullError
+
+
+def power_sum(shared_data):
+    """Sum the power values of data passed to another process."""
+    return len(shared_data.power), sum(shared_data.power.values)
+
+
+def test_shared_logger_data():
+    """A consumer attaches read-only and sees the new samples."""
+    with SharedLoggerData(capacity=10) as data:
+        consumer = SharedLoggerData.attach(data.name)
+        assert len(consumer.power) == 0
+        data.extend(INTERFACE_POWER, ([0.0, 1.0], [1e-3, 2e-3]))
+        data.extend(INTERFACE_GPIO,
+                    ([0.5], [[True, False, False, True]]))
+        assert len(consumer.power) == 2
+        assert list(consumer.power.values) == [1e-3, 2e-3]
+        assert consumer.gpio[0] == (0.5, [True, False, False, True])
+
+        data.extend(INTERFACE_POWER, InterfaceData([2.0], [3e-3]))
+        data.extend(INTERFACE_GPIO, ([1.5], [[False, True, False, False]]))
+        assert consumer.power[1:] == ([1.0, 2.0], [2e-3, 3e-3])
+        assert consumer.gpio.values == [[True, False, False, True],
+                                        [False, True, False, False]]
+        assert ([2.0], [3e-3]) in consumer.power
+
+        with pytest.raises(PermissionError):
+            consumer.extend(INTERFACE_POWER, ([3.0], [1e-3]))
+        with pytest.raises(SharedDataFullError):
+            data.extend(INTERFACE_POWER, ([float(i) for i in range(3, 11)],
+                                          [1e-3] * 8))
+        assert len(data.power) == 3
+
+        # Pickling copies the samples of an interface
+        interface_data = pickle.loads(pickle.dumps(consumer.power))
+        assert type(interface_data) is InterfaceData
+        assert interface_data.values == [1e-3, 2e-3, 3e-3]
+        consumer.close()
+
+
+def test_shared_logger_data_process():
+    """Data passed to another process attaches to the segment."""
+    with SharedLoggerData([INTERFACE_POWER], capacity=1000) as data:
+        data.extend(INTERFACE_POWER, ([i / 1000 for i in range(1000)],
+                                      [1e-3] * 1000))
+        with get_context("spawn").Pool(1) as pool:
+            count, total = pool.apply(power_sum, (data,))
+        assert count == 1000
+        assert total == pytest.approx(1.0)
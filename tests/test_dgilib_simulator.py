@@ -0,0 +1,316 @@
+"""This module holds the automated tests for DGILibSimulator."""
+
+from ctypes import CDLL
+from ctypes.util import find_library
+from os import path
+from pathlib import Path
+from time import sleep
+
+import pytest
+
+from pydgilib.dgilib import DGILib
+from pydgilib.dgilib_config import (
+    DONE, OVERFLOWED, INTERFACE_GPIO, CHANNEL_A, POWER_CURRENT, POWER_VOLTAGE)
+from pydgilib.dgilib_discovery import get_discovery_cache
+from pydgilib.dgilib_simulator import DGILibSimulator, SimulatedDevice
+from pydgilib_extra.dgilib_extra_config import (
+    LOGGER_CSV, LOGGER_OBJECT, INTERFACE_POWER, INTERFACE_VOLTAGE)
+from pydgilib_extra.dgilib_extra import DGILibExtra
+from pydgilib_extra.dgilib_calculations import (
+    GPIOEdgeTrigger, calculate_energy)
+from pydgilib_extra.dgilib_data import InterfaceData
+from pydgilib_extra.dgilib_pool import DGILibPool
+from pydgilib_extra.dgilib_pyramid import InterfacePyramid
+
+config_dict = {
+    "loggers": [LOGGER_OBJECT],
+    "calibration_cache_file": None,
+}
+
+
+class ManualClock(object):
+    """Clock for DGILibSimulator that only advances when told to."""
+
+    def __init__(self):
+        """Instantiate ManualClock object."""
+        self.time = 0
+
+    def __call__(self):
+        """Get the time."""
+        return self.time
+
+
+class SteppedTrigger(GPIOEdgeTrigger):
+    """GPIOEdgeTrigger that advances the clock after each chunk."""
+
+    def __init__(self, clock, step, *args, **kwargs):
+        """Instantiate SteppedTrigger object."""
+        GPIOEdgeTrigger.__init__(self, *args, **kwargs)
+        self.clock = clock
+        self.step = step
+
+    def trigger_times(self, logger_data):
+        """Get the edges and advance the clock."""
+        trigger_times = GPIOEdgeTrigger.trigger_times(self, logger_data)
+        self.clock.time += self.step
+        return trigger_times
+
+
+def sample_indices(interface_data, rate):
+    """Get the sample numbers of the timestamps."""
+    return [round(timestamp * rate) for timestamp in interface_data.timestamps]
+
+
+def test_simulator_discovery():
+    """Discovery and hotplug notifications of the simulated devices."""
+    simulator = DGILibSimulator(device_sns=[b"ATML0001", b"ATML0002"])
+    dgilib = DGILib(simulator)
+    assert dgilib.get_device_serials() == [b"ATML0001", b"ATML0002"]
+    simulator.unplug(b"ATML0001")
+    assert dgilib.get_device_serials() == [b"ATML0002"]
+    simulator.plug(SimulatedDevice(b"ATML0003"))
+    assert dgilib.get_device_serials() == [b"ATML0002", b"ATML0003"]
+
+
+class HotplugSimulator(DGILibSimulator):
+    """DGILibSimulator that plugs in a device while it discovers."""
+
+    def discover(self):
+        """Discover, then plug in a device before the scan returns."""
+        DGILibSimulator.discover(self)
+        if len(self.devices) == 1:
+            self.plug(SimulatedDevice(b"ATML0002"))
+
+
+def test_simulator_discovery_cache():
+    """Sessions share one registration, which is removed at exit."""
+    simulator = HotplugSimulator(device_sns=[b"ATML0001"])
+    # The device plugged in during the first scan is found by the next one
+    assert DGILib(simulator).get_device_serials() == [b"ATML0001"]
+    assert DGILib(simulator).get_device_serials() == [b"ATML0001",
+                                                      b"ATML0002"]
+    discovery_cache = get_discovery_cache(simulator)
+    assert discovery_cache.device_sns == [b"ATML0001", b"ATML0002"]
+    assert len(simulator.notification_handles) == 1
+    discovery_cache.close()
+    assert simulator.notification_handles == {}
+    assert discovery_cache.device_sns is None
+
+
+@pytest.mark.skipif(find_library("c") is None, reason="No C library found")
+def test_discovery_cache_key():
+    """Every load of the same library uses the same discovery cache."""
+    assert get_discovery_cache(CDLL(find_library("c"))) is \
+        get_discovery_cache(CDLL(find_library("c")))
+
+
+@pytest.mark.skipif(find_library("c") is None, reason="No C library found")
+def test_dgilib_path():
+    """Paths and parts of paths are loaded, other objects are used as is."""
+    for dgilib_path in (Path(find_library("c")), (find_library("c"),)):
+        assert isinstance(DGILib(dgilib_path).dgilib, CDLL)
+    simulator = DGILibSimulator()
+    assert DGILib(simulator).dgilib is simulator
+
+
+def test_simulator_handles():
+    """Handles are not reused after a disconnect."""
+    simulator = DGILibSimulator(device_sns=[b"ATML0001", b"ATML0002"])
+    first = DGILib(simulator, device_sn=b"ATML0001").__enter__()
+    second = DGILib(simulator, device_sn=b"ATML0002").__enter__()
+    first.__exit__(None, None, None)
+    first = DGILib(simulator, device_sn=b"ATML0001").__enter__()
+    assert first.dgi_hndl.value != second.dgi_hndl.value
+    assert simulator.handles[second.dgi_hndl.value].serial == b"ATML0002"
+    first.__exit__(None, None, None)
+    second.__exit__(None, None, None)
+
+
+def test_simulator_log():
+    """Log synthetic data from the simulator."""
+    simulator = DGILibSimulator(calibration_time=0)
+    with DGILibExtra(simulator, **config_dict) as dgilib:
+        assert dgilib.timer_factor == 1 / 16000000
+        data = dgilib.logger.log(0.2)
+    assert len(data.gpio) > 100
+    assert len(data.power) > 10000
+    # The samples are stored as c_float by DGILib
+    assert {round(value, 6) for value in data.power.values} == {1e-3, 3e-3}
+
+
+def test_simulator_voltage():
+    """Log the voltage together with the current."""
+    simulator = DGILibSimulator(calibration_time=0)
+    with DGILibExtra(simulator, interfaces=[
+            INTERFACE_GPIO, INTERFACE_POWER, INTERFACE_VOLTAGE],
+            **config_dict) as dgilib:
+        data = dgilib.logger.log(0.2)
+    assert data.voltage.timestamps == data.power.timestamps
+    assert {round(value, 6) for value in data.voltage.values} == {3.3}
+    duration = data.power.timestamps[-1] - data.power.timestamps[0]
+    assert 3.3e-3 * duration <= calculate_energy(data) <= 9.9e-3 * duration
+
+
+def test_simulator_pyramid(tmp_path):
+    """The pyramid of the power data is saved next to the csv files."""
+    simulator = DGILibSimulator(calibration_time=0)
+    with DGILibExtra(simulator, loggers=[LOGGER_CSV, LOGGER_OBJECT],
+                     log_folder=str(tmp_path), pyramids=[INTERFACE_POWER],
+                     calibration_cache_file=None) as dgilib:
+        data = dgilib.logger.log(0.2)
+    pyramid = InterfacePyramid.load(
+        path.join(str(tmp_path), "log_power_pyramid.bin"))
+    assert sum(pyramid.levels[0].counts) == len(data.power)
+    assert pyramid.levels[-1].counts[0] == len(data.power)
+
+
+def test_simulator_overflow():
+    """The power buffers overflow when they are not read often enough."""
+    simulator = DGILibSimulator(calibration_time=0, buffer_size=100)
+    with DGILibExtra(simulator, **config_dict) as dgilib:
+        dgilib.logger.start()
+        sleep(0.05)
+        assert dgilib.auxiliary_power_get_status() == OVERFLOWED
+        assert len(dgilib.interfaces[INTERFACE_POWER].read()) == 100
+        assert len(dgilib.interface_read_data(INTERFACE_GPIO)[0]) <= 100
+        dgilib.logger.stop()
+
+
+def test_simulator_log_triggered():
+    """Back-to-back triggers, several per chunk, are all logged once."""
+    # Pin 0 rises every 0.1 s, the windows of 0.05 s before and 0.06 s after
+    # each trigger overlap, so the capture is contiguous from 0.05 s
+    simulator = DGILibSimulator(
+        calibration_time=0, gpio_rate=1000, power_rate=1000,
+        gpio_function=lambda time: int(round(time * 1000) % 100 < 50))
+    clock = simulator.clock = ManualClock()
+    with DGILibExtra(simulator, augment_gpio=False, **config_dict) as dgilib:
+        data = dgilib.logger.log_triggered(
+            SteppedTrigger(clock, 0.35, 0), pre_trigger=0.05,
+            post_trigger=0.06, max_triggers=6)
+    assert sample_indices(data.gpio, 1000) == list(range(50, 660))
+    assert sample_indices(data.power, 1000) == list(range(50, 660))
+
+
+def test_simulator_log_oneshot():
+    """The power parser captures on its own, GPIO is not polled."""
+    simulator = DGILibSimulator(
+        calibration_time=0, gpio_rate=1000, power_rate=100, buffer_size=200)
+    with DGILibExtra(simulator, **config_dict) as dgilib:
+        data = dgilib.logger.log(0.5, oneshot=True)
+        assert dgilib.auxiliary_power_get_status() == DONE
+        assert not any(dgilib.overflows.values())
+    # The duration is rounded up to whole seconds
+    assert len(data.power) == 100
+    assert len(data.gpio) == 0
+
+
+def test_simulator_read_buffers():
+    """All power buffers are copied under one lock."""
+    simulator = DGILibSimulator(calibration_time=0)
+    with DGILibExtra(simulator, interfaces=[
+            INTERFACE_GPIO, INTERFACE_POWER, INTERFACE_VOLTAGE],
+            instrument=True, **config_dict) as dgilib:
+        dgilib.logger.start()
+        sleep(0.02)
+        dgilib.get_stats(reset=True)
+        buffers = dgilib.interfaces[INTERFACE_POWER].read_buffers()
+        stats = dgilib.get_stats()
+        dgilib.logger.stop()
+    assert stats["auxiliary_power_lock_data_for_reading"]["calls"] == 1
+    assert stats["auxiliary_power_copy_data"]["calls"] == 2
+    assert stats["auxiliary_power_free_data"]["calls"] == 1
+    current = buffers[(CHANNEL_A, POWER_CURRENT)]
+    voltage = buffers[(CHANNEL_A, POWER_VOLTAGE)]
+    assert len(current) > 0
+    assert list(current.timestamps) == list(voltage.timestamps)
+
+
+def test_simulator_power_handle():
+    """Removing all power buffers releases the power handle."""
+    simulator = DGILibSimulator(calibration_time=0)
+    with DGILibExtra(simulator, **config_dict) as dgilib:
+        power = dgilib.interfaces[INTERFACE_POWER]
+        power.set_config(power_buffers=[])
+        assert dgilib.power_hndl is None
+        # A new handle is initialized when buffers are registered again
+        power.set_config()
+        assert dgilib.power_hndl is not None
+        data = dgilib.logger.log(0.05)
+    assert len(data.power) > 0
+
+
+def test_simulator_drain():
+    """Copies that fill the power buffer size are repeated until drained."""
+    simulator = DGILibSimulator(
+        calibration_time=0, gpio_rate=1000, power_rate=1000)
+    clock = simulator.clock = ManualClock()
+    with DGILibExtra(simulator, power_buffer_size=100,
+                     **config_dict) as dgilib:
+        power = dgilib.interfaces[INTERFACE_POWER]
+        dgilib.logger.start()
+        clock.time = 0.25
+        first = power.read()
+        assert power.read_stats[(CHANNEL_A, POWER_CURRENT)] == (3, 250)
+        # The arrays grow past the samples of the last read
+        clock.time = 1
+        second = power.read()
+        assert power.read_stats[(CHANNEL_A, POWER_CURRENT)] == (8, 750)
+        dgilib.logger.stop()
+    assert sample_indices(first, 1000) == list(range(250))
+    assert sample_indices(second, 1000) == list(range(250, 1000))
+
+
+def test_simulator_connection_pool():
+    """Only the session that leased a connection returns it to the pool."""
+    simulator = DGILibSimulator(calibration_time=0)
+    connection_pool = DGILibPool()
+    with DGILibExtra(simulator, connection_pool=connection_pool,
+                     **config_dict) as first:
+        pass
+    connection = connection_pool.connections[first.device_sn]
+    with DGILibExtra(simulator, connection_pool=connection_pool,
+                     **config_dict) as second:
+        assert second.dgi_hndl.value == first.dgi_hndl.value
+        # The first session does not own the connection anymore
+        assert not connection_pool.release(first)
+        connection_pool.discard(first)
+        assert connection_pool.connections[first.device_sn] is connection
+        assert connection.in_use and connection.session is second
+    assert not connection.in_use
+    connection_pool.close()
+    assert not connection_pool.connections
+    assert not simulator.devices[0].connected
+
+
+def test_simulator_read_buffer():
+    """Mixed reads of the power buffers do not lose samples."""
+    simulator = DGILibSimulator(calibration_time=0, power_rate=1000)
+    clock = simulator.clock = ManualClock()
+    power_buffers = [{"channel": CHANNEL_A, "power_type": POWER_CURRENT},
+                     {"channel": CHANNEL_A, "power_type": POWER_VOLTAGE}]
+    with DGILibExtra(simulator, **config_dict) as dgilib:
+        power = dgilib.interfaces[INTERFACE_POWER]
+        power.set_config(power_buffers=power_buffers)
+        dgilib.logger.start()
+        current, voltage = InterfaceData(), InterfaceData()
+        for buffer_num in (1, 0, 0, 1, 1, 0):
+            clock.time += 0.1
+            (current, voltage)[buffer_num].extend(power.read(buffer_num))
+        # The voltage of the last read is kept for the next read of it
+        assert list(power.buffer_data) == [(CHANNEL_A, POWER_VOLTAGE)]
+        voltage.extend(power.read(1))
+        dgilib.logger.stop()
+    assert sample_indices(current, 1000) == list(range(600))
+    assert sample_indices(voltage, 1000) == list(range(600))
+
+    # A buffer that is not read is not kept
+    with DGILibExtra(simulator, **config_dict) as dgilib:
+        power = dgilib.interfaces[INTERFACE_POWER]
+        power.set_config(power_buffers=power_buffers)
+        dgilib.logger.start()
+        for _ in range(3):
+            clock.time += 0.1
+            power.read()
+            assert power.buffer_data == {}
+        dgilib.logger.stop()
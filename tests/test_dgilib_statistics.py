@@ -0,0 +1,62 @@
+"""This module holds the automated tests for the streaming statistics."""
+
+import random
+from bisect import bisect
+
+from pydgilib_extra import InterfaceData, InterfaceStatistics, QuantileSketch
+
+
+def test_interface_statistics():
+    """Statistics of chunks and merged windows match the samples."""
+    random.seed(0)
+    values = [random.gauss(1e-3, 1e-4) for _ in range(20000)]
+    timestamps = [i * 1e-5 for i in range(len(values))]
+    statistics = InterfaceStatistics()
+    for index in range(0, len(values), 3000):
+        statistics.update(InterfaceData((
+            timestamps[index:index + 3000], values[index:index + 3000])))
+    mean = sum(values) / len(values)
+    assert statistics.count == len(values)
+    assert abs(statistics.mean - mean) < 1e-15
+    assert abs(statistics.std - (sum(
+        (value - mean) ** 2 for value in values) / len(values)) ** 0.5) < 1e-15
+    assert (statistics.min, statistics.max) == (min(values), max(values))
+    assert abs(statistics.integral - sum(
+        value * 1e-5 for value in values[1:])) < 1e-12
+
+    # Windows combine to the statistics of all samples
+    first = InterfaceStatistics(InterfaceData((
+        timestamps[:5000], values[:5000])))
+    second = InterfaceStatistics(InterfaceData((
+        timestamps[5000:], values[5000:])))
+    combined = first + second
+    assert combined.count == statistics.count
+    assert abs(combined.mean - statistics.mean) < 1e-15
+    assert abs(combined.variance - statistics.variance) < 1e-18
+    assert abs(combined.integral - statistics.integral) < 1e-15
+    assert first.count == 5000
+    summary = combined.summary()
+    assert summary["count"] == len(values)
+    assert abs(summary["p50"] - 1e-3) < 1e-5
+
+
+def test_quantile_sketch():
+    """Quantiles of the sketch are close to the exact ones."""
+    random.seed(1)
+    values = [random.expovariate(1) for _ in range(50000)]
+    sketch = QuantileSketch()
+    for index in range(0, len(values), 7000):
+        sketch.update(values[index:index + 7000])
+    assert len(sketch.means) <= sketch.compression
+    ordered = sorted(values)
+    for quantile in (0.001, 0.1, 0.5, 0.9, 0.999):
+        # The error is bounded in rank, not in value
+        rank = bisect(ordered, sketch.quantile(quantile)) / len(values)
+        assert abs(rank - quantile) < 0.005
+    assert sketch.quantile(0) == ordered[0]
+    assert sketch.quantile(1) == ordered[-1]
+    # Merging sketches
+    other = QuantileSketch().update(values[:25000])
+    other.merge(QuantileSketch().update(values[25000:]))
+    assert abs(bisect(ordered, other.quantile(0.5)) / len(values) - 0.5) < \
+        0.005
@@ -0,0 +1,70 @@
+"""This module holds the automated tests for DGILibTracer."""
+
+import logging
+from time import sleep
+
+from pydgilib.dgilib import DGILib
+from pydgilib.dgilib_config import INTERFACE_GPIO
+from pydgilib.dgilib_simulator import DGILibSimulator
+from pydgilib.dgilib_trace import DGILibTracer, TRACE_LOGGER
+from pydgilib_extra.dgilib_extra import DGILibExtra
+from pydgilib_extra.dgilib_extra_config import INTERFACE_POWER, LOGGER_OBJECT
+
+
+def test_trace_samples():
+    """Only `samples` evenly spaced samples of a buffer are traced."""
+    messages = []
+    tracer = DGILibTracer(hook=messages.append, samples=10, rate=None)
+    tracer.trace_samples(1000, ("buffer", range(1000)), ("tick", range(1000)))
+    assert len(messages) == 10
+    assert messages[0] == "\t0:\tbuffer: 0,\ttick: 0"
+    assert messages[-1] == "\t900:\tbuffer: 900,\ttick: 900"
+
+
+def test_trace_rate():
+    """Messages over the rate limit are counted and reported."""
+    messages = []
+    tracer = DGILibTracer(hook=messages.append, rate=10)
+    for i in range(100):
+        tracer.trace(f"message {i}")
+    assert len(messages) == 10
+    assert tracer.suppressed == 90
+    sleep(0.2)
+    tracer.trace("message")
+    assert messages[-2:] == ["\t(90 messages suppressed)", "message"]
+    assert tracer.suppressed == 0
+
+
+def test_trace_logger(caplog):
+    """The messages of the bindings can be sent to `logging`."""
+    dgilib = DGILib(DGILibSimulator(), verbose=2,
+                    tracer=DGILibTracer(logger=True, samples=5))
+    with caplog.at_level(logging.DEBUG, logger=TRACE_LOGGER):
+        with dgilib:
+            dgilib.interface_enable(INTERFACE_GPIO)
+            dgilib.interface_set_configuration(INTERFACE_GPIO, [0], [15])
+            dgilib.start_polling()
+            sleep(0.1)
+            buffer, _ = dgilib.interface_read_data(INTERFACE_GPIO)
+            dgilib.stop_polling()
+    messages = [record.getMessage() for record in caplog.records
+                if record.name == TRACE_LOGGER]
+    assert any("interface_read_data" in message for message in messages)
+    assert len([message for message in messages if "tick:" in message]) \
+        <= 5
+    assert len(buffer) > 5
+
+
+def test_trace_power_read(capsys):
+    """The status of the power reads is sent to the tracer of the session."""
+    messages = []
+    with DGILibExtra(DGILibSimulator(calibration_time=0), verbose=2,
+                     loggers=[LOGGER_OBJECT], calibration_cache_file=None,
+                     tracer=DGILibTracer(hook=messages.append)) as dgilib:
+        dgilib.logger.start()
+        sleep(0.05)
+        dgilib.interfaces[INTERFACE_POWER].read_buffers()
+        dgilib.logger.stop()
+    assert any(message.startswith("power_status:") for message in messages)
+    assert any(message.startswith("Collected ") for message in messages)
+    assert "power_status:" not in capsys.readouterr().out
@@ -1,6 +1,11 @@
 """This module holds the automated tests for InterfaceData."""
 
-from pydgilib_extra import (InterfaceData, valid_interface_data)
+import pickle
+from array import array
+
+from pydgilib_extra import (
+    InterfaceData, RollingInterfaceData, TickInterfaceData, LoggerData,
+    INTERFACE_GPIO, valid_interface_data)
 
 
 def test_new_interface_data():
@@ -217,6 +222,21 @@ def test__contains__():
     assert data + ([10], [34]) not in data
     assert data + ([10], [34]) in data + ([10], [34])
 
+    # Unsorted timestamps and samples with the same timestamp
+    data = InterfaceData(([2, 1, 1, 3], [[True], [False], [True], [False]]))
+    assert ([1, 3, 1], [[True], [False], [False]]) in data
+    assert ([1, 1], [[True], [True]]) in data
+    assert ([1, 2], [[True], [False]]) not in data
+
+    # Samples stored in arrays
+    data = InterfaceData()
+    data.timestamps = array("d", [i / 10 for i in range(1000)])
+    data.values = array("d", range(1000))
+    assert ([0.5, 99.9], [5.0, 999.0]) in data
+    assert InterfaceData(data.timestamps.tolist()[100:],
+                         data.values.tolist()[100:]) in data
+    assert ([0.5], [6.0]) not in data
+
 
 def test_valid_interface_data():
     """Tests for valid_interface_data function."""
@@ -229,3 +249,89 @@ def test_valid_interface_data():
     assert not valid_interface_data(([]))
     assert not valid_interface_data(([1], []))
     assert not valid_interface_data(([], [1]))
+
+
+def test_rolling_interface_data():
+    """Tests for RollingInterfaceData."""
+    # Keep the last max_samples samples
+    data = RollingInterfaceData(max_samples=3)
+    data += ([1, 2], [3, 4])
+    assert tuple(data) == ((1, 3), (2, 4))
+    data += ([3, 4], [5, 6])
+    assert tuple(data) == ((2, 4), (3, 5), (4, 6))
+    assert data.offset == 1
+    data += (5.0, 7)
+    assert tuple(data) == ((3, 5), (4, 6), (5, 7))
+    assert data.offset == 2
+    assert data[1:] == ([4, 5], [6, 7])
+    assert data.get_index(4) == 1
+    assert ([5], [7]) in data
+
+    # Keep the samples of the last max_duration seconds
+    data = RollingInterfaceData(([0.0, 0.5], [[1], [2]]), max_duration=1)
+    data += InterfaceData([1.0, 1.2], [[3], [4]])
+    assert tuple(data) == ((0.5, [2]), (1.0, [3]), (1.2, [4]))
+    assert data.offset == 1
+    assert data.get_select_in_value(start_time=0.6) == [3]
+
+
+def test_tick_interface_data():
+    """Tests for TickInterfaceData."""
+    # 16 MHz timer with prescaler 1, one tick is 62.5 ns
+    data = TickInterfaceData([16, 32], [[True], [False]], 1, 16000000)
+    data += TickInterfaceData([48], [[True]], 1, 16000000)
+    data.shift(1)
+    assert len(data) == 3
+    assert data.ticks == [16, 32, 48]
+    assert list(data.nanoseconds()) == [1000001000, 1000002000, 1000003000]
+    assert pickle.loads(pickle.dumps(data)).ticks == [16, 32, 48]
+    # The timestamps are converted when they are used
+    assert tuple(data) == ((1.000001, [True]), (1.000002, [False]),
+                           (1.000003, [True]))
+    assert data.ticks is None
+    data += InterfaceData([2.0], [[False]])
+    assert data.timestamps == [1.000001, 1.000002, 1.000003, 2.0]
+
+    # Scaling and shifting keep the ticks
+    data = TickInterfaceData([16, 32], [[True], [False]], 1, 16000000,
+                             time_offset=1)
+    data.scale(2)
+    data.shift(0.5)
+    assert data.ticks == [16, 32]
+    assert (data.time_offset, data.time_scale) == (2.5, 2)
+    assert list(data.nanoseconds()) == [2500002000, 2500004000]
+    assert [round(t, 9) for t in data.timestamps] == [2.500002, 2.500004]
+
+    # Nanoseconds keep their resolution after a long capture
+    hours = 100 * 60 * 60 * 16000000
+    data = TickInterfaceData([hours, hours + 1], [[True], [False]],
+                             1, 16000000)
+    assert list(data.nanoseconds()) == [360000000000000, 360000000000062]
+
+    # LoggerData keeps the ticks until the timestamps are used
+    logger_data = LoggerData([INTERFACE_GPIO])
+    logger_data.extend(INTERFACE_GPIO, TickInterfaceData(
+        [1, 2], [[True], [False]], 1, 16000000))
+    logger_data.extend(INTERFACE_GPIO, TickInterfaceData(
+        [3], [[True]], 1, 16000000))
+    assert logger_data[INTERFACE_GPIO].ticks == [1, 2, 3]
+
+
+def test_pickle_buffers():
+    """Samples stored in arrays are pickled as out-of-band buffers."""
+    data = InterfaceData()
+    data.timestamps = array("d", [0.0, 0.5, 1.0])
+    data.values = array("f", [1.0, 2.0, 3.0])
+    buffers = []
+    stream = pickle.dumps(data, protocol=5, buffer_callback=buffers.append)
+    assert len(buffers) == 2
+    restored = pickle.loads(stream, buffers=buffers)
+    assert restored.timestamps == data.timestamps
+    assert restored.values == data.values
+    # Lists are pickled as they are
+    data = InterfaceData([0.0, 1.0], [[True, False], [False, True]])
+    for protocol in (2, 5):
+        restored = pickle.loads(pickle.dumps(data, protocol=protocol))
+        assert tuple(restored) == tuple(data)
+    restored = InterfaceData.from_bytes(data.to_bytes())
+    assert tuple(restored) == tuple(data)
@@ -1,7 +1,11 @@
 """This module holds the automated tests for LoggerData."""
 
+import copy
+import pickle
+
 from pydgilib_extra import (
-    InterfaceData, LoggerData, INTERFACE_POWER, INTERFACE_SPI, INTERFACE_GPIO)
+    InterfaceData, RollingInterfaceData, LoggerData, INTERFACE_POWER,
+    INTERFACE_SPI, INTERFACE_GPIO)
 
 
 def test_init_logger_data():
@@ -154,3 +158,71 @@ def test_length():
     assert len_dict[INTERFACE_POWER] == 1
     assert len_dict[INTERFACE_GPIO] == 0
     assert len_dict[4] == 2
+
+
+def test_retention():
+    """Tests for the max_samples and max_duration retention policy."""
+    # Same policy for all interfaces
+    data = LoggerData(max_samples=2)
+    assert isinstance(data.power, RollingInterfaceData)
+    data += {INTERFACE_POWER: ([1, 2, 3], [4, 5, 6]), 4: ([1, 2], [3, 4])}
+    data += {4: ([3], [5])}
+    assert tuple(data.power) == ((2, 5), (3, 6))
+    assert tuple(data[4]) == ((2, 4), (3, 5))
+
+    # Policy per interface
+    data = LoggerData(
+        {INTERFACE_POWER: ([0.0, 1.0, 2.0], [1, 2, 3]),
+         INTERFACE_GPIO: InterfaceData([0.0, 2.0], [1, 2])},
+        max_duration={INTERFACE_POWER: 1.5})
+    assert tuple(data.power) == ((1.0, 2), (2.0, 3))
+    assert tuple(data.gpio) == ((0.0, 1), (2.0, 2))
+    assert not isinstance(data.gpio, RollingInterfaceData)
+
+
+def test_select_time():
+    """Tests for select_time function."""
+    data = LoggerData({
+        INTERFACE_POWER: ([1, 2, 3], [4, 5, 6]),
+        INTERFACE_GPIO: ([1.5, 2.5], [[True], [False]])})
+    selection = data.select_time(2, 3)
+    assert tuple(selection.power) == ((2, 5),)
+    assert tuple(selection.gpio) == ((2.5, [False]),)
+    assert tuple(data.select_time(end_time=2).power) == ((1, 4),)
+
+
+def test_statistics():
+    """Statistics are kept while data is added and old data is dropped."""
+    data = LoggerData([INTERFACE_POWER], max_samples=2,
+                      statistics=[INTERFACE_POWER])
+    data.extend(INTERFACE_POWER, ([0.0, 1.0], [1.0, 3.0]))
+    data.extend(INTERFACE_POWER, ([2.0, 3.0], [3.0, 1.0]))
+    assert len(data.power) == 2
+    statistics = data.statistics[INTERFACE_POWER]
+    assert statistics.count == 4
+    assert statistics.mean == 2.0
+    assert statistics.time_weighted_mean == 7 / 3
+    assert statistics.rms == 5 ** 0.5
+    assert (statistics.min, statistics.max) == (1.0, 3.0)
+    assert INTERFACE_GPIO not in data.statistics
+
+
+def test_pickle():
+    """LoggerData keeps its interfaces and attributes when pickled."""
+    data = LoggerData([INTERFACE_POWER], max_samples=10,
+                      statistics=[INTERFACE_POWER])
+    data.extend(INTERFACE_POWER, ([0.0, 1.0], [1.0, 3.0]))
+    for protocol in (2, 4, 5):
+        restored = pickle.loads(pickle.dumps(data, protocol=protocol))
+        assert list(restored) == [INTERFACE_POWER]
+        assert isinstance(restored.power, RollingInterfaceData)
+        assert tuple(restored.power) == ((0.0, 1.0), (1.0, 3.0))
+        assert restored.max_samples == 10
+        assert restored.statistics[INTERFACE_POWER].mean == 2.0
+    copied = copy.deepcopy(data)
+    copied.extend(INTERFACE_POWER, ([2.0], [5.0]))
+    assert len(copied.power) == 3 and len(data.power) == 2
+    assert copied.statistics[INTERFACE_POWER].count == 3
+
+    restored = LoggerData.from_bytes(data.to_bytes())
+    assert tuple(restored.power) == tuple(data.power)